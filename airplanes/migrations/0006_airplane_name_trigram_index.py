@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:15
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0005_alter_airplane_photo'),
+        ('airports', '0004_airport_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airplane',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='airplane_name_trgm'),
+        ),
+    ]
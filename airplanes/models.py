@@ -1,6 +1,8 @@
 from django.db import models
 from django_resized import ResizedImageField
 
+from base.indexes import trigram_index
+
 
 class AirplaneType(models.Model):
     class AirplaneCategory(models.TextChoices):
@@ -37,6 +39,9 @@ class Airplane(models.Model):
 
     class Meta:
         ordering = ["id"]
+        indexes = [
+            trigram_index("name", "airplane_name_trgm"),
+        ]
 
     @property
     def total_seats(self) -> int:
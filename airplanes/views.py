@@ -13,7 +13,7 @@ from base.pagination import DefaultPagination
 
 
 class AirplaneViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
-    queryset = Airplane.objects.all()
+    queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     pagination_class = DefaultPagination
 
@@ -25,7 +25,7 @@ class AirplaneViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
 
 
 class AirplaneTypeViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
-    queryset = AirplaneType.objects.all()
+    queryset = AirplaneType.objects.prefetch_related("airplanes")
     serializer_class = AirplaneTypeSerializer
 
     action_serializers = {
@@ -1,8 +1,38 @@
 # Register your models here.
 
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
 from airports.models import Airport, Route
+from base.admin import SearchListFilter
+
+
+class RouteAirportFilter(SearchListFilter):
+    """
+    Filter by the start of the name of a route's ``end`` airport, source or
+    destination. Set ``route_field`` to the path of the route relation on
+    the filtered model.
+    """
+
+    placeholder = _("Name starts with")
+    route_field = "route"
+    end = None
+
+    @property
+    def lookup(self):
+        return f"{self.route_field}__{self.end}__name__istartswith"
+
+
+class RouteSourceFilter(RouteAirportFilter):
+    title = _("source")
+    parameter_name = "source_name"
+    end = "source"
+
+
+class RouteDestinationFilter(RouteAirportFilter):
+    title = _("destination")
+    parameter_name = "destination_name"
+    end = "destination"
 
 
 @admin.register(Airport)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AirportsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "airports"
+
+    def ready(self):
+        import airports.consumers  # noqa
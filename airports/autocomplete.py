@@ -0,0 +1,96 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from airports.indexing import WorkerIndex
+from airports.models import Airport, Route
+
+SEARCH_FIELDS = ("name", "city", "country")
+NON_WORD = re.compile(r"[\W_]+")
+PREFIX_END = "\U0010ffff"
+
+
+def normalize(value):
+    """
+    Lowercase, strip accents and collapse punctuation: "Zürich-Kloten" is
+    indexed as "zurich kloten".
+    """
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return NON_WORD.sub(" ", value.casefold()).strip()
+
+
+def route_count(field):
+    routes = (
+        Route.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(routes, output_field=IntegerField()), 0)
+
+
+class AirportPrefixIndex(WorkerIndex):
+    """
+    Per-process sorted array of airport name, city and country phrases.
+
+    Every word of a field starts a phrase ("john f kennedy", "f kennedy",
+    "kennedy"), so a bisect finds both whole-field and word prefixes.
+    """
+
+    generation_key = "airport-autocomplete-generation"
+
+    def empty(self):
+        return [], [], {}
+
+    def build(self):
+        airports = Airport.objects.annotate(
+            routes_count=route_count("source") + route_count("destination")
+        ).values("id", *SEARCH_FIELDS, "routes_count")
+
+        entries = []
+        payloads = {}
+        for airport in airports:
+            payloads[airport["id"]] = airport
+            for field in SEARCH_FIELDS:
+                words = normalize(airport[field]).split()
+                for position in range(len(words)):
+                    phrase = " ".join(words[position:])
+                    entries.append((phrase, position > 0, airport["id"]))
+        entries.sort()
+        return [entry[0] for entry in entries], entries, payloads
+
+    def search(self, query, limit):
+        """
+        Airports with a field or a word starting with the query. Whole-field
+        matches rank before word matches, then busier airports first.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        keys, entries, airports = self.refresh()
+
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + PREFIX_END, start)
+        matches = {}
+        for _, word_match, airport_id in entries[start:end]:
+            matches[airport_id] = min(matches.get(airport_id, True), word_match)
+
+        ranked = heapq.nsmallest(
+            limit,
+            matches.items(),
+            key=lambda item: (
+                item[1],
+                -airports[item[0]]["routes_count"],
+                airports[item[0]]["name"],
+            ),
+        )
+        return [airports[airport_id] for airport_id, _ in ranked]
+
+
+airport_index = AirportPrefixIndex()
@@ -0,0 +1,13 @@
+from airports.autocomplete import airport_index
+from airports.models import Airport, Route
+from airports.spatial import airport_grid
+from changes.log import consumer
+
+
+@consumer("airport-indexes")
+def refresh_airport_indexes(changes):
+    models = {change.model for change in changes}
+    if models & {Airport, Route}:
+        airport_index.invalidate()
+    if Airport in models:
+        airport_grid.invalidate()
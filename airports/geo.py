@@ -0,0 +1,71 @@
+from itertools import islice
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+ROUTE_COORDINATES = (
+    "pk",
+    "distance",
+    "source__latitude",
+    "source__longitude",
+    "destination__latitude",
+    "destination__longitude",
+)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in kilometres, element-wise over scalars or arrays
+    of coordinates in degrees.
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def route_distance_km(lat1, lon1, lat2, lon2):
+    """
+    Haversine distance rounded to the whole kilometres stored on Route.
+    """
+    distance = np.rint(haversine_km(lat1, lon1, lat2, lon2)).astype(np.int64)
+    return np.maximum(distance, 1)
+
+
+def route_distance_batches(routes, batch_size):
+    """
+    Yield (ids, stored, computed) arrays for routes whose airports both have
+    coordinates, one batch of rows at a time.
+    """
+    rows = (
+        routes.filter(
+            source__latitude__isnull=False,
+            source__longitude__isnull=False,
+            destination__latitude__isnull=False,
+            destination__longitude__isnull=False,
+        )
+        .order_by("pk")
+        .values_list(*ROUTE_COORDINATES)
+        .iterator(chunk_size=batch_size)
+    )
+    while batch := list(islice(rows, batch_size)):
+        data = np.array(batch, dtype=float)
+        yield (
+            data[:, 0].astype(np.int64),
+            data[:, 1].astype(np.int64),
+            route_distance_km(*data[:, 2:].T),
+        )
+
+
+def inconsistent_distances(stored, computed, tolerance):
+    """
+    Mask of stored distances more than ``tolerance`` percent off the computed
+    ones, always allowing a rounding difference of one kilometre.
+    """
+    allowed = np.maximum(computed * tolerance / 100, 1)
+    return np.abs(stored - computed) > allowed
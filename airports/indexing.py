@@ -0,0 +1,50 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+
+
+class WorkerIndex:
+    """
+    Read-only lookup structure built once per worker process.
+
+    ``build()`` returns a snapshot that is swapped in as a whole, so readers
+    never mix two builds. Workers compare their snapshot with a generation
+    key shared through the cache and rebuild when another process bumped it.
+    """
+
+    generation_key = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.snapshot = self.empty()
+
+    def empty(self):
+        raise NotImplementedError
+
+    def build(self):
+        raise NotImplementedError
+
+    def get_generation(self):
+        generation = cache.get(self.generation_key)
+        if generation is None:
+            cache.add(self.generation_key, uuid.uuid4().hex, None)
+            generation = cache.get(self.generation_key)
+        return generation
+
+    def invalidate(self):
+        """
+        Make every worker rebuild this index on its next lookup.
+        """
+        cache.set(self.generation_key, uuid.uuid4().hex, None)
+
+    def refresh(self):
+        generation = self.get_generation()
+        if generation == self.generation:
+            return self.snapshot
+        with self.lock:
+            if generation != self.generation:
+                self.snapshot = self.build()
+                self.generation = generation
+        return self.snapshot
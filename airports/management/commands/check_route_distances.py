@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from airports.geo import inconsistent_distances, route_distance_batches
+from airports.models import Route
+
+
+class Command(BaseCommand):
+    help = "Compare Route.distance with the great-circle distance between airports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=5.0,
+            help="Percent difference from the computed distance that is accepted.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Overwrite inconsistent distances with the computed ones.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="Number of inconsistent routes to list.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batch_size = options["batch_size"]
+        checked = 0
+        fixes = []
+
+        for ids, stored, computed in route_distance_batches(
+            Route.objects.all(), batch_size
+        ):
+            checked += len(ids)
+            mask = inconsistent_distances(stored, computed, options["tolerance"])
+            fixes.extend(zip(ids[mask], stored[mask], computed[mask], strict=True))
+
+        skipped = Route.objects.count() - checked
+        self.stdout.write(
+            f"Checked {checked} routes in {time.perf_counter() - started:.1f}s, "
+            f"{len(fixes)} inconsistent, {skipped} skipped without coordinates."
+        )
+        for route_id, stored, computed in fixes[: options["show"]]:
+            self.stdout.write(
+                f"  route {route_id}: {stored} km, expected {computed} km"
+            )
+
+        if options["fix"] and fixes:
+            self.fix(fixes, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(fixes)} routes."))
+
+    def fix(self, fixes, batch_size):
+        routes = [
+            Route(pk=int(route_id), distance=int(computed))
+            for route_id, _, computed in fixes
+        ]
+        with transaction.atomic():
+            Route.objects.bulk_update(routes, ["distance"], batch_size=batch_size)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:15
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airports', '0003_remove_route_different_source_destination'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='airport',
+            name='search_document',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Concat('name', models.Value(' '), 'city'), output_field=models.TextField()),
+        ),
+        migrations.AddIndex(
+            model_name='airport',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='airport_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='airport',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('city'), name='gin_trgm_ops'), name='airport_city_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='airport',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('country'), name='gin_trgm_ops'), name='airport_country_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='airport',
+            index=django.contrib.postgres.indexes.GistIndex(django.contrib.postgres.indexes.OpClass(models.F('search_document'), name='gist_trgm_ops'), name='airport_search_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='route',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('flight_number'), name='gin_trgm_ops'), name='route_flight_number_trgm'),
+        ),
+    ]
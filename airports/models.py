@@ -1,6 +1,10 @@
 from django.core.exceptions import ValidationError
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+from base.indexes import trigram_index, trigram_knn_index
 
 
 class Airport(models.Model):
@@ -12,6 +16,21 @@ class Airport(models.Model):
     city = models.CharField(max_length=100, db_index=True)
     country = models.CharField(max_length=100, db_index=True)
     closest_big_city = models.CharField(max_length=100, null=True, blank=True)
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    search_document = models.GeneratedField(
+        expression=Concat("name", Value(" "), "city"),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ["name"]
@@ -27,6 +46,10 @@ class Airport(models.Model):
             models.Index(fields=["name"]),
             models.Index(fields=["city"]),
             models.Index(fields=["country"]),
+            trigram_index("name", "airport_name_trgm"),
+            trigram_index("city", "airport_city_trgm"),
+            trigram_index("country", "airport_country_trgm"),
+            trigram_knn_index("search_document", "airport_search_trgm"),
         ]
 
     def __str__(self):
@@ -61,6 +84,7 @@ class Route(models.Model):
         ]
         indexes = [
             models.Index(fields=["flight_number"]),
+            trigram_index("flight_number", "route_flight_number_trgm"),
         ]
 
     def __str__(self):
@@ -6,7 +6,60 @@ from airports.models import Airport, Route
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ["id", "name", "city", "country", "closest_big_city"]
+        fields = [
+            "id",
+            "name",
+            "city",
+            "country",
+            "closest_big_city",
+            "latitude",
+            "longitude",
+        ]
+
+
+class AirportSearchSerializer(AirportSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(AirportSerializer.Meta):
+        fields = AirportSerializer.Meta.fields + ["rank"]
+
+
+class AirportAutocompleteSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    city = serializers.CharField()
+    country = serializers.CharField()
+    routes_count = serializers.IntegerField()
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, required=False, default="")
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
+
+
+class AirportDistanceSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    city = serializers.CharField()
+    country = serializers.CharField()
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    distance_km = serializers.FloatField()
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    lon = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    airport = serializers.IntegerField(required=False)
+    radius = serializers.FloatField(min_value=0, max_value=20000, default=150)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, data):
+        if "airport" not in data and ("lat" not in data or "lon" not in data):
+            raise serializers.ValidationError(
+                "Pass either lat and lon or an airport id"
+            )
+        return data
 
 
 class RouteSerializer(serializers.ModelSerializer):
@@ -0,0 +1,158 @@
+import math
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+from airports.geo import EARTH_RADIUS_KM, haversine_km
+from airports.indexing import WorkerIndex
+from airports.models import Airport
+
+CELL_DEGREES = 1.0
+MAX_LATITUDE = 90
+LAT_CELLS = int(180 / CELL_DEGREES)
+LON_CELLS = int(360 / CELL_DEGREES)
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+NEAREST_START_KM = 100
+NEAREST_GROWTH = 4
+AIRPORT_FIELDS = ("id", "name", "city", "country", "latitude", "longitude")
+
+
+class GridSnapshot(NamedTuple):
+    airports: list
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    cells: dict
+    positions: dict
+
+
+def lat_cell(latitude):
+    return min(math.floor((latitude + 90) / CELL_DEGREES), LAT_CELLS - 1)
+
+
+def lon_cell(longitude):
+    return math.floor((longitude + 180) / CELL_DEGREES) % LON_CELLS
+
+
+def covered_cells(latitude, longitude, radius_km):
+    """
+    Grid cells overlapping the bounding box of a circle on the sphere, or
+    None when the circle covers every longitude.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    if angular >= math.pi:
+        return None
+    delta_lat = math.degrees(angular)
+    lat_min, lat_max = latitude - delta_lat, latitude + delta_lat
+    if lat_min <= -MAX_LATITUDE or lat_max >= MAX_LATITUDE:
+        return None
+    ratio = math.sin(angular) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return None
+    delta_lon = math.degrees(math.asin(ratio))
+    first = math.floor((longitude - delta_lon + 180) / CELL_DEGREES)
+    last = math.floor((longitude + delta_lon + 180) / CELL_DEGREES)
+    if last - first + 1 >= LON_CELLS:
+        return None
+    return [
+        (row, column % LON_CELLS)
+        for row in range(lat_cell(lat_min), lat_cell(lat_max) + 1)
+        for column in range(first, last + 1)
+    ]
+
+
+class AirportGridIndex(WorkerIndex):
+    """
+    Per-process grid of airports with coordinates in 1 degree cells.
+
+    Radius and nearest queries only measure airports in the cells that the
+    search circle overlaps.
+    """
+
+    generation_key = "airport-grid-generation"
+
+    def empty(self):
+        return GridSnapshot([], np.empty(0), np.empty(0), {}, {})
+
+    def build(self):
+        airports = list(
+            Airport.objects.filter(
+                latitude__isnull=False, longitude__isnull=False
+            ).values(*AIRPORT_FIELDS)
+        )
+        cells = defaultdict(list)
+        for position, airport in enumerate(airports):
+            key = (lat_cell(airport["latitude"]), lon_cell(airport["longitude"]))
+            cells[key].append(position)
+        return GridSnapshot(
+            airports=airports,
+            latitudes=np.array([airport["latitude"] for airport in airports]),
+            longitudes=np.array([airport["longitude"] for airport in airports]),
+            cells={key: np.array(value) for key, value in cells.items()},
+            positions={airport["id"]: index for index, airport in enumerate(airports)},
+        )
+
+    def locate(self, airport_id):
+        """
+        Coordinates of an indexed airport, or None.
+        """
+        snapshot = self.refresh()
+        position = snapshot.positions.get(airport_id)
+        if position is None:
+            return None
+        return snapshot.latitudes[position], snapshot.longitudes[position]
+
+    def find(self, snapshot, point, radius_km, limit, exclude):
+        cells = covered_cells(*point, radius_km)
+        if cells is None:
+            candidates = np.arange(len(snapshot.airports))
+        else:
+            found = [snapshot.cells[cell] for cell in cells if cell in snapshot.cells]
+            if not found:
+                return []
+            candidates = np.concatenate(found)
+        if exclude is not None and exclude in snapshot.positions:
+            candidates = candidates[candidates != snapshot.positions[exclude]]
+
+        distances = haversine_km(
+            *point,
+            snapshot.latitudes[candidates],
+            snapshot.longitudes[candidates],
+        )
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        if limit < len(distances):
+            nearest = np.argpartition(distances, limit)[:limit]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind="stable")
+        return [
+            {**snapshot.airports[position], "distance_km": round(float(distance), 1)}
+            for position, distance in zip(
+                candidates[order], distances[order], strict=True
+            )
+        ]
+
+    def within(self, latitude, longitude, radius_km, limit, exclude=None):
+        """
+        Airports within ``radius_km`` of the point, nearest first.
+        """
+        snapshot = self.refresh()
+        return self.find(snapshot, (latitude, longitude), radius_km, limit, exclude)
+
+    def nearest(self, latitude, longitude, limit, exclude=None):
+        """
+        The ``limit`` airports closest to the point, widening the search
+        circle until enough airports are inside it.
+        """
+        snapshot = self.refresh()
+        radius_km = NEAREST_START_KM
+        while True:
+            airports = self.find(
+                snapshot, (latitude, longitude), radius_km, limit, exclude
+            )
+            if len(airports) >= limit or radius_km >= MAX_DISTANCE_KM:
+                return airports
+            radius_km *= NEAREST_GROWTH
+
+
+airport_grid = AirportGridIndex()
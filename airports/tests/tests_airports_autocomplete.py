@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airports.autocomplete import airport_index, normalize
+from airports.models import Airport, Route
+from changes.log import process_changes
+
+User = get_user_model()
+
+
+class AirportAutocompleteTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(
+            name="John F. Kennedy International", city="New York", country="USA"
+        )
+        self.newark = Airport.objects.create(
+            name="Newark Liberty", city="Newark", country="USA"
+        )
+        self.zurich = Airport.objects.create(
+            name="Zürich", city="Kloten", country="Switzerland"
+        )
+        Route.objects.create(
+            source=self.jfk, destination=self.zurich, distance=6300, flight_number="LX17"
+        )
+        self.url = reverse("airports:airport-autocomplete")
+
+    def autocomplete(self, query, **params):
+        response = self.client.get(self.url, {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [airport["id"] for airport in response.data]
+
+    def test_normalize_strips_accents_and_punctuation(self):
+        self.assertEqual(normalize(" Zürich-Kloten "), "zurich kloten")
+
+    def test_field_prefix_ranks_before_word_prefix(self):
+        heliport = Airport.objects.create(
+            name="Kennedy Town Heliport", city="Hong Kong", country="China"
+        )
+        self.assertEqual(self.autocomplete("kenn"), [heliport.id, self.jfk.id])
+
+    def test_busier_airport_ranks_first(self):
+        self.assertEqual(self.autocomplete("new"), [self.jfk.id, self.newark.id])
+
+    def test_route_count_breaks_ties(self):
+        Route.objects.create(
+            source=self.newark, destination=self.zurich, distance=6300, flight_number="LX19"
+        )
+        Route.objects.create(
+            source=self.zurich, destination=self.newark, distance=6300, flight_number="LX18"
+        )
+        response = self.client.get(self.url, {"q": "usa"})
+        self.assertEqual(
+            [airport["id"] for airport in response.data], [self.newark.id, self.jfk.id]
+        )
+        self.assertEqual(response.data[0]["routes_count"], 2)
+
+    def test_matches_words_inside_fields(self):
+        self.assertEqual(self.autocomplete("kenn"), [self.jfk.id])
+        self.assertEqual(self.autocomplete("zur"), [self.zurich.id])
+        self.assertEqual(self.autocomplete("new york"), [self.jfk.id])
+
+    def test_limit(self):
+        self.assertEqual(len(self.autocomplete("usa", limit=1)), 1)
+
+    def test_lookups_do_not_query_the_database(self):
+        self.autocomplete("new")
+        with self.assertNumQueries(0):
+            self.autocomplete("kenn")
+
+    def test_index_is_rebuilt_after_changes(self):
+        self.autocomplete("new")
+        generation = airport_index.generation
+        airport = Airport.objects.create(name="Newcastle", city="Newcastle", country="UK")
+        process_changes()
+        self.assertIn(airport.id, self.autocomplete("newc"))
+        self.assertNotEqual(airport_index.generation, generation)
+
+        airport.delete()
+        process_changes()
+        self.assertEqual(self.autocomplete("newc"), [])
+
+    def test_empty_query_returns_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.autocomplete(""), [])
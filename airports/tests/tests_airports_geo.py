@@ -0,0 +1,76 @@
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+
+from airports.geo import haversine_km, inconsistent_distances, route_distance_batches
+from airports.models import Airport, Route
+
+HEATHROW = (51.47, -0.4543)
+JFK = (40.6413, -73.7781)
+SYDNEY = (-33.9399, 151.1753)
+
+
+class HaversineTest(TestCase):
+    def test_known_distances(self):
+        distances = haversine_km(
+            [HEATHROW[0], JFK[0], HEATHROW[0]],
+            [HEATHROW[1], JFK[1], HEATHROW[1]],
+            [JFK[0], SYDNEY[0], HEATHROW[0]],
+            [JFK[1], SYDNEY[1], HEATHROW[1]],
+        )
+        np.testing.assert_allclose(distances, [5540, 16014, 0], atol=5)
+
+    def test_inconsistent_distances_use_percent_tolerance(self):
+        computed = np.array([1000, 1000, 1])
+        stored = np.array([1040, 1060, 2])
+        mask = inconsistent_distances(stored, computed, tolerance=5)
+        self.assertEqual(mask.tolist(), [False, True, False])
+
+
+class CheckRouteDistancesCommandTest(TestCase):
+    def setUp(self):
+        self.heathrow = Airport.objects.create(
+            name="Heathrow",
+            city="London",
+            country="UK",
+            latitude=HEATHROW[0],
+            longitude=HEATHROW[1],
+        )
+        self.jfk = Airport.objects.create(
+            name="JFK", city="New York", country="USA", latitude=JFK[0], longitude=JFK[1]
+        )
+        unknown = Airport.objects.create(name="Unknown", city="Nowhere", country="USA")
+        self.wrong = Route.objects.create(
+            source=self.heathrow, destination=self.jfk, distance=344, flight_number="BA1"
+        )
+        self.correct = Route.objects.create(
+            source=self.jfk, destination=self.heathrow, distance=5550, flight_number="BA2"
+        )
+        Route.objects.create(
+            source=unknown, destination=self.jfk, distance=100, flight_number="XX1"
+        )
+
+    def test_batches_skip_airports_without_coordinates(self):
+        batches = list(route_distance_batches(Route.objects.all(), batch_size=1))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(
+            [int(ids[0]) for ids, _, _ in batches], [self.wrong.pk, self.correct.pk]
+        )
+
+    def test_reports_without_fixing(self):
+        out = StringIO()
+        call_command("check_route_distances", stdout=out)
+        self.assertIn("Checked 2 routes", out.getvalue())
+        self.assertIn("1 inconsistent, 1 skipped", out.getvalue())
+        self.assertIn(f"route {self.wrong.pk}: 344 km", out.getvalue())
+        self.wrong.refresh_from_db()
+        self.assertEqual(self.wrong.distance, 344)
+
+    def test_fix_updates_inconsistent_routes(self):
+        call_command("check_route_distances", fix=True, stdout=StringIO())
+        self.wrong.refresh_from_db()
+        self.correct.refresh_from_db()
+        self.assertAlmostEqual(self.wrong.distance, 5540, delta=5)
+        self.assertEqual(self.correct.distance, 5550)
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airports.geo import haversine_km
+from airports.models import Airport
+from airports.spatial import airport_grid, covered_cells
+from changes.log import process_changes
+
+User = get_user_model()
+
+
+class CoveredCellsTest(APITestCase):
+    def test_circle_across_antimeridian_wraps(self):
+        cells = covered_cells(0, 179.9, 50)
+        self.assertIn((90, 359), cells)
+        self.assertIn((90, 0), cells)
+
+    def test_circle_around_pole_covers_every_longitude(self):
+        self.assertIsNone(covered_cells(89.5, 10, 100))
+
+
+class NearbyAirportsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(
+            name="JFK", city="New York", country="USA", latitude=40.6413, longitude=-73.7781
+        )
+        self.lga = Airport.objects.create(
+            name="LaGuardia", city="New York", country="USA", latitude=40.7769, longitude=-73.874
+        )
+        self.ewr = Airport.objects.create(
+            name="Newark", city="Newark", country="USA", latitude=40.6895, longitude=-74.1745
+        )
+        self.bos = Airport.objects.create(
+            name="Logan", city="Boston", country="USA", latitude=42.3656, longitude=-71.0096
+        )
+        self.lhr = Airport.objects.create(
+            name="Heathrow", city="London", country="UK", latitude=51.47, longitude=-0.4543
+        )
+        Airport.objects.create(name="Unknown", city="Nowhere", country="USA")
+
+    def get(self, action, **params):
+        response = self.client.get(reverse(f"airports:airport-{action}"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_nearest_to_point(self):
+        airports = self.get("nearest", lat=40.7, lon=-73.9, limit=3)
+        self.assertEqual(
+            [airport["id"] for airport in airports],
+            [self.lga.id, self.jfk.id, self.ewr.id],
+        )
+        self.assertAlmostEqual(airports[0]["distance_km"], 8.7, delta=0.5)
+
+    def test_nearest_widens_search_across_the_ocean(self):
+        airports = self.get("nearest", airport=self.lhr.id, limit=1)
+        self.assertEqual(airports[0]["id"], self.bos.id)
+
+    def test_within_radius_of_airport(self):
+        airports = self.get("within", airport=self.jfk.id, radius=150)
+        self.assertEqual(
+            [airport["id"] for airport in airports], [self.lga.id, self.ewr.id]
+        )
+
+    def test_within_matches_brute_force(self):
+        airports = self.get("within", lat=45, lon=-60, radius=2000, limit=100)
+        expected = sorted(
+            (
+                haversine_km(45, -60, airport.latitude, airport.longitude),
+                airport.id,
+            )
+            for airport in Airport.objects.filter(latitude__isnull=False)
+        )
+        self.assertEqual(
+            [airport["id"] for airport in airports],
+            [airport_id for distance, airport_id in expected if distance <= 2000],
+        )
+
+    def test_lookups_do_not_query_the_database(self):
+        self.get("nearest", lat=40.7, lon=-73.9)
+        with self.assertNumQueries(0):
+            self.get("within", airport=self.jfk.id)
+
+    def test_index_is_rebuilt_after_changes(self):
+        self.get("nearest", lat=40.7, lon=-73.9)
+        self.jfk.latitude, self.jfk.longitude = 51.15, -0.18
+        self.jfk.save()
+        process_changes()
+        self.assertEqual(airport_grid.locate(self.jfk.id), (51.15, -0.18))
+
+    def test_requires_point_or_airport(self):
+        url = reverse("airports:airport-nearest")
+        response = self.client.get(url, {"lat": 40})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"airport": self.jfk.id + 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,20 +1,29 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from airports.autocomplete import airport_index
 from airports.models import Airport, Route
 from airports.serializers import (
+    AirportAutocompleteSerializer,
+    AirportDistanceSerializer,
     AirportSerializer,
+    AutocompleteQuerySerializer,
+    NearbyQuerySerializer,
     RouteCreateSerializer,
     RouteSerializer,
     RouteUpdateSerializer,
 )
+from airports.spatial import airport_grid
 from base.mixins import BaseViewSetMixin
 from base.pagination import DefaultPagination
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows airports to be viewed or edited.
     """
@@ -29,13 +38,70 @@ class AirportViewSet(viewsets.ModelViewSet):
     ordering_fields = ["name", "city", "country"]
     ordering = ["name"]
 
+    action_serializers = {
+        "autocomplete": AirportAutocompleteSerializer,
+        "nearest": AirportDistanceSerializer,
+        "within": AirportDistanceSerializer,
+    }
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """
+        Airports whose name, city or country start with the query, served
+        from the in-memory prefix index without touching the database.
+        """
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        airports = airport_index.search(
+            params.validated_data["q"], params.validated_data["limit"]
+        )
+        serializer = self.get_serializer(airports, many=True)
+        return Response(serializer.data)
+
+    def get_nearby_params(self):
+        params = NearbyQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        airport_id = data.get("airport")
+        if airport_id is None:
+            return data, (data["lat"], data["lon"])
+        point = airport_grid.locate(airport_id)
+        if point is None:
+            raise ValidationError(
+                {"airport": "Airport does not exist or has no coordinates."}
+            )
+        return data, point
+
+    @action(detail=False, methods=["get"])
+    def nearest(self, request):
+        """
+        The airports closest to a point (lat, lon) or to another airport.
+        """
+        data, point = self.get_nearby_params()
+        airports = airport_grid.nearest(
+            *point, data["limit"], exclude=data.get("airport")
+        )
+        return Response(self.get_serializer(airports, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def within(self, request):
+        """
+        Airports within ``radius`` km of a point (lat, lon) or of another
+        airport, nearest first.
+        """
+        data, point = self.get_nearby_params()
+        airports = airport_grid.within(
+            *point, data["radius"], data["limit"], exclude=data.get("airport")
+        )
+        return Response(self.get_serializer(airports, many=True).data)
+
 
 class RouteViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows routes to be viewed or edited.
     """
 
-    queryset = Route.objects.all()
+    queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
     pagination_class = DefaultPagination
     permission_classes = [IsAuthenticated]
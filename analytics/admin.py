@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from analytics.models import AirplaneDailyStats, RouteDailyStats
+
+
+@admin.register(RouteDailyStats)
+class RouteDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("date", "route", "flights", "seats_sold", "capacity", "load_factor")
+    list_select_related = ("route",)
+    date_hierarchy = "date"
+    raw_id_fields = ("route",)
+
+
+@admin.register(AirplaneDailyStats)
+class AirplaneDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("date", "airplane", "flights", "flight_hours", "load_factor")
+    list_select_related = ("airplane",)
+    date_hierarchy = "date"
+    raw_id_fields = ("airplane",)
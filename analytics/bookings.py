@@ -0,0 +1,112 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from analytics.models import BookingBucket
+from tickets.models import Ticket
+
+Granularity = BookingBucket.Granularity
+
+# the longest window each granularity may be queried over, which bounds the
+# rows a query reads per flight however long the booking history is
+MAX_WINDOWS = {
+    Granularity.MINUTE: timedelta(days=1),
+    Granularity.HOUR: timedelta(days=31),
+    Granularity.DAY: timedelta(days=366),
+}
+# minute buckets are only queried over the last day, the nightly backfill
+# drops them after a week
+MINUTE_BUCKET_RETENTION = timedelta(days=7)
+
+
+def bucket_totals(tickets, granularity):
+    """
+    Tickets and revenue of ``tickets`` per flight and bucket of their order
+    time, in one grouped query.
+    """
+    return (
+        tickets.annotate(start=Trunc("order__created_at", granularity))
+        .values("flight_id", "start")
+        .annotate(
+            ticket_count=Count("pk"),
+            revenue_total=Coalesce(Sum("price"), Decimal(0)),
+        )
+        .order_by()
+    )
+
+
+def record_bookings(order_ids):
+    """
+    Add the tickets of newly committed orders to their buckets.
+    """
+    if not order_ids:
+        return
+    tickets = Ticket.objects.filter(order__in=order_ids)
+    for granularity in Granularity:
+        for row in bucket_totals(tickets, granularity):
+            bucket, created = BookingBucket.objects.get_or_create(
+                flight_id=row["flight_id"],
+                granularity=granularity,
+                start=row["start"],
+                defaults={
+                    "tickets": row["ticket_count"],
+                    "revenue": row["revenue_total"],
+                },
+            )
+            if not created:
+                BookingBucket.objects.filter(pk=bucket.pk).update(
+                    tickets=F("tickets") + row["ticket_count"],
+                    revenue=F("revenue") + row["revenue_total"],
+                )
+
+
+def rebuild_booking_buckets(start_time, end_time):
+    """
+    Recompute the buckets of the orders placed from ``start_time`` up to
+    ``end_time``, which should both fall on local midnight.
+    """
+    tickets = Ticket.objects.filter(
+        order__created_at__gte=start_time, order__created_at__lt=end_time
+    )
+    buckets = [
+        BookingBucket(
+            flight_id=row["flight_id"],
+            granularity=granularity,
+            start=row["start"],
+            tickets=row["ticket_count"],
+            revenue=row["revenue_total"],
+        )
+        for granularity in Granularity
+        for row in bucket_totals(tickets, granularity)
+    ]
+    with transaction.atomic():
+        BookingBucket.objects.filter(start__gte=start_time, start__lt=end_time).delete()
+        BookingBucket.objects.bulk_create(buckets, batch_size=5000)
+    return len(buckets)
+
+
+def prune_booking_buckets():
+    return BookingBucket.objects.filter(
+        granularity=Granularity.MINUTE,
+        start__lt=timezone.now() - MINUTE_BUCKET_RETENTION,
+    ).delete()[0]
+
+
+def booking_series(granularity, start, end, **scope):
+    """
+    Tickets and revenue per bucket from ``start`` to ``end``, summed over the
+    flights selected by ``scope`` (a flight, a route or a departure airport).
+    Empty buckets are left out.
+    """
+    return (
+        BookingBucket.objects.filter(
+            granularity=granularity, start__gte=start, start__lt=end, **scope
+        )
+        .values("start")
+        .annotate(ticket_count=Sum("tickets"), revenue_total=Sum("revenue"))
+        .order_by("start")
+    )
@@ -0,0 +1,39 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from analytics.bookings import record_bookings
+from analytics.rollups import refresh_rollups
+from changes.log import consumer
+from changes.models import Change
+from flights.archive import ARCHIVE_REASON
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+
+def flight_day(row):
+    return (
+        row["route_id"],
+        row["airplane_id"],
+        timezone.localdate(parse_datetime(row["departure_time"])),
+    )
+
+
+@consumer("analytics")
+def refresh_analytics(changes):
+    """
+    Refresh the rollups of every route and airplane day a batch of changes
+    touched, and count new orders into the booking buckets. Archived flights
+    keep their rollups.
+    """
+    flight_ids, days, order_ids = set(), set(), set()
+    for change in changes:
+        if change.reason == ARCHIVE_REASON:
+            continue
+        if change.model is Flight:
+            days.update(flight_day(row) for row in change.rows)
+        elif change.model is Ticket:
+            flight_ids.update(row["flight_id"] for row in change.rows)
+        elif change.model is Order and change.operation == Change.Operation.INSERT:
+            order_ids.add(change.object_id)
+    refresh_rollups(flight_ids, days)
+    record_bookings(order_ids)
@@ -0,0 +1,20 @@
+from django_filters import rest_framework as filters
+
+from analytics.models import AirplaneDailyStats, RouteDailyStats
+
+
+class DailyStatsFilter(filters.FilterSet):
+    date_from = filters.DateFilter(field_name="date", lookup_expr="gte")
+    date_to = filters.DateFilter(field_name="date", lookup_expr="lte")
+
+
+class RouteDailyStatsFilter(DailyStatsFilter):
+    class Meta:
+        model = RouteDailyStats
+        fields = ["route"]
+
+
+class AirplaneDailyStatsFilter(DailyStatsFilter):
+    class Meta:
+        model = AirplaneDailyStats
+        fields = ["airplane"]
@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from analytics.bookings import prune_booking_buckets, rebuild_booking_buckets
+from analytics.models import BookingBucket
+from analytics.rollups import day_start, rebuild_rollups
+from flights.models import ArchivedFlight, Flight
+from tickets.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the daily route and airplane rollups and the booking "
+        "buckets. Run nightly to repair anything the incremental updates "
+        "missed, e.g. bulk updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=parse_date,
+            help="First departure and order date to recompute (default: yesterday).",
+        )
+        parser.add_argument("--days", type=int, default=1)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every day that has live or archived flights.",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            flights = self.date_range("departure_time", Flight, ArchivedFlight)
+            orders = self.date_range("created_at", Order)
+        else:
+            if options["days"] < 1:
+                raise CommandError("--days must be at least 1.")
+            start = options["start"] or timezone.localdate() - timedelta(days=1)
+            flights = orders = (start, start + timedelta(days=options["days"] - 1))
+
+        started = time.perf_counter()
+        counts = rebuild_rollups(*flights) if flights else {}
+        if orders:
+            start, end = orders
+            counts[BookingBucket] = rebuild_booking_buckets(
+                day_start(start), day_start(end + timedelta(days=1))
+            )
+        pruned = prune_booking_buckets()
+        self.stdout.write(
+            f"Rolled up flights of {self.describe(flights)} and orders of "
+            f"{self.describe(orders)} in {time.perf_counter() - started:.1f}s: "
+            + ", ".join(
+                f"{count} {model._meta.verbose_name_plural}"
+                for model, count in counts.items()
+            )
+            + f". Dropped {pruned} expired minute buckets."
+        )
+
+    def date_range(self, field, *models):
+        """
+        First and last local date of ``field`` across ``models``, or None when
+        they are all empty.
+        """
+        bounds = [
+            model.objects.aggregate(first=Min(field), last=Max(field))
+            for model in models
+        ]
+        bounds = [bound for bound in bounds if bound["first"] is not None]
+        if not bounds:
+            return None
+        return (
+            timezone.localdate(min(bound["first"] for bound in bounds)),
+            timezone.localdate(max(bound["last"] for bound in bounds)),
+        )
+
+    def describe(self, dates):
+        return "{} to {}".format(*dates) if dates else "no days"
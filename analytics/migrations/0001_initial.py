@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:11
+
+import django.db.models.deletion
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('airports', '0005_airport_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AirplaneDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('flights', models.PositiveIntegerField(default=0)),
+                ('seats_sold', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('load_factor', models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('seats_sold', models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.functions.comparison.Cast('capacity', models.FloatField()), 0.0)), output_field=models.FloatField())),
+                ('flight_hours', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('airplane', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='airplanes.airplane')),
+            ],
+            options={
+                'verbose_name_plural': 'Airplane daily stats',
+                'ordering': ['date', 'airplane'],
+                'indexes': [models.Index(fields=['date'], name='airplane_daily_stats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('airplane', 'date'), name='unique_airplane_daily_stats')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RouteDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('flights', models.PositiveIntegerField(default=0)),
+                ('seats_sold', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('load_factor', models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('seats_sold', models.FloatField()), '/', django.db.models.functions.comparison.NullIf(django.db.models.functions.comparison.Cast('capacity', models.FloatField()), 0.0)), output_field=models.FloatField())),
+                ('flight_hours', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='airports.route')),
+            ],
+            options={
+                'verbose_name_plural': 'Route daily stats',
+                'ordering': ['date', 'route'],
+                'indexes': [models.Index(fields=['date'], name='route_daily_stats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('route', 'date'), name='unique_route_daily_stats')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('flights', '0002_flight_schedule_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=6)),
+                ('start', models.DateTimeField()),
+                ('tickets', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_buckets', to='flights.flight')),
+            ],
+            options={
+                'ordering': ['start'],
+                'indexes': [models.Index(fields=['granularity', 'start'], name='booking_bucket_start_idx')],
+                'constraints': [models.UniqueConstraint(fields=('flight', 'granularity', 'start'), name='unique_booking_bucket')],
+            },
+        ),
+    ]
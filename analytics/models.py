@@ -0,0 +1,104 @@
+from django.db import models
+from django.db.models.functions import Cast, NullIf
+
+from airplanes.models import Airplane
+from airports.models import Route
+from flights.models import Flight
+
+
+class DailyStats(models.Model):
+    """
+    Flights departing on ``date`` (local time) summed up, kept current by
+    analytics.rollups so dashboards never join tickets and flights.
+    """
+
+    date = models.DateField()
+    flights = models.PositiveIntegerField(default=0)
+    seats_sold = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+    load_factor = models.GeneratedField(
+        expression=Cast("seats_sold", models.FloatField())
+        / NullIf(Cast("capacity", models.FloatField()), 0.0),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+    flight_hours = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class RouteDailyStats(DailyStats):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+
+    class Meta:
+        ordering = ["date", "route"]
+        verbose_name_plural = "Route daily stats"
+        indexes = [models.Index(fields=["date"], name="route_daily_stats_date_idx")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "date"], name="unique_route_daily_stats"
+            )
+        ]
+
+    def __str__(self):
+        return f"Route {self.route_id} on {self.date}"
+
+
+class AirplaneDailyStats(DailyStats):
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+
+    class Meta:
+        ordering = ["date", "airplane"]
+        verbose_name_plural = "Airplane daily stats"
+        indexes = [models.Index(fields=["date"], name="airplane_daily_stats_date_idx")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["airplane", "date"], name="unique_airplane_daily_stats"
+            )
+        ]
+
+    def __str__(self):
+        return f"Airplane {self.airplane_id} on {self.date}"
+
+
+class BookingBucket(models.Model):
+    """
+    Tickets sold and revenue of a flight within one minute, hour or day,
+    by the time their order was placed. Incremented as orders commit.
+    """
+
+    class Granularity(models.TextChoices):
+        MINUTE = "minute"
+        HOUR = "hour"
+        DAY = "day"
+
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="booking_buckets"
+    )
+    granularity = models.CharField(max_length=6, choices=Granularity.choices)
+    start = models.DateTimeField()
+    tickets = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["start"]
+        indexes = [
+            models.Index(
+                fields=["granularity", "start"], name="booking_bucket_start_idx"
+            )
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["flight", "granularity", "start"],
+                name="unique_booking_bucket",
+            )
+        ]
+
+    def __str__(self):
+        return f"Flight {self.flight_id} {self.granularity} from {self.start}"
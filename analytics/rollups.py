@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.models import AirplaneDailyStats, RouteDailyStats
+from flights.models import ArchivedFlight, Flight
+from tickets.models import ArchivedTicket, Ticket
+from tickets.queries import booked_seats
+
+# each rollup table with the flight field it is grouped by
+ROLLUPS = [(RouteDailyStats, "route"), (AirplaneDailyStats, "airplane")]
+# live and archived flights, each with its tickets; a day is always rolled
+# up from both, so rebuilding it never loses the flights archived meanwhile
+FLIGHT_SOURCES = [(Flight, Ticket), (ArchivedFlight, ArchivedTicket)]
+HOUR = timedelta(hours=1)
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def aggregate(flights, field, tickets=Ticket):
+    """
+    Rollup rows of ``flights`` per ``field`` and departure date, summed up in
+    a single grouped query. ``tickets`` is the ticket model of the flights.
+    """
+    return (
+        flights.annotate(date=TruncDate("departure_time"))
+        .values(field, "date")
+        .annotate(
+            flight_count=Count("pk"),
+            seats_sold=Sum(booked_seats(tickets)),
+            capacity=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            duration=Sum(F("arrival_time") - F("departure_time")),
+        )
+        .order_by()
+    )
+
+
+def aggregate_all(scope, field):
+    """
+    Rollup rows of the live and archived flights matching the Q ``scope``,
+    with one grouped query per flight table.
+    """
+    totals = {}
+    for flight_model, ticket_model in FLIGHT_SOURCES:
+        flights = flight_model.objects.filter(scope)
+        for row in aggregate(flights, field, ticket_model):
+            key = (row[field], row["date"])
+            if key in totals:
+                for name in ["flight_count", "seats_sold", "capacity", "duration"]:
+                    totals[key][name] += row[name]
+            else:
+                totals[key] = row
+    return totals.values()
+
+
+def replace_rollups(model, field, scope, existing):
+    """
+    Recompute the rows of ``model`` from the flights matching ``scope``,
+    dropping the ``existing`` rows of the same scope that no longer have
+    any flight.
+    """
+    rows = [
+        model(
+            **{f"{field}_id": row[field]},
+            date=row["date"],
+            flights=row["flight_count"],
+            seats_sold=row["seats_sold"],
+            capacity=row["capacity"],
+            flight_hours=round(row["duration"] / HOUR, 2),
+        )
+        for row in aggregate_all(scope, field)
+    ]
+    with transaction.atomic():
+        existing.delete()
+        # a concurrent refresh of the same day may have inserted it meanwhile
+        model.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=[field, "date"],
+            update_fields=[
+                "flights",
+                "seats_sold",
+                "capacity",
+                "flight_hours",
+                "updated_at",
+            ],
+        )
+    return len(rows)
+
+
+def rebuild_rollups(start, end):
+    """
+    Recompute every rollup row for the departure dates from ``start`` to
+    ``end`` inclusive, as the nightly backfill does.
+    """
+    flights = Q(
+        departure_time__gte=day_start(start),
+        departure_time__lt=day_start(end + timedelta(days=1)),
+    )
+    return {
+        model: replace_rollups(
+            model,
+            field,
+            flights,
+            model.objects.filter(date__gte=start, date__lte=end),
+        )
+        for model, field in ROLLUPS
+    }
+
+
+def refresh_rollups(flight_ids=(), days=()):
+    """
+    Recompute only the route and airplane days touched by a change: those of
+    ``flight_ids`` as they are now, and the (route_id, airplane_id, date)
+    ``days`` a flight was moved away from or deleted from.
+    """
+    days = set(days)
+    for route_id, airplane_id, departure_time in Flight.objects.filter(
+        pk__in=flight_ids
+    ).values_list("route_id", "airplane_id", "departure_time"):
+        days.add((route_id, airplane_id, timezone.localdate(departure_time)))
+    if not days:
+        return
+
+    for index, (model, field) in enumerate(ROLLUPS):
+        keys = defaultdict(set)
+        for day in days:
+            keys[day[2]].add(day[index])
+        flights = reduce(
+            or_,
+            (
+                Q(
+                    **{f"{field}__in": ids},
+                    departure_time__gte=day_start(date),
+                    departure_time__lt=day_start(date + timedelta(days=1)),
+                )
+                for date, ids in keys.items()
+            ),
+        )
+        existing = reduce(
+            or_,
+            (Q(**{f"{field}__in": ids}, date=date) for date, ids in keys.items()),
+        )
+        replace_rollups(model, field, flights, model.objects.filter(existing))
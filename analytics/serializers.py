@@ -0,0 +1,85 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from analytics.bookings import MAX_WINDOWS
+from analytics.models import AirplaneDailyStats, BookingBucket, RouteDailyStats
+
+STATS_FIELDS = [
+    "flights",
+    "seats_sold",
+    "capacity",
+    "load_factor",
+    "flight_hours",
+]
+
+
+class RouteDailyStatsSerializer(serializers.ModelSerializer):
+    flight_number = serializers.CharField(source="route.flight_number", read_only=True)
+
+    class Meta:
+        model = RouteDailyStats
+        fields = ["route", "flight_number", "date", *STATS_FIELDS]
+
+
+class AirplaneDailyStatsSerializer(serializers.ModelSerializer):
+    airplane_name = serializers.CharField(source="airplane.name", read_only=True)
+
+    class Meta:
+        model = AirplaneDailyStats
+        fields = ["airplane", "airplane_name", "date", *STATS_FIELDS]
+
+
+class StatsSummarySerializer(serializers.Serializer):
+    flights = serializers.IntegerField()
+    seats_sold = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    load_factor = serializers.FloatField(allow_null=True)
+    flight_hours = serializers.FloatField()
+
+
+class RouteStatsSummarySerializer(StatsSummarySerializer):
+    route = serializers.IntegerField()
+
+
+class AirplaneStatsSummarySerializer(StatsSummarySerializer):
+    airplane = serializers.IntegerField()
+
+
+class BookingSeriesQuerySerializer(serializers.Serializer):
+    flight = serializers.IntegerField(required=False)
+    route = serializers.IntegerField(required=False)
+    airport = serializers.IntegerField(
+        required=False, help_text="Bookings of flights departing from the airport"
+    )
+    granularity = serializers.ChoiceField(
+        choices=BookingBucket.Granularity.choices,
+        default=BookingBucket.Granularity.HOUR,
+    )
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        scopes = [name for name in ("flight", "route", "airport") if name in data]
+        if len(scopes) != 1:
+            raise serializers.ValidationError(
+                "Pass exactly one of flight, route or airport."
+            )
+        max_window = MAX_WINDOWS[data["granularity"]]
+        data.setdefault("end", timezone.now())
+        data.setdefault("start", data["end"] - max_window)
+        if data["start"] >= data["end"]:
+            raise serializers.ValidationError({"end": "Must be after start."})
+        if data["end"] - data["start"] > max_window:
+            days = max_window.days
+            raise serializers.ValidationError(
+                {"start": f"At most {days} days of {data['granularity']} buckets."}
+            )
+        return data
+
+
+class BookingBucketSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    tickets = serializers.IntegerField(source="ticket_count")
+    revenue = serializers.DecimalField(
+        max_digits=12, decimal_places=2, source="revenue_total"
+    )
@@ -0,0 +1,154 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from analytics.models import BookingBucket
+from changes.log import process_changes
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class BookingSeriesTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.staff = User.objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.jfk = Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.route = Route.objects.create(
+            source=self.jfk,
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=3983,
+            flight_number="AA1",
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=5,
+            seats_in_row=4,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=timezone.now() + timedelta(days=3),
+            arrival_time=timezone.now() + timedelta(days=3, hours=6),
+        )
+        self.url = reverse("analytics:bookings")
+
+    def order(self, *seats):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse("tickets:order-list"),
+            {
+                "tickets": [
+                    {"flight": self.flight.id, "row": 1, "seat": seat}
+                    for seat in seats
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        process_changes()
+        return Decimal(response.data["total_price"])
+
+    def test_orders_are_counted_into_every_granularity(self):
+        revenue = self.order(1, 2) + self.order(3)
+
+        for granularity in BookingBucket.Granularity:
+            with self.subTest(granularity=granularity):
+                buckets = BookingBucket.objects.filter(granularity=granularity)
+                self.assertEqual(sum(bucket.tickets for bucket in buckets), 3)
+                self.assertEqual(sum(bucket.revenue for bucket in buckets), revenue)
+
+    def test_series_per_flight_route_and_airport(self):
+        self.order(1, 2)
+        self.client.force_authenticate(user=self.staff)
+
+        for scope, pk in [
+            ("flight", self.flight.id),
+            ("route", self.route.id),
+            ("airport", self.jfk.id),
+        ]:
+            with self.subTest(scope=scope), self.assertNumQueries(1):
+                response = self.client.get(
+                    self.url, {scope: pk, "granularity": "minute"}
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [bucket["tickets"] for bucket in response.data["buckets"]], [2]
+                )
+
+    def test_window_is_bounded_by_granularity(self):
+        self.client.force_authenticate(user=self.staff)
+        end = timezone.now()
+
+        response = self.client.get(
+            self.url,
+            {
+                "flight": self.flight.id,
+                "granularity": "minute",
+                "start": (end - timedelta(days=2)).isoformat(),
+                "end": end.isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("start", response.data)
+
+    def test_exactly_one_scope(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(
+            self.url, {"flight": self.flight.id, "route": self.route.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url, {"flight": self.flight.id})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_backfill_rebuilds_buckets_and_drops_old_minutes(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            flight=self.flight, order=order, row=2, seat=1, price=Decimal("100")
+        )
+        BookingBucket.objects.create(
+            flight=self.flight,
+            granularity=BookingBucket.Granularity.MINUTE,
+            start=timezone.now() - timedelta(days=30),
+            tickets=1,
+        )
+
+        call_command(
+            "backfill_analytics",
+            start=timezone.localdate(),
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            sorted(BookingBucket.objects.values_list("granularity", "tickets")),
+            [("day", 1), ("hour", 1), ("minute", 1)],
+        )
+        self.assertEqual(
+            set(BookingBucket.objects.values_list("revenue", flat=True)),
+            {Decimal("100")},
+        )
@@ -0,0 +1,237 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from analytics.models import AirplaneDailyStats, RouteDailyStats
+from changes.log import process_changes
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class AnalyticsTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=3983,
+            flight_number="AA1",
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=2,
+            seats_in_row=5,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.date = timezone.localdate() + timedelta(days=5)
+        self.order = Order.objects.create(user=self.user)
+
+    def create_flight(self, hours, days=0):
+        midnight = timezone.make_aware(
+            datetime.combine(self.date + timedelta(days=days), datetime.min.time())
+        )
+        return Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=midnight + timedelta(hours=hours[0]),
+            arrival_time=midnight + timedelta(hours=hours[1]),
+        )
+
+    def book(self, flight, *seats):
+        for seat in seats:
+            Ticket.objects.create(flight=flight, order=self.order, row=1, seat=seat)
+
+
+class RollupTest(AnalyticsTestMixin, APITestCase):
+    def test_rollups_follow_flight_and_ticket_changes(self):
+        morning = self.create_flight(hours=(6, 9))
+        evening = self.create_flight(hours=(18, 21.5))
+        self.book(morning, 1, 2, 3)
+        self.book(evening, 1)
+        process_changes()
+
+        stats = RouteDailyStats.objects.get(route=self.route, date=self.date)
+        self.assertEqual(
+            (stats.flights, stats.seats_sold, stats.capacity, stats.flight_hours),
+            (2, 4, 20, 6.5),
+        )
+        stats.refresh_from_db()
+        self.assertEqual(stats.load_factor, 0.2)
+
+        evening.departure_time += timedelta(days=1)
+        evening.arrival_time += timedelta(days=1)
+        evening.save()
+        morning.tickets.first().delete()
+        process_changes()
+
+        self.assertEqual(
+            list(
+                AirplaneDailyStats.objects.order_by("date").values_list(
+                    "date", "flights", "seats_sold", "flight_hours"
+                )
+            ),
+            [
+                (self.date, 1, 2, 3.0),
+                (self.date + timedelta(days=1), 1, 1, 3.5),
+            ],
+        )
+
+    def test_deleting_the_last_flight_removes_the_day(self):
+        flight = self.create_flight(hours=(6, 9))
+        process_changes()
+        flight.delete()
+        process_changes()
+
+        self.assertFalse(RouteDailyStats.objects.exists())
+        self.assertFalse(AirplaneDailyStats.objects.exists())
+
+    def test_writes_leave_the_refresh_to_the_consumer(self):
+        flight = self.create_flight(hours=(6, 9))
+        self.book(flight, 1, 2, 3, 4)
+        self.assertFalse(RouteDailyStats.objects.exists())
+
+        process_changes()
+
+        self.assertEqual(RouteDailyStats.objects.get().seats_sold, 4)
+
+    def test_archived_flights_keep_their_rollups(self):
+        flight = self.create_flight(hours=(6, 9), days=-800)
+        self.book(flight, 1, 2)
+        process_changes()
+
+        call_command("archive_flights", sleep=0, stdout=StringIO())
+        process_changes()
+
+        self.assertEqual(RouteDailyStats.objects.get().seats_sold, 2)
+
+    def test_refreshes_and_backfills_count_archived_flights(self):
+        archived = self.create_flight(hours=(6, 9), days=-800)
+        self.book(archived, 1, 2)
+        call_command("archive_flights", sleep=0, stdout=StringIO())
+        # a late flight on the archived day refreshes the whole day
+        late = self.create_flight(hours=(18, 21), days=-800)
+        self.book(late, 1)
+        process_changes()
+
+        stats = RouteDailyStats.objects.get()
+        self.assertEqual(
+            (stats.flights, stats.seats_sold, stats.flight_hours), (2, 3, 6)
+        )
+
+        late.delete()
+        call_command(
+            "backfill_analytics",
+            start=self.date - timedelta(800),
+            days=1,
+            stdout=StringIO(),
+        )
+
+        stats = RouteDailyStats.objects.get()
+        self.assertEqual(
+            (stats.flights, stats.seats_sold, stats.flight_hours), (1, 2, 3)
+        )
+
+    def test_backfilling_all_days_includes_the_archive(self):
+        archived = self.create_flight(hours=(6, 9), days=-800)
+        self.book(archived, 1, 2)
+        self.create_flight(hours=(6, 9))
+        call_command("archive_flights", sleep=0, stdout=StringIO())
+        RouteDailyStats.objects.all().delete()
+        out = StringIO()
+
+        call_command("backfill_analytics", all=True, stdout=out)
+
+        self.assertIn(
+            f"flights of {self.date - timedelta(800)} to {self.date}", out.getvalue()
+        )
+        self.assertEqual(
+            list(
+                RouteDailyStats.objects.order_by("date").values_list(
+                    "date", "seats_sold"
+                )
+            ),
+            [(self.date - timedelta(800), 2), (self.date, 0)],
+        )
+
+    def test_backfill_command(self):
+        flight = self.create_flight(hours=(6, 9))
+        self.create_flight(hours=(6, 9), days=1)
+        self.book(flight, 1, 2)
+        RouteDailyStats.objects.create(route=self.route, date=self.date - timedelta(1))
+        out = StringIO()
+
+        call_command(
+            "backfill_analytics", start=self.date - timedelta(1), days=2, stdout=out
+        )
+
+        self.assertIn("1 Route daily stats, 1 Airplane daily stats", out.getvalue())
+        self.assertEqual(
+            list(RouteDailyStats.objects.values_list("date", "seats_sold")),
+            [(self.date, 2)],
+        )
+
+
+class AnalyticsApiTest(AnalyticsTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        first = self.create_flight(hours=(6, 9))
+        self.create_flight(hours=(6, 9), days=1)
+        self.book(first, 1, 2, 3, 4, 5)
+        call_command("backfill_analytics", start=self.date, days=2, stdout=StringIO())
+        self.staff = User.objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("analytics:route-stats-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_daily_route_load_factor(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(
+            reverse("analytics:route-stats-list"),
+            {"date_from": self.date.isoformat(), "date_to": self.date.isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (row,) = response.data["results"]
+        self.assertEqual(row["flight_number"], "AA1")
+        self.assertEqual(row["load_factor"], 0.5)
+
+    def test_airplane_summary(self):
+        self.client.force_authenticate(user=self.staff)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("analytics:airplane-stats-summary"))
+
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "airplane": self.airplane.id,
+                    "flights": 2,
+                    "seats_sold": 5,
+                    "capacity": 20,
+                    "load_factor": 0.25,
+                    "flight_hours": 6.0,
+                }
+            ],
+        )
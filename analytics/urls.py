@@ -0,0 +1,19 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from analytics.views import (
+    AirplaneDailyStatsViewSet,
+    BookingSeriesView,
+    RouteDailyStatsViewSet,
+)
+
+router = DefaultRouter()
+router.register("routes", RouteDailyStatsViewSet, basename="route-stats")
+router.register("airplanes", AirplaneDailyStatsViewSet, basename="airplane-stats")
+
+app_name = "analytics"
+
+urlpatterns = [
+    path("bookings/", BookingSeriesView.as_view(), name="bookings"),
+    path("", include(router.urls)),
+]
@@ -0,0 +1,129 @@
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from analytics.bookings import booking_series
+from analytics.filters import AirplaneDailyStatsFilter, RouteDailyStatsFilter
+from analytics.models import AirplaneDailyStats, RouteDailyStats
+from analytics.serializers import (
+    AirplaneDailyStatsSerializer,
+    AirplaneStatsSummarySerializer,
+    BookingBucketSerializer,
+    BookingSeriesQuerySerializer,
+    RouteDailyStatsSerializer,
+    RouteStatsSummarySerializer,
+)
+from base.mixins import BaseViewSetMixin
+from base.pagination import DefaultPagination
+
+
+class DailyStatsViewSet(
+    BaseViewSetMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Daily rollups for staff dashboards. Only the rollup tables are read,
+    never tickets or flights.
+    """
+
+    pagination_class = DefaultPagination
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    ordering_fields = ["date", "load_factor", "seats_sold", "flight_hours"]
+    ordering = ["date"]
+    group_field = None
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """
+        Totals over the filtered days, one row per route or airplane, with
+        the load factor of the summed seats.
+        """
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .values(self.group_field)
+            .annotate(
+                flights_total=Sum("flights"),
+                seats_sold_total=Sum("seats_sold"),
+                capacity_total=Sum("capacity"),
+                flight_hours_total=Sum("flight_hours"),
+            )
+            .annotate(
+                load_factor_total=Cast("seats_sold_total", FloatField())
+                / NullIf(Cast("capacity_total", FloatField()), 0.0)
+            )
+            .order_by(self.group_field)
+        )
+        page = self.paginate_queryset(queryset)
+        rows = [
+            {
+                self.group_field: row[self.group_field],
+                "flights": row["flights_total"],
+                "seats_sold": row["seats_sold_total"],
+                "capacity": row["capacity_total"],
+                "load_factor": row["load_factor_total"],
+                "flight_hours": round(row["flight_hours_total"], 2),
+            }
+            for row in page
+        ]
+        return self.get_paginated_response(self.get_serializer(rows, many=True).data)
+
+
+class RouteDailyStatsViewSet(DailyStatsViewSet):
+    queryset = RouteDailyStats.objects.select_related("route")
+    serializer_class = RouteDailyStatsSerializer
+    filterset_class = RouteDailyStatsFilter
+    group_field = "route"
+
+    action_serializers = {
+        "summary": RouteStatsSummarySerializer,
+    }
+
+
+class AirplaneDailyStatsViewSet(DailyStatsViewSet):
+    queryset = AirplaneDailyStats.objects.select_related("airplane")
+    serializer_class = AirplaneDailyStatsSerializer
+    filterset_class = AirplaneDailyStatsFilter
+    group_field = "airplane"
+
+    action_serializers = {
+        "summary": AirplaneStatsSummarySerializer,
+    }
+
+
+class BookingSeriesView(APIView):
+    """
+    Tickets sold and revenue per minute, hour or day for a flight, a route or
+    the flights departing from an airport, read from the booking buckets.
+    """
+
+    permission_classes = [IsAdminUser]
+    scopes = {
+        "flight": "flight",
+        "route": "flight__route",
+        "airport": "flight__route__source",
+    }
+
+    def get(self, request):
+        params = BookingSeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        scope = {
+            lookup: data[name] for name, lookup in self.scopes.items() if name in data
+        }
+        buckets = booking_series(
+            data["granularity"], data["start"], data["end"], **scope
+        )
+        return Response(
+            {
+                "granularity": data["granularity"],
+                "start": data["start"],
+                "end": data["end"],
+                "buckets": BookingBucketSerializer(buckets, many=True).data,
+            }
+        )
@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+
+class SearchListFilter(admin.SimpleListFilter):
+    """
+    Filter by a value typed into a search box instead of a sidebar listing
+    every choice, which would load all of them on each changelist request.
+    Subclasses set ``lookup``, the field lookup the value is matched with.
+    """
+
+    template = "admin/search_filter.html"
+    lookup = None
+    placeholder = ""
+
+    def lookups(self, request, model_admin):
+        # the filter is only shown when it has lookups, the choices come
+        # from the search box instead
+        return [(self.value(), self.value())]
+
+    def choices(self, changelist):
+        hidden = [
+            (name, value)
+            for name, values in changelist.params.items()
+            if name not in {self.parameter_name, "p"}
+            for value in (values if isinstance(values, list) else [values])
+        ]
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "hidden": hidden,
+        }
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.lookup: self.value()})
+        return queryset
@@ -0,0 +1,12 @@
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db.models import Func
+
+
+class TsTzRange(Func):
+    """
+    tstzrange(lower, upper) of two datetime columns. Ranges are half-open,
+    so an interval ending when the next one starts does not overlap it.
+    """
+
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
@@ -0,0 +1,19 @@
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.db.models import F
+from django.db.models.functions import Upper
+
+
+def trigram_index(field, name):
+    """
+    GIN trigram index on UPPER(field), the expression Django compiles
+    icontains and SearchFilter lookups to on PostgreSQL.
+    """
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+
+def trigram_knn_index(field, name):
+    """
+    GiST trigram index that serves "ORDER BY 'q' <<-> field LIMIT n"
+    nearest-neighbour ranking straight from the index.
+    """
+    return GistIndex(OpClass(F(field), name="gist_trgm_ops"), name=name)
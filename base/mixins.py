@@ -1,3 +1,8 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+
+
 class BaseViewSetMixin:
     def get_serializer_class(self):
         if (
@@ -14,3 +19,54 @@ class BaseViewSetMixin:
         ):
             return [permission() for permission in self.action_permissions[self.action]]
         return super().get_permissions()
+
+
+class ArchiveViewSetMixin:
+    """
+    Let list and retrieve also read the archive tables when asked with
+    ``?include_archived=true``; archived rows keep their ids, so one page is
+    picked from the union of both id lists and then loaded from each table.
+    Views define ``get_archived_queryset``.
+    """
+
+    archived_actions = ("list", "retrieve")
+
+    def include_archived(self):
+        return self.action in self.archived_actions and (
+            self.request.query_params.get("include_archived") in {"1", "true"}
+        )
+
+    def get_archived_queryset(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+        live = self.filter_queryset(self.get_queryset())
+        archived = self.filter_queryset(self.get_archived_queryset())
+        ids = (
+            live.order_by()
+            .values_list("id", flat=True)
+            .union(archived.order_by().values_list("id", flat=True), all=True)
+            .order_by("id")
+        )
+        page = self.paginate_queryset(ids)
+        if page is None:
+            page = list(ids)
+        rows = {**archived.in_bulk(page), **live.in_bulk(page)}
+        serializer = self.get_serializer([rows[pk] for pk in page], many=True)
+        if self.paginator is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if not self.include_archived():
+                raise
+        obj = get_object_or_404(
+            self.get_archived_queryset(), pk=self.kwargs[self.lookup_field]
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
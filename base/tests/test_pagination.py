@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from base.pagination import EstimatedCountPaginator
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser(
+            email="admin@test.com", password="password"
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=3983,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time="2030-01-01T10:00:00Z",
+            arrival_time="2030-01-01T16:00:00Z",
+        )
+        order = Order.objects.create(user=cls.staff)
+        Ticket.objects.bulk_create(
+            Ticket(flight=flight, order=order, row=row, seat=seat)
+            for row in range(1, 11)
+            for seat in range(1, 7)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Ticket._meta.db_table}")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_small_result_sets_are_counted_exactly_in_one_query(self):
+        paginator = EstimatedCountPaginator(
+            Ticket.objects.filter(row__lte=2).order_by("id"), 5
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 12)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_large_tables_are_estimated(self):
+        paginator = EstimatedCountPaginator(Ticket.objects.order_by("id"), 5)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(paginator.count, 60)
+        self.assertEqual(paginator.num_pages, 12)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_large_filtered_result_sets_are_estimated(self):
+        paginator = EstimatedCountPaginator(
+            Ticket.objects.filter(row__lte=5).order_by("id"), 5
+        )
+
+        with self.assertNumQueries(2):
+            self.assertGreater(paginator.count, 10)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_pages_past_an_underestimate_are_served(self):
+        # the planner guesses a third of the rows for a comparison of columns
+        paginator = EstimatedCountPaginator(
+            Ticket.objects.filter(row__lt=F("seat") + 100).order_by("id"), 5
+        )
+        self.assertLess(paginator.count, 30)
+
+        page = paginator.page(11)
+
+        self.assertEqual(len(page), 5)
+        self.assertTrue(page.has_next())
+        self.assertEqual(paginator.count, 56)
+        self.assertFalse(paginator.page(12).has_next())
+        self.assertEqual(paginator.count, 60)
+        with self.assertRaises(EmptyPage):
+            paginator.page(13)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_last_page_corrects_an_overestimate(self):
+        paginator = EstimatedCountPaginator(Ticket.objects.order_by("id"), 5)
+        with mock.patch("base.pagination.estimated_count", return_value=100):
+            self.assertEqual(paginator.num_pages, 20)
+
+        page = paginator.page(12)
+
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next())
+        self.assertEqual((paginator.count, paginator.num_pages), (60, 12))
+        with self.assertRaises(EmptyPage):
+            paginator.page(13)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_api_has_no_next_link_past_an_overestimate(self):
+        self.client.force_authenticate(user=self.staff)
+
+        with mock.patch("base.pagination.estimated_count", return_value=100):
+            response = self.client.get(reverse("tickets:ticket-list"), {"page": 12})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(response.data["count"], 60)
+
+    def test_lists_are_counted_exactly(self):
+        paginator = EstimatedCountPaginator(list(range(7)), 5)
+
+        self.assertEqual(paginator.count, 7)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_api_and_admin_use_the_estimate(self):
+        self.client.force_authenticate(user=self.staff)
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse("tickets:ticket-list"))
+        changelist = self.client.get(reverse("admin:tickets_ticket_changelist"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 60)
+        self.assertEqual(changelist.status_code, status.HTTP_200_OK)
+        self.assertEqual(changelist.context["cl"].result_count, 60)
+
+    @override_settings(EXACT_COUNT_LIMIT=10)
+    def test_archive_union_is_estimated(self):
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(
+            reverse("tickets:ticket-list"), {"include_archived": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(response.data["count"], 10)
+        self.assertEqual(len(response.data["results"]), 5)
@@ -0,0 +1,232 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airplanes.urls import router as airplanes_router
+from airports.models import Airport, Route
+from airports.urls import router as airports_router
+from analytics.urls import router as analytics_router
+from flights.models import Crew, Flight
+from flights.urls import router as flights_router
+from monitoring.models import SlowQuery
+from monitoring.urls import router as monitoring_router
+from tickets.models import Order, Ticket
+from tickets.urls import router as tickets_router
+
+User = get_user_model()
+
+ROUTERS = {
+    "airplanes": airplanes_router,
+    "airports": airports_router,
+    "analytics": analytics_router,
+    "flights": flights_router,
+    "monitoring": monitoring_router,
+    "tickets": tickets_router,
+}
+
+# Maximum number of SQL queries per GET endpoint. The numbers must not depend
+# on the page size or on how many nested objects a row has.
+QUERY_BUDGETS = {
+    "airplanes:airplanes-list": 2,
+    "airplanes:airplanes-detail": 1,
+    "airplanes:airplane-types-list": 2,
+    "airplanes:airplane-types-detail": 2,
+    "airports:airport-list": 2,
+    "airports:airport-detail": 1,
+    "airports:airport-autocomplete": 0,
+    "airports:airport-nearest": 0,
+    "airports:airport-within": 0,
+    "airports:route-list": 2,
+    "airports:route-detail": 1,
+    "analytics:route-stats-list": 2,
+    "analytics:route-stats-summary": 2,
+    "analytics:airplane-stats-list": 2,
+    "analytics:airplane-stats-summary": 2,
+    "flights:flights-list": 3,
+    "flights:flights-detail": 2,
+    "flights:flights-flight-seats": 4,
+    "flights:flights-calendar": 1,
+    "flights:crew-list": 3,
+    "flights:crew-detail": 1,
+    "flights:crew-roster": 1,
+    "monitoring:slow-query-list": 2,
+    "monitoring:slow-query-detail": 1,
+    "tickets:ticket-list": 3,
+    "tickets:ticket-detail": 2,
+    "tickets:ticket-booking-info": 3,
+    "tickets:order-list": 3,
+    "tickets:order-detail": 2,
+}
+
+
+def first_route_pair():
+    route = Route.objects.order_by("pk").first()
+    return {"source": route.source_id, "destination": route.destination_id}
+
+
+# Query parameters for list endpoints that cannot be called without them,
+# callables are evaluated against the seeded dataset.
+ENDPOINT_PARAMS = {
+    "airports:airport-nearest": {"lat": 5, "lon": 5},
+    "airports:airport-within": {"lat": 5, "lon": 5, "radius": 1000},
+    "flights:flights-calendar": first_route_pair,
+}
+
+SMALL_PAGE_SIZE = 1
+LARGE_PAGE_SIZE = 20
+
+
+def seed_dataset(scale=1):
+    """
+    Create a connected dataset where every list row has several nested items.
+    """
+    now = timezone.now()
+    user = User.objects.create_user(email="budget@test.com", password="password")
+
+    airports = Airport.objects.bulk_create(
+        Airport(
+            name=f"Airport {i}",
+            city=f"City {i}",
+            country=f"Country {i % 3}",
+            latitude=i,
+            longitude=i,
+        )
+        for i in range(10 * scale)
+    )
+    routes = Route.objects.bulk_create(
+        Route(
+            source=airports[i % len(airports)],
+            destination=airports[(i + 1) % len(airports)],
+            distance=100 + i,
+            flight_number=f"BG{i}",
+        )
+        for i in range(20 * scale)
+    )
+    airplane_types = AirplaneType.objects.bulk_create(
+        AirplaneType(name=f"Type {i}", category=AirplaneType.AirplaneCategory.PASSENGER)
+        for i in range(3)
+    )
+    airplanes = Airplane.objects.bulk_create(
+        Airplane(
+            name=f"Airplane {i}",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=airplane_types[i % len(airplane_types)],
+        )
+        for i in range(6 * scale)
+    )
+    crew = Crew.objects.bulk_create(
+        Crew(first_name=f"First {i}", last_name=f"Last {i}", rang="Pilot")
+        for i in range(10 * scale)
+    )
+    flights = Flight.objects.bulk_create(
+        Flight(
+            route=routes[i % len(routes)],
+            airplane=airplanes[i % len(airplanes)],
+            departure_time=now + timedelta(days=i + 1),
+            arrival_time=now + timedelta(days=i + 1, hours=3),
+        )
+        for i in range(30 * scale)
+    )
+    Flight.crew.through.objects.bulk_create(
+        Flight.crew.through(flight=flight, crew=crew[(i + j) % len(crew)])
+        for i, flight in enumerate(flights)
+        for j in range(3)
+    )
+    SlowQuery.objects.bulk_create(
+        SlowQuery(
+            fingerprint=f"{i:032x}",
+            normalized_sql=f"SELECT ? FROM t{i}",
+            sample_sql=f"SELECT 1 FROM t{i}",
+            origin="FlightViewSet.list",
+            calls=i + 1,
+            total_ms=600.0 * (i + 1),
+            max_ms=600.0,
+        )
+        for i in range(5 * scale)
+    )
+    orders = Order.objects.bulk_create(Order(user=user) for _ in range(25 * scale))
+    Ticket.objects.bulk_create(
+        Ticket(
+            flight=flights[i % len(flights)],
+            order=order,
+            row=i // len(flights) + 1,
+            seat=seat,
+        )
+        for i, order in enumerate(orders)
+        for seat in (1, 2)
+    )
+
+
+class QueryBudgetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        seed_dataset(scale=2)
+        self.staff_user = User.objects.create_user(
+            email="budget-admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=self.staff_user)
+
+    def get_endpoints(self):
+        for namespace, router in ROUTERS.items():
+            for _, viewset, basename in router.registry:
+                for route in router.get_routes(viewset):
+                    if "get" not in router.get_method_map(viewset, route.mapping):
+                        continue
+                    name = route.name.format(basename=basename)
+                    yield f"{namespace}:{name}", namespace, basename, route.detail
+
+    def get_first_pk(self, namespace, basename):
+        response = self.client.get(reverse(f"{namespace}:{basename}-list"))
+        data = response.data
+        if isinstance(data, dict):
+            data = data["results"]
+        return data[0]["id"]
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+        return len(context.captured_queries)
+
+    def test_every_endpoint_has_budget(self):
+        for view_name, *_ in self.get_endpoints():
+            with self.subTest(view_name=view_name):
+                self.assertIn(view_name, QUERY_BUDGETS)
+
+    def test_endpoints_stay_within_budget(self):
+        for view_name, namespace, basename, detail in self.get_endpoints():
+            budget = QUERY_BUDGETS.get(view_name)
+            if budget is None:
+                continue
+            with self.subTest(view_name=view_name):
+                # also resets the request throttles, the suite sends many
+                cache.clear()
+                if detail:
+                    pk = self.get_first_pk(namespace, basename)
+                    url = reverse(view_name, args=[pk])
+                    self.assertLessEqual(self.count_queries(url), budget)
+                    continue
+
+                url = reverse(view_name)
+                params = ENDPOINT_PARAMS.get(view_name, {})
+                if callable(params):
+                    params = params()
+                # in-memory indexes are built once per worker, not per request
+                self.client.get(url, params)
+                small = self.count_queries(
+                    url, {**params, "page_size": SMALL_PAGE_SIZE}
+                )
+                large = self.count_queries(
+                    url, {**params, "page_size": LARGE_PAGE_SIZE}
+                )
+                self.assertLessEqual(large, budget)
+                self.assertEqual(small, large)
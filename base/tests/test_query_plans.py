@@ -0,0 +1,152 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.models import Order, Ticket
+from tickets.queries import booked_seats
+
+User = get_user_model()
+
+FLIGHTS = 20000
+ROUTES = 40
+AIRPLANES = 100
+
+
+class QueryPlanTest(APITestCase):
+    """
+    The hot flight and ticket queries must be answered from indexes, not by
+    scanning the tables, on a dataset large enough for the planner to care.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        airports = Airport.objects.bulk_create(
+            Airport(name=f"Airport {i}", city=f"City {i}", country="Country")
+            for i in range(ROUTES + 1)
+        )
+        cls.routes = Route.objects.bulk_create(
+            Route(
+                source=airports[i],
+                destination=airports[i + 1],
+                distance=100 + i,
+                flight_number=f"PL{i}",
+            )
+            for i in range(ROUTES)
+        )
+        airplane_type = AirplaneType.objects.create(name="Type")
+        cls.airplanes = Airplane.objects.bulk_create(
+            Airplane(
+                name=f"Airplane {i}",
+                rows=10,
+                seats_in_row=6,
+                airplane_type=airplane_type,
+            )
+            for i in range(AIRPLANES)
+        )
+        # a departure every six minutes, each airplane flies three hours out
+        # of every ten, half of the flights departed already. Rows are stored
+        # out of departure order, as flights are scheduled over time.
+        positions = list(range(FLIGHTS))
+        random.Random(0).shuffle(positions)
+        flights = Flight.objects.bulk_create(
+            Flight(
+                route=cls.routes[i % ROUTES],
+                airplane=cls.airplanes[i % AIRPLANES],
+                departure_time=now + timedelta(minutes=6 * (i - FLIGHTS // 2)),
+                arrival_time=now + timedelta(minutes=6 * (i - FLIGHTS // 2) + 180),
+            )
+            for i in positions
+        )
+        user = User.objects.create_user(email="plans@test.com", password="password")
+        order = Order.objects.create(user=user)
+        Ticket.objects.bulk_create(
+            Ticket(flight=flight, order=order, row=1, seat=seat)
+            for flight in flights
+            for seat in (1, 2)
+        )
+        cls.staff = User.objects.create_user(
+            email="plans-admin@test.com", password="password", is_staff=True
+        )
+        with connection.cursor() as cursor:
+            for model in (Route, Flight, Ticket):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.staff)
+
+    def captured_query(self, url, params, marker):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (sql,) = [
+            query["sql"] for query in context.captured_queries if marker in query["sql"]
+        ]
+        return sql
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(index, plan)
+        self.assertNotIn('Seq Scan on "flights_flight"', plan)
+        self.assertNotIn("Seq Scan on flights_flight", plan)
+
+    def test_upcoming_flights_of_booking_info(self):
+        sql = self.captured_query(
+            reverse("tickets:ticket-booking-info"), {}, "LIMIT 10"
+        )
+
+        self.assertUsesIndex(self.explain(sql), "flight_departure_idx")
+
+    def test_flight_list_in_departure_order(self):
+        sql = self.captured_query(
+            reverse("flights:flights-list"),
+            {},
+            'ORDER BY "flights_flight"."departure_time"',
+        )
+
+        self.assertUsesIndex(self.explain(sql), "flight_departure_idx")
+
+    def test_flights_of_a_route_pair(self):
+        route = self.routes[0]
+        sql = self.captured_query(
+            reverse("flights:flights-calendar"),
+            {"source": route.source_id, "destination": route.destination_id},
+            "GROUP BY",
+        )
+
+        self.assertUsesIndex(self.explain(sql), "flight_route_departure_idx")
+
+    def test_flights_of_an_airplane_in_a_window(self):
+        now = timezone.now()
+        queryset = Flight.objects.filter(
+            airplane=self.airplanes[0],
+            departure_time__gte=now,
+            departure_time__lt=now + timedelta(days=7),
+        ).order_by("departure_time")
+
+        self.assertUsesIndex(queryset.explain(), "flight_airplane_departure_idx")
+
+    def test_ticket_counts_per_flight(self):
+        queryset = Flight.objects.filter(pk=Flight.objects.first().pk).annotate(
+            booked=booked_seats()
+        )
+
+        plan = queryset.explain()
+        self.assertIn("unique_flight_row_seat", plan)
+        self.assertNotIn("Seq Scan on tickets_ticket", plan)
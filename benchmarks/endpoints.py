@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+
+from django.urls import reverse
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Crew, Flight
+from tickets.models import Order, Ticket
+
+
+@dataclass
+class Endpoint:
+    """
+    A GET endpoint driven by the benchmark runner.
+
+    ``model`` is used to pick a primary key for detail routes, ``params`` may be
+    a callable so that filter values are taken from the generated dataset.
+    """
+
+    name: str
+    view_name: str
+    model: type | None = None
+    params: dict | None = None
+    heavy: bool = False
+
+    def build(self):
+        args = []
+        if self.model is not None:
+            pk = self.model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is None:
+                return None, None
+            args.append(pk)
+        params = self.params() if callable(self.params) else self.params
+        return reverse(self.view_name, args=args), params or {}
+
+
+def first_route_params():
+    route = Route.objects.order_by("pk").values("source", "destination").first()
+    if route is None:
+        return {}
+    return {
+        "route__source": route["source"],
+        "route__destination": route["destination"],
+    }
+
+
+def first_route_pair_params():
+    route = Route.objects.order_by("pk").values("source", "destination").first()
+    if route is None:
+        return {}
+    return {"source": route["source"], "destination": route["destination"]}
+
+
+def first_airport_point():
+    airport = (
+        Airport.objects.filter(latitude__isnull=False)
+        .order_by("pk")
+        .values("latitude", "longitude")
+        .first()
+    )
+    if airport is None:
+        return {"lat": 0, "lon": 0}
+    return {"lat": airport["latitude"], "lon": airport["longitude"]}
+
+
+ENDPOINTS = [
+    Endpoint("airports-list", "airports:airport-list"),
+    Endpoint("airports-search", "airports:airport-list", params={"search": "ka"}),
+    Endpoint(
+        "airports-autocomplete", "airports:airport-autocomplete", params={"q": "ka"}
+    ),
+    Endpoint(
+        "airports-nearest", "airports:airport-nearest", params=first_airport_point
+    ),
+    Endpoint(
+        "airports-within",
+        "airports:airport-within",
+        params=lambda: {**first_airport_point(), "radius": 500},
+    ),
+    Endpoint("airports-detail", "airports:airport-detail", model=Airport),
+    Endpoint("routes-list", "airports:route-list"),
+    Endpoint("routes-detail", "airports:route-detail", model=Route),
+    Endpoint("airplanes-list", "airplanes:airplanes-list"),
+    Endpoint("airplanes-detail", "airplanes:airplanes-detail", model=Airplane),
+    Endpoint("airplane-types-list", "airplanes:airplane-types-list"),
+    Endpoint(
+        "airplane-types-detail", "airplanes:airplane-types-detail", model=AirplaneType
+    ),
+    Endpoint("flights-list", "flights:flights-list"),
+    Endpoint("flights-by-route", "flights:flights-list", params=first_route_params),
+    Endpoint(
+        "flights-calendar", "flights:flights-calendar", params=first_route_pair_params
+    ),
+    Endpoint("flights-detail", "flights:flights-detail", model=Flight),
+    Endpoint("flights-seats", "flights:flights-flight-seats", model=Flight),
+    # Nests every flight of every crew member, too slow for large datasets.
+    Endpoint("crew-list", "flights:crew-list", heavy=True),
+    Endpoint("crew-detail", "flights:crew-detail", model=Crew),
+    Endpoint("tickets-list", "tickets:ticket-list"),
+    Endpoint("tickets-detail", "tickets:ticket-detail", model=Ticket),
+    Endpoint("tickets-booking-info", "tickets:ticket-booking-info"),
+    Endpoint("orders-list", "tickets:order-list"),
+    Endpoint("orders-detail", "tickets:order-detail", model=Order),
+]
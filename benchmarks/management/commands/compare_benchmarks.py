@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def change(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+class Command(BaseCommand):
+    help = "Compare two run_benchmarks result files endpoint by endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline")
+        parser.add_argument("candidate")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent change of p95 latency reported as faster or slower.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if any endpoint got slower.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = self.load(options["baseline"])
+        candidate = self.load(options["candidate"])
+        threshold = options["threshold"]
+        regressions = []
+
+        self.stdout.write(
+            f"{'endpoint':<24} {'p50':>18} {'p95':>18} {'queries':>10}  verdict"
+        )
+        for name in sorted(baseline.keys() | candidate.keys()):
+            if name not in baseline or name not in candidate:
+                where = "candidate" if name in candidate else "baseline"
+                self.stdout.write(f"{name:<24} only in {where}")
+                continue
+            before, after = baseline[name], candidate[name]
+            p50 = change(before["p50_ms"], after["p50_ms"])
+            p95 = change(before["p95_ms"], after["p95_ms"])
+            queries = after["queries_max"] - before["queries_max"]
+
+            verdict = ""
+            if p95 > threshold or queries > 0:
+                verdict = "slower"
+                regressions.append(name)
+            elif p95 < -threshold or queries < 0:
+                verdict = "faster"
+
+            self.stdout.write(
+                f"{name:<24} "
+                f"{after['p50_ms']:>9.2f}ms {p50:>+6.1f}% "
+                f"{after['p95_ms']:>9.2f}ms {p95:>+6.1f}% "
+                f"{after['queries_max']:>5} {queries:>+4}  {verdict}"
+            )
+
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"Slower endpoints: {', '.join(regressions)}")
+
+    def load(self, path):
+        try:
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)["endpoints"]
+        except (OSError, KeyError, ValueError) as error:
+            raise CommandError(f"Cannot read {path}: {error}") from error
@@ -0,0 +1,387 @@
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from airplanes.models import Airplane, AirplaneType
+from airports.geo import route_distance_km
+from airports.models import Airport, Route
+from flights.models import Crew, Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+COUNTRIES = [
+    "Argentina",
+    "Australia",
+    "Brazil",
+    "Canada",
+    "China",
+    "Egypt",
+    "France",
+    "Germany",
+    "India",
+    "Indonesia",
+    "Italy",
+    "Japan",
+    "Kenya",
+    "Mexico",
+    "Netherlands",
+    "Nigeria",
+    "Norway",
+    "Poland",
+    "Portugal",
+    "South Africa",
+    "South Korea",
+    "Spain",
+    "Sweden",
+    "Thailand",
+    "Turkey",
+    "Ukraine",
+    "United Kingdom",
+    "United States",
+]
+SYLLABLES = ["ka", "lo", "mar", "ten", "vi", "sa", "ber", "do", "ri", "gal", "an", "po"]
+AIRPORT_SUFFIXES = ["International", "Regional", "Municipal", "Airfield"]
+AIRPLANE_TYPES = [
+    ("Boeing 737", AirplaneType.AirplaneCategory.PASSENGER),
+    ("Boeing 747", AirplaneType.AirplaneCategory.CARGO),
+    ("Boeing 787", AirplaneType.AirplaneCategory.PASSENGER),
+    ("Airbus A320", AirplaneType.AirplaneCategory.PASSENGER),
+    ("Airbus A350", AirplaneType.AirplaneCategory.PASSENGER),
+    ("Embraer E190", AirplaneType.AirplaneCategory.PASSENGER),
+    ("Bombardier Global 7500", AirplaneType.AirplaneCategory.PRIVATE),
+    ("Cessna Citation", AirplaneType.AirplaneCategory.PRIVATE),
+]
+CARRIERS = ["AA", "BA", "DL", "EK", "LH", "PS", "QR", "TK", "UA", "LO"]
+CREW_RANGS = ["Captain", "First Officer", "Purser", "Flight Attendant"]
+CRUISE_SPEED_KMH = 800
+TURNAROUND = timedelta(hours=1)
+PICK_ATTEMPTS = 10
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def airport_code(index):
+    letters = ""
+    for _ in range(3):
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters if index == 0 else f"{letters}{index}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic airline dataset with bulk inserts. "
+        "Production-like scale: --airports 5000 --routes 50000 "
+        "--flights 500000 --tickets 20000000"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--airports", type=int, default=200)
+        parser.add_argument("--routes", type=int, default=2000)
+        parser.add_argument("--airplanes", type=int, default=300)
+        parser.add_argument("--crew", type=int, default=1000)
+        parser.add_argument("--flights", type=int, default=20000)
+        parser.add_argument("--tickets", type=int, default=200000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Flights are spread over this many days around today.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Remove existing airports, airplanes, crew, flights and orders.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        if options["clear"]:
+            self.clear()
+        elif Airport.objects.exists():
+            raise CommandError("Database already has airports, use --clear.")
+
+        airport_ids = self.step("airports", self.create_airports, options["airports"])
+        route_ids = self.step(
+            "routes", self.create_routes, options["routes"], airport_ids
+        )
+        airplane_ids = self.step(
+            "airplanes", self.create_airplanes, options["airplanes"]
+        )
+        crew_ids = self.step("crew", self.create_crew, options["crew"])
+        self.step(
+            "flights",
+            self.create_flights,
+            options["flights"],
+            route_ids,
+            airplane_ids,
+            crew_ids,
+            options["days"],
+        )
+        user_ids = self.step("users", self.create_users, options["users"])
+        self.step("tickets", self.create_tickets, options["tickets"], user_ids)
+
+    def step(self, name, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        total = len(result) if isinstance(result, list) else result
+        self.stdout.write(f"{name}: {total} rows in {elapsed:.1f}s")
+        return result
+
+    def bulk_create(self, model, objects):
+        created = []
+        for chunk in chunked(objects, self.batch_size):
+            with transaction.atomic():
+                created.extend(obj.pk for obj in model.objects.bulk_create(chunk))
+        return created
+
+    def clear(self):
+        models = [Ticket, Order, Flight.crew.through, Flight, Crew, Route, Airport]
+        models += [Airplane, AirplaneType]
+        if connection.vendor == "postgresql":
+            tables = ", ".join(model._meta.db_table for model in models)
+            with connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+            return
+        for model in models:
+            model.objects.all().delete()
+
+    def create_airports(self, count):
+        def make_city(index):
+            rnd = random.Random(index)
+            name = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3)))
+            return name.capitalize()
+
+        return self.bulk_create(
+            Airport,
+            (
+                Airport(
+                    name=(
+                        f"{make_city(i)} "
+                        f"{AIRPORT_SUFFIXES[i % len(AIRPORT_SUFFIXES)]} "
+                        f"({airport_code(i)})"
+                    ),
+                    city=make_city(i),
+                    country=COUNTRIES[i % len(COUNTRIES)],
+                    closest_big_city=make_city(i // 4),
+                    latitude=round(self.random.uniform(-60, 70), 6),
+                    longitude=round(self.random.uniform(-180, 180), 6),
+                )
+                for i in range(count)
+            ),
+        )
+
+    def create_routes(self, count, airport_ids):
+        if count and not airport_ids[1:]:
+            raise CommandError("Routes require at least two airports.")
+        coordinates = {
+            pk: (latitude, longitude)
+            for pk, latitude, longitude in Airport.objects.filter(
+                pk__in=airport_ids
+            ).values_list("pk", "latitude", "longitude")
+        }
+
+        def make_route(index):
+            source, destination = self.random.sample(airport_ids, 2)
+            return Route(
+                source_id=source,
+                destination_id=destination,
+                distance=int(
+                    route_distance_km(*coordinates[source], *coordinates[destination])
+                ),
+                flight_number=f"{CARRIERS[index % len(CARRIERS)]}{index}",
+            )
+
+        return self.bulk_create(Route, (make_route(i) for i in range(count)))
+
+    def create_airplanes(self, count):
+        airplane_types = AirplaneType.objects.bulk_create(
+            AirplaneType(name=name, category=category)
+            for name, category in AIRPLANE_TYPES
+        )
+        return self.bulk_create(
+            Airplane,
+            (
+                Airplane(
+                    name=f"{airplane_types[i % len(airplane_types)].name} #{i}",
+                    rows=self.random.randint(10, 60),
+                    seats_in_row=self.random.choice([4, 6, 8, 10]),
+                    airplane_type=airplane_types[i % len(airplane_types)],
+                )
+                for i in range(count)
+            ),
+        )
+
+    def create_crew(self, count):
+        return self.bulk_create(
+            Crew,
+            (
+                Crew(
+                    first_name=f"Name{i}",
+                    last_name=f"Surname{i}",
+                    rang=CREW_RANGS[i % len(CREW_RANGS)],
+                )
+                for i in range(count)
+            ),
+        )
+
+    def create_flights(self, count, route_ids, airplane_ids, crew_ids, days):
+        if count and not (route_ids and airplane_ids):
+            raise CommandError("Flights require routes and airplanes.")
+
+        distances = dict(
+            Route.objects.filter(pk__in=route_ids).values_list("pk", "distance")
+        )
+        start = timezone.now() - timedelta(days=days // 2)
+        through = Flight.crew.through
+        # flights are scheduled in departure order; airplanes and crew members
+        # are free again a turnaround after their last arrival, so generated
+        # flights never overlap
+        free_at = {}
+        created = 0
+
+        def pick(ids, count, departure):
+            chosen = set()
+            for _ in range(count * PICK_ATTEMPTS):
+                candidate = self.random.choice(ids)
+                if free_at.get(candidate, start) <= departure:
+                    chosen.add(candidate)
+                if len(chosen) == count:
+                    break
+            # a busy schedule delays the flight instead of double-booking
+            while len(chosen) < count:
+                chosen.add(self.random.choice(ids))
+            return list(chosen)
+
+        def make_flight(departure):
+            route_id = self.random.choice(route_ids)
+            airplane_id = pick(airplane_ids, 1, departure)[0]
+            crew = pick(
+                [("crew", crew_id) for crew_id in crew_ids],
+                min(len(crew_ids), self.random.randint(2, 4)),
+                departure,
+            )
+            departure = max(
+                departure,
+                free_at.get(airplane_id, start),
+                *(free_at.get(member, start) for member in crew),
+            )
+            arrival = departure + timedelta(
+                hours=distances[route_id] / CRUISE_SPEED_KMH, minutes=30
+            )
+            for key in [airplane_id, *crew]:
+                free_at[key] = arrival + TURNAROUND
+            flight = Flight(
+                route_id=route_id,
+                airplane_id=airplane_id,
+                departure_time=departure,
+                arrival_time=arrival,
+            )
+            return flight, [crew_id for _, crew_id in crew]
+
+        departures = sorted(
+            start + timedelta(minutes=self.random.randint(0, days * 1440))
+            for _ in range(count)
+        )
+        scheduled = (make_flight(departure) for departure in departures)
+        for chunk in chunked(scheduled, self.batch_size):
+            with transaction.atomic():
+                flights = Flight.objects.bulk_create(flight for flight, _ in chunk)
+                through.objects.bulk_create(
+                    through(flight_id=flight.pk, crew_id=crew_id)
+                    for flight, (_, crew) in zip(flights, chunk, strict=True)
+                    for crew_id in crew
+                )
+            created += len(flights)
+        return created
+
+    def create_users(self, count):
+        password = make_password(None)
+        emails = [f"passenger{i}@example.com" for i in range(count)]
+        existing = set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+        self.bulk_create(
+            User,
+            (
+                User(email=email, password=password)
+                for email in emails
+                if email not in existing
+            ),
+        )
+        return list(User.objects.filter(email__in=emails).values_list("pk", flat=True))
+
+    def create_tickets(self, count, user_ids):
+        flights = Flight.objects.values_list(
+            "pk", "airplane__rows", "airplane__seats_in_row"
+        ).order_by("pk")
+        flight_count = flights.count()
+        if not count or not flight_count:
+            return 0
+        if not user_ids:
+            raise CommandError("Tickets require at least one user.")
+
+        created = 0
+        orders = []
+        tickets = []
+
+        for index, (flight_id, rows, seats_in_row) in enumerate(
+            flights.iterator(chunk_size=2000)
+        ):
+            capacity = rows * seats_in_row
+            remaining = count - created - len(tickets)
+            # spread what is left over the remaining flights, the last one
+            # takes the rest so the total comes out exact when seats allow
+            per_flight = remaining / (flight_count - index)
+            wanted = (
+                remaining
+                if index == flight_count - 1
+                else round(self.random.gauss(per_flight, per_flight / 4))
+            )
+            booked = min(capacity, remaining, max(0, wanted))
+            seats = self.random.sample(range(capacity), booked)
+            while seats:
+                party = seats[: self.random.randint(1, 4)]
+                seats = seats[len(party) :]
+                order = Order(user_id=self.random.choice(user_ids))
+                orders.append(order)
+                tickets.extend(
+                    Ticket(
+                        flight_id=flight_id,
+                        order=order,
+                        row=position // seats_in_row + 1,
+                        seat=position % seats_in_row + 1,
+                    )
+                    for position in party
+                )
+            if len(tickets) >= self.batch_size:
+                created += self.flush_tickets(orders, tickets)
+                orders, tickets = [], []
+            if created + len(tickets) >= count:
+                break
+
+        return created + self.flush_tickets(orders, tickets)
+
+    def flush_tickets(self, orders, tickets):
+        with transaction.atomic():
+            Order.objects.bulk_create(orders, batch_size=self.batch_size)
+            Ticket.objects.bulk_create(tickets, batch_size=self.batch_size)
+        return len(tickets)
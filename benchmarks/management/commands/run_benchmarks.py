@@ -0,0 +1,174 @@
+import json
+import statistics
+import time
+from collections import Counter
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from benchmarks.endpoints import ENDPOINTS
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmarks",
+    }
+}
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every major API endpoint and write latency percentiles, "
+        "throughput and query counts to a JSON file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--page-size", type=int, default=None)
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            help="Only run endpoints with these names.",
+        )
+        parser.add_argument(
+            "--include-heavy",
+            action="store_true",
+            help="Also run endpoints that are unbounded on large datasets.",
+        )
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Keep the cache between requests instead of clearing it.",
+        )
+        parser.add_argument(
+            "--locmem-cache",
+            action="store_true",
+            help="Use a local-memory cache instead of the configured Redis.",
+        )
+        parser.add_argument("--user", default="benchmark@example.com")
+        parser.add_argument("--output", default=None)
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be positive.")
+
+        overrides = {"ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"]}
+        if options["locmem_cache"]:
+            overrides["CACHES"] = LOCMEM_CACHES
+
+        # Throttling would turn the benchmark into a rate-limiter test.
+        with (
+            override_settings(**overrides),
+            mock.patch.object(APIView, "throttle_classes", []),
+        ):
+            results = self.run(options)
+
+        output = options["output"] or (
+            f"benchmark-{timezone.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def run(self, options):
+        user, _ = User.objects.get_or_create(
+            email=options["user"], defaults={"is_staff": True}
+        )
+        # Keep REMOTE_ADDR out of INTERNAL_IPS so the debug toolbar stays off.
+        client = APIClient(REMOTE_ADDR="192.0.2.1")
+        client.force_authenticate(user=user)
+
+        selected = options["endpoints"]
+        endpoints = {}
+        for endpoint in ENDPOINTS:
+            if selected and endpoint.name not in selected:
+                continue
+            if endpoint.heavy and not (selected or options["include_heavy"]):
+                continue
+            url, params = endpoint.build()
+            if url is None:
+                self.stdout.write(f"{endpoint.name}: skipped, no data")
+                continue
+            if options["page_size"]:
+                params["page_size"] = options["page_size"]
+            endpoints[endpoint.name] = self.measure(client, url, params, options)
+            self.stdout.write(self.format_line(endpoint.name, endpoints[endpoint.name]))
+
+        return {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+                "requests": options["requests"],
+                "page_size": options["page_size"],
+                "warm_cache": options["warm_cache"],
+                "dataset": {
+                    "flights": Flight.objects.count(),
+                    "orders": Order.objects.count(),
+                    "tickets": Ticket.objects.count(),
+                },
+            },
+            "endpoints": endpoints,
+        }
+
+    def measure(self, client, url, params, options):
+        for _ in range(options["warmup"]):
+            client.get(url, params)
+
+        latencies = []
+        queries = []
+        statuses = Counter()
+        started = time.perf_counter()
+        for _ in range(options["requests"]):
+            if not options["warm_cache"]:
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                request_started = time.perf_counter()
+                response = client.get(url, params)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            queries.append(len(context.captured_queries))
+            statuses[str(response.status_code)] += 1
+        elapsed = time.perf_counter() - started
+
+        return {
+            "url": url,
+            "params": {key: str(value) for key, value in params.items()},
+            "status_codes": dict(statuses),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "max_ms": round(max(latencies), 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "queries_median": statistics.median_low(queries),
+            "queries_max": max(queries),
+        }
+
+    def format_line(self, name, result):
+        return (
+            f"{name:<24} p50 {result['p50_ms']:>9.2f}ms "
+            f"p95 {result['p95_ms']:>9.2f}ms "
+            f"p99 {result['p99_ms']:>9.2f}ms "
+            f"{result['throughput_rps']:>8.1f} rps "
+            f"{result['queries_max']:>4} queries"
+        )
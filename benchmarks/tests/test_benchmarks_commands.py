@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.test import TestCase
+
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+
+class GenerateDatasetCommandTest(TestCase):
+    def test_generate_dataset(self):
+        call_command(
+            "generate_dataset",
+            airports=20,
+            routes=50,
+            airplanes=5,
+            crew=10,
+            flights=100,
+            tickets=500,
+            users=10,
+            batch_size=40,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Airport.objects.count(), 20)
+        self.assertEqual(Route.objects.count(), 50)
+        self.assertEqual(Flight.objects.count(), 100)
+        self.assertEqual(Ticket.objects.count(), 500)
+        self.assertTrue(Order.objects.exists())
+        self.assertFalse(Route.objects.filter(source=F("destination")).exists())
+
+    def test_generate_dataset_requires_clear(self):
+        Airport.objects.create(name="JFK", city="New York", country="USA")
+        with self.assertRaises(CommandError):
+            call_command("generate_dataset", stdout=StringIO())
+
+
+class RunBenchmarksCommandTest(TestCase):
+    def setUp(self):
+        call_command(
+            "generate_dataset",
+            airports=10,
+            routes=20,
+            airplanes=3,
+            crew=5,
+            flights=20,
+            tickets=60,
+            users=3,
+            stdout=StringIO(),
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_benchmarks(self, name):
+        output = os.path.join(self.directory.name, name)
+        call_command(
+            "run_benchmarks",
+            requests=3,
+            warmup=0,
+            locmem_cache=True,
+            output=output,
+            stdout=StringIO(),
+        )
+        return output
+
+    def test_run_benchmarks_writes_results(self):
+        output = self.run_benchmarks("run.json")
+        with open(output, encoding="utf-8") as file:
+            results = json.load(file)
+
+        self.assertNotIn("crew-list", results["endpoints"])
+        flights = results["endpoints"]["flights-list"]
+        self.assertEqual(flights["status_codes"], {"200": 3})
+        self.assertLessEqual(flights["p50_ms"], flights["p99_ms"])
+        self.assertGreater(flights["queries_max"], 0)
+
+    def test_compare_benchmarks(self):
+        baseline = self.run_benchmarks("baseline.json")
+        candidate = self.run_benchmarks("candidate.json")
+        out = StringIO()
+        call_command("compare_benchmarks", baseline, candidate, stdout=out)
+        self.assertIn("flights-list", out.getvalue())
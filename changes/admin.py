@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from changes.models import Change, ChangeConsumer
+
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = (
+        "position",
+        "table",
+        "object_id",
+        "operation",
+        "reason",
+        "created_at",
+    )
+    list_filter = ("table", "operation", "reason")
+    readonly_fields = [field.name for field in Change._meta.fields]
+
+
+@admin.register(ChangeConsumer)
+class ChangeConsumerAdmin(admin.ModelAdmin):
+    list_display = ("name", "position", "updated_at")
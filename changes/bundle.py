@@ -0,0 +1,60 @@
+import gzip
+import hashlib
+
+from django.db import transaction
+from django.db.models import Max
+from rest_framework.renderers import JSONRenderer
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from changes.models import CatalogBundle, Change
+from changes.sync import CATALOG
+
+# the keys of the bundle and the model each lists
+BUNDLE = {
+    "airports": Airport,
+    "routes": Route,
+    "airplane_types": AirplaneType,
+    "airplanes": Airplane,
+}
+BUNDLE_TABLES = [model._meta.db_table for model in BUNDLE.values()]
+
+
+def catalog_generation():
+    """
+    The position of the last sequenced change to a bundled table, 0 if none.
+    """
+    return (
+        Change.objects.filter(table__in=BUNDLE_TABLES).aggregate(
+            position=Max("position")
+        )["position"]
+        or 0
+    )
+
+
+def build_bundle():
+    """
+    Serialize and compress the catalog unless the latest bundle already has
+    the current generation, and return the latest bundle. Older bundles are
+    deleted.
+    """
+    # read before the catalog, which is then at least as recent
+    generation = catalog_generation()
+    latest = CatalogBundle.objects.defer("content").first()
+    if latest is not None and latest.generation >= generation:
+        return latest
+    data = {"generation": generation}
+    for key, model in BUNDLE.items():
+        serializer = CATALOG[model][1]
+        data[key] = serializer(model._default_manager.order_by("pk"), many=True).data
+    content = JSONRenderer().render(data)
+    with transaction.atomic():
+        bundle = CatalogBundle.objects.create(
+            generation=generation,
+            etag=hashlib.sha256(content).hexdigest(),
+            # mtime=0 keeps the compressed bytes a function of the content
+            content=gzip.compress(content, compresslevel=9, mtime=0),
+            size=len(content),
+        )
+        CatalogBundle.objects.exclude(pk=bundle.pk).delete()
+    return bundle
@@ -0,0 +1,8 @@
+from changes.bundle import build_bundle
+from changes.log import consumer
+
+
+@consumer("catalog-bundle")
+def rebuild_catalog_bundle(changes):
+    # a no-op unless a bundled table changed or no bundle exists yet
+    build_bundle()
@@ -0,0 +1,148 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Exists, Min, OuterRef
+from django.utils import timezone
+
+from changes.models import CATALOG_TABLES, Change, ChangeConsumer
+
+BATCH_SIZE = 500
+# any constant shared by all sequencers, see sequence_changes
+SEQUENCE_LOCK = 4_801_000
+# rows that existed before the change log, entered once for the sync API;
+# consumers have already seen them
+SNAPSHOT_REASON = "snapshot"
+
+CONSUMERS = {}
+
+SEQUENCE_CHANGES = """
+    UPDATE changes_change SET position = batch.position
+    FROM (
+        SELECT id, nextval('changes_change_position_seq') AS position
+        FROM (
+            SELECT id FROM changes_change
+            WHERE position IS NULL
+            ORDER BY id
+            LIMIT %s
+        ) unsequenced
+    ) batch
+    WHERE changes_change.id = batch.id
+"""
+
+
+def consumer(name):
+    """
+    Register the decorated function as the consumer ``name``. It is called
+    with lists of changes in position order and should only do work that is
+    safe to repeat, as a batch is retried when the consumer fails.
+    """
+
+    def register(handler):
+        CONSUMERS[name] = handler
+        return handler
+
+    return register
+
+
+@contextmanager
+def change_reason(reason):
+    """
+    Tag the changes written inside the block, so that consumers can tell
+    e.g. archiving from cancellations. Must be used inside a transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT coalesce(current_setting('changes.reason', true), ''), "
+            "set_config('changes.reason', %s, true)",
+            [reason],
+        )
+        (previous, _) = cursor.fetchone()
+    yield
+    # an exception rolls the setting back with the transaction or savepoint
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('changes.reason', %s, true)", [previous])
+
+
+def sequence_changes(batch_size=BATCH_SIZE):
+    """
+    Give the next positions to up to ``batch_size`` committed changes that
+    have none yet and return how many were sequenced.
+
+    Sequencers take turns on an advisory lock held until they commit, so a
+    position only becomes visible after every lower one has: a consumer that
+    has read up to a position never misses a change below it. Changes of
+    transactions still running are invisible here and get their positions
+    in a later round.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SEQUENCE_LOCK])
+        cursor.execute(SEQUENCE_CHANGES, [batch_size])
+        return cursor.rowcount
+
+
+def consume(name, batch_size=BATCH_SIZE):
+    """
+    Pass the next batch of sequenced changes to the consumer ``name`` and
+    move its position past them, in one transaction. Returns the number of
+    changes handled, 0 once the consumer has caught up.
+    """
+    handler = CONSUMERS[name]
+    with transaction.atomic():
+        state, _ = ChangeConsumer.objects.select_for_update().get_or_create(name=name)
+        changes = list(
+            Change.objects.filter(position__gt=state.position).order_by("position")[
+                :batch_size
+            ]
+        )
+        if not changes:
+            return 0
+        handler([change for change in changes if change.reason != SNAPSHOT_REASON])
+        state.position = changes[-1].position
+        state.save(update_fields=["position", "updated_at"])
+    return len(changes)
+
+
+def process_changes(batch_size=BATCH_SIZE):
+    """
+    Sequence everything committed so far and bring every consumer up to
+    date. Returns the number of changes handled per consumer.
+    """
+    while sequence_changes(batch_size) == batch_size:
+        pass
+    handled = {}
+    for name in CONSUMERS:
+        handled[name] = 0
+        while count := consume(name, batch_size):
+            handled[name] += count
+    return handled
+
+
+def prune_changes():
+    """
+    Delete the changes every registered consumer has processed that are
+    older than ``settings.CHANGE_LOG_RETENTION_HOURS``. Catalog changes are
+    only deleted once a later change of the same object exists, so syncing
+    from any cursor still reaches the latest state and the tombstones.
+    """
+    consumed = ChangeConsumer.objects.filter(name__in=CONSUMERS).aggregate(
+        position=Min("position"), consumers=Count("name")
+    )
+    # a consumer that never ran still needs the whole log
+    if not CONSUMERS or consumed["consumers"] < len(CONSUMERS):
+        return 0
+    old = Change.objects.filter(
+        position__lte=consumed["position"],
+        created_at__lt=timezone.now()
+        - timedelta(hours=settings.CHANGE_LOG_RETENTION_HOURS),
+    )
+    superseded = Change.objects.filter(
+        table=OuterRef("table"),
+        object_id=OuterRef("object_id"),
+        position__gt=OuterRef("position"),
+    )
+    return (
+        old.exclude(table__in=CATALOG_TABLES).delete()[0]
+        + old.filter(Exists(superseded), table__in=CATALOG_TABLES).delete()[0]
+    )
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from changes.log import BATCH_SIZE, process_changes, prune_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Sequence the change log and pass new changes to every registered "
+        "consumer (caches, search indexes, analytics) in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--follow",
+            action="store_true",
+            help="Keep polling for changes instead of stopping once caught up.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls with --follow.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        while True:
+            started = time.perf_counter()
+            handled = process_changes(options["batch_size"])
+            pruned = prune_changes()
+            if any(handled.values()) or not options["follow"]:
+                self.stdout.write(
+                    "Processed "
+                    + ", ".join(
+                        f"{count} for {name}" for name, count in handled.items()
+                    )
+                    + f" in {time.perf_counter() - started:.1f}s. "
+                    f"Pruned {pruned} changes."
+                )
+            if not options["follow"]:
+                break
+            time.sleep(options["sleep"])
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:35
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+TRACKED_TABLES = [
+    "airports_airport",
+    "airports_route",
+    "flights_flight",
+    "tickets_order",
+    "tickets_ticket",
+]
+
+# statement-level triggers read all rows of a bulk write from the transition
+# tables at once; updates that change nothing are not recorded
+RECORD_CHANGES = """
+CREATE SEQUENCE changes_change_position_seq;
+
+CREATE FUNCTION changes_record() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    change_reason text := coalesce(current_setting('changes.reason', true), '');
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO changes_change ("table", object_id, operation, data, reason)
+        SELECT TG_TABLE_NAME, n.id, 'insert', to_jsonb(n), change_reason
+        FROM new_rows n ORDER BY n.id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO changes_change
+            ("table", object_id, operation, data, previous, reason)
+        SELECT TG_TABLE_NAME, n.id, 'update', to_jsonb(n), to_jsonb(o), change_reason
+        FROM new_rows n JOIN old_rows o ON o.id = n.id
+        WHERE to_jsonb(n) <> to_jsonb(o) ORDER BY n.id;
+    ELSE
+        INSERT INTO changes_change ("table", object_id, operation, data, reason)
+        SELECT TG_TABLE_NAME, o.id, 'delete', to_jsonb(o), change_reason
+        FROM old_rows o ORDER BY o.id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+CREATE_TRIGGERS = """
+CREATE TRIGGER {table}_insert_changes AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+CREATE TRIGGER {table}_update_changes AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+CREATE TRIGGER {table}_delete_changes AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+"""
+DROP_TRIGGERS = """
+DROP TRIGGER {table}_insert_changes ON {table};
+DROP TRIGGER {table}_update_changes ON {table};
+DROP TRIGGER {table}_delete_changes ON {table};
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('airports', '0005_airport_coordinates'),
+        ('flights', '0004_flight_indexes'),
+        ('tickets', '0006_ticket_flight_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeConsumer',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.BigIntegerField(blank=True, null=True, unique=True)),
+                ('table', models.CharField(max_length=63)),
+                ('object_id', models.BigIntegerField()),
+                ('operation', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('data', models.JSONField(help_text='The row after the change, before a delete.')),
+                ('previous', models.JSONField(blank=True, help_text='The row before an update.', null=True)),
+                ('reason', models.CharField(blank=True, default='', max_length=50)),
+                ('created_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(condition=models.Q(('position__isnull', True)), fields=['id'], name='change_unsequenced_idx')],
+            },
+        ),
+        migrations.RunSQL(
+            RECORD_CHANGES,
+            "DROP FUNCTION changes_record(); DROP SEQUENCE changes_change_position_seq;",
+        ),
+        migrations.RunSQL(
+            "".join(CREATE_TRIGGERS.format(table=table) for table in TRACKED_TABLES),
+            "".join(DROP_TRIGGERS.format(table=table) for table in TRACKED_TABLES),
+        ),
+    ]
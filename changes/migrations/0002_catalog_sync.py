@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:42
+
+from django.db import migrations, models
+
+NEW_TABLES = ["airplanes_airplanetype", "airplanes_airplane"]
+CATALOG_TABLES = [
+    "airports_airport",
+    "airports_route",
+    "airplanes_airplanetype",
+    "airplanes_airplane",
+    "flights_flight",
+]
+
+CREATE_TRIGGERS = """
+CREATE TRIGGER {table}_insert_changes AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+CREATE TRIGGER {table}_update_changes AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+CREATE TRIGGER {table}_delete_changes AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION changes_record();
+"""
+DROP_TRIGGERS = """
+DROP TRIGGER {table}_insert_changes ON {table};
+DROP TRIGGER {table}_update_changes ON {table};
+DROP TRIGGER {table}_delete_changes ON {table};
+"""
+# rows that predate the change log enter it once, so that syncing from the
+# start returns the whole catalog
+SNAPSHOT = """
+INSERT INTO changes_change ("table", object_id, operation, data, reason)
+SELECT '{table}', t.id, 'insert', to_jsonb(t), 'snapshot' FROM {table} t ORDER BY t.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(condition=models.Q(('table__in', ['airports_airport', 'airports_route', 'airplanes_airplanetype', 'airplanes_airplane', 'flights_flight'])), fields=['position'], name='change_catalog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(condition=models.Q(('table__in', ['airports_airport', 'airports_route', 'airplanes_airplanetype', 'airplanes_airplane', 'flights_flight'])), fields=['table', 'object_id', 'position'], name='change_catalog_object_idx'),
+        ),
+        migrations.RunSQL(
+            "".join(CREATE_TRIGGERS.format(table=table) for table in NEW_TABLES),
+            "".join(DROP_TRIGGERS.format(table=table) for table in NEW_TABLES),
+        ),
+        migrations.RunSQL(
+            "".join(SNAPSHOT.format(table=table) for table in CATALOG_TABLES),
+            migrations.RunSQL.noop,
+        ),
+    ]
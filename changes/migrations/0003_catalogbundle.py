@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0002_catalog_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.BigIntegerField(help_text='The change log position the bundle is up to date with.', unique=True)),
+                ('etag', models.CharField(max_length=64)),
+                ('content', models.BinaryField(help_text='The bundle JSON, gzip-compressed.')),
+                ('size', models.PositiveIntegerField(help_text='The uncompressed size in bytes.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-generation'],
+            },
+        ),
+    ]
@@ -0,0 +1,114 @@
+from functools import cache
+
+from django.apps import apps
+from django.db import models
+from django.db.models.functions import Now
+
+# tables the sync API serves; their changes are compacted instead of pruned
+CATALOG_TABLES = [
+    "airports_airport",
+    "airports_route",
+    "airplanes_airplanetype",
+    "airplanes_airplane",
+    "flights_flight",
+]
+
+
+@cache
+def model_for_table(table):
+    return next(model for model in apps.get_models() if model._meta.db_table == table)
+
+
+class Change(models.Model):
+    """
+    A row inserted, updated or deleted in one of the tracked tables, written
+    by a database trigger in the same transaction as the change itself.
+
+    ``position`` is given once the writing transaction has committed (see
+    changes.log.sequence_changes), so reading positions in order never skips
+    a change that commits late.
+    """
+
+    class Operation(models.TextChoices):
+        INSERT = "insert"
+        UPDATE = "update"
+        DELETE = "delete"
+
+    position = models.BigIntegerField(null=True, blank=True, unique=True)
+    table = models.CharField(max_length=63)
+    object_id = models.BigIntegerField()
+    operation = models.CharField(max_length=6, choices=Operation)
+    data = models.JSONField(help_text="The row after the change, before a delete.")
+    previous = models.JSONField(
+        null=True, blank=True, help_text="The row before an update."
+    )
+    reason = models.CharField(max_length=50, blank=True, default="")
+    created_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        ordering = ["position"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(position__isnull=True),
+                name="change_unsequenced_idx",
+            ),
+            models.Index(
+                fields=["position"],
+                condition=models.Q(table__in=CATALOG_TABLES),
+                name="change_catalog_idx",
+            ),
+            models.Index(
+                fields=["table", "object_id", "position"],
+                condition=models.Q(table__in=CATALOG_TABLES),
+                name="change_catalog_object_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} {self.table} {self.object_id}"
+
+    @property
+    def model(self):
+        return model_for_table(self.table)
+
+    @property
+    def rows(self):
+        """
+        The row as it is after the change and, for updates, as it was.
+        """
+        return [self.data] if self.previous is None else [self.data, self.previous]
+
+
+class ChangeConsumer(models.Model):
+    """
+    How far a registered consumer has processed the change log.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} at {self.position}"
+
+
+class CatalogBundle(models.Model):
+    """
+    The whole catalog as one gzip-compressed JSON document, rebuilt by the
+    catalog-bundle consumer (see changes.bundle) so requests serve it as is.
+    """
+
+    generation = models.BigIntegerField(
+        unique=True, help_text="The change log position the bundle is up to date with."
+    )
+    etag = models.CharField(max_length=64)
+    content = models.BinaryField(help_text="The bundle JSON, gzip-compressed.")
+    size = models.PositiveIntegerField(help_text="The uncompressed size in bytes.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-generation"]
+
+    def __str__(self):
+        return f"catalog bundle {self.generation}"
@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from airplanes.models import Airplane
+from airports.models import Route
+from flights.models import Flight
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(
+        min_value=0,
+        default=0,
+        help_text="The cursor of the previous sync, 0 for the whole catalog.",
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+
+# the airport and airplane type serializers of the API are flat already;
+# catalog objects refer to each other by id, the client has them all
+
+
+class SyncRouteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Route
+        fields = ["id", "source", "destination", "distance", "flight_number"]
+
+
+class SyncAirplaneSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Airplane
+        fields = ["id", "name", "rows", "seats_in_row", "airplane_type", "photo"]
+
+
+class SyncFlightSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Flight
+        fields = ["id", "route", "airplane", "departure_time", "arrival_time"]
@@ -0,0 +1,67 @@
+from airplanes.models import Airplane, AirplaneType
+from airplanes.serializers import AirplaneTypeSerializer
+from airports.models import Airport, Route
+from airports.serializers import AirportSerializer
+from changes.models import CATALOG_TABLES, Change
+from changes.serializers import (
+    SyncAirplaneSerializer,
+    SyncFlightSerializer,
+    SyncRouteSerializer,
+)
+from flights.models import Flight
+
+# the type name clients see and the serializer of each catalog model
+CATALOG = {
+    Airport: ("airport", AirportSerializer),
+    Route: ("route", SyncRouteSerializer),
+    AirplaneType: ("airplane_type", AirplaneTypeSerializer),
+    Airplane: ("airplane", SyncAirplaneSerializer),
+    Flight: ("flight", SyncFlightSerializer),
+}
+
+
+def catalog_changes(since, limit):
+    """
+    The catalog objects changed after the position ``since``, each once in
+    its current state or as a tombstone when it is gone, with the cursor to
+    pass next time and whether more changes are waiting. Reads one page of
+    the change log plus one query per changed model.
+    """
+    changes = list(
+        Change.objects.filter(position__gt=since, table__in=CATALOG_TABLES).order_by(
+            "position"
+        )[:limit]
+    )
+    latest = {}
+    for change in changes:
+        # keep each object at the position of its last change
+        latest.pop((change.model, change.object_id), None)
+        latest[change.model, change.object_id] = change
+
+    ids = {model: set() for model in CATALOG}
+    for (model, object_id), change in latest.items():
+        if change.operation != Change.Operation.DELETE:
+            ids[model].add(object_id)
+    # one serializer per model, the field set is built once
+    rows = {}
+    for model, model_ids in ids.items():
+        if model_ids:
+            serializer = CATALOG[model][1]
+            objects = model._default_manager.filter(pk__in=model_ids)
+            rows[model] = {
+                row["id"]: row for row in serializer(objects, many=True).data
+            }
+
+    items = []
+    for model, object_id in list(latest):
+        # missing too when deleted by a change past this page
+        row = rows.get(model, {}).get(object_id)
+        item = {"type": CATALOG[model][0], "id": object_id, "deleted": row is None}
+        if row is not None:
+            item["data"] = row
+        items.append(item)
+    return {
+        "cursor": changes[-1].position if changes else since,
+        "has_more": len(changes) == limit,
+        "changes": items,
+    }
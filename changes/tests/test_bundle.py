@@ -0,0 +1,107 @@
+import gzip
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from changes.log import process_changes
+from changes.models import CatalogBundle
+from flights.models import Flight
+
+User = get_user_model()
+BUNDLE_URL = reverse("changes:bundle")
+
+
+class CatalogBundleTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.lax = Airport.objects.create(name="LAX", city="Los Angeles", country="USA")
+        self.route = Route.objects.create(
+            source=self.jfk, destination=self.lax, distance=3983, flight_number="AA1"
+        )
+        self.airplane_type = AirplaneType.objects.create(name="Boeing")
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737", rows=10, seats_in_row=6, airplane_type=self.airplane_type
+        )
+        process_changes()
+
+    def get_bundle(self, **headers):
+        return self.client.get(BUNDLE_URL, **headers)
+
+    def test_bundle_is_served_precompressed(self):
+        response = self.get_bundle(HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=3600", response["Cache-Control"])
+        self.assertRegex(response["ETag"], r'^"[0-9a-f]{64}-gzip"$')
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(
+            [airport["name"] for airport in data["airports"]], ["JFK", "LAX"]
+        )
+        self.assertEqual(data["routes"][0]["source"], self.jfk.id)
+        self.assertEqual(data["airplane_types"][0]["name"], "Boeing")
+        self.assertEqual(data["airplanes"][0]["airplane_type"], self.airplane_type.id)
+
+    def test_uncompressed_representation_has_its_own_etag(self):
+        compressed = self.get_bundle(HTTP_ACCEPT_ENCODING="gzip")
+        plain = self.get_bundle(HTTP_ACCEPT_ENCODING="identity")
+
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(
+            json.loads(plain.content), json.loads(gzip.decompress(compressed.content))
+        )
+        self.assertEqual(compressed["ETag"], plain["ETag"][:-1] + '-gzip"')
+
+    def test_unchanged_bundle_is_not_sent_again(self):
+        etag = self.get_bundle(HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.get_bundle(
+                HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("max-age=3600", response["Cache-Control"])
+
+    def test_bundle_is_rebuilt_when_the_catalog_changes(self):
+        bundle = CatalogBundle.objects.get()
+        Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=6),
+        )
+        process_changes()
+        self.assertEqual(CatalogBundle.objects.get(), bundle)
+
+        self.jfk.city = "Queens"
+        self.jfk.save()
+        process_changes()
+
+        rebuilt = CatalogBundle.objects.get()
+        self.assertGreater(rebuilt.generation, bundle.generation)
+        self.assertNotEqual(rebuilt.etag, bundle.etag)
+        data = json.loads(self.get_bundle().content)
+        self.assertEqual(data["generation"], rebuilt.generation)
+        self.assertEqual(data["airports"][0]["city"], "Queens")
+
+    def test_missing_bundle(self):
+        CatalogBundle.objects.all().delete()
+
+        response = self.get_bundle()
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from airports.models import Airport
+from changes.log import (
+    CONSUMERS,
+    change_reason,
+    consume,
+    process_changes,
+    prune_changes,
+    sequence_changes,
+)
+from changes.models import Change, ChangeConsumer
+from tickets.models import Order
+
+
+class ChangeLogTest(TestCase):
+    def setUp(self):
+        self.batches = []
+        consumers = mock.patch.dict(
+            CONSUMERS, {"test": self.batches.append}, clear=True
+        )
+        consumers.start()
+        self.addCleanup(consumers.stop)
+
+    def create_airports(self, *names):
+        return Airport.objects.bulk_create(
+            Airport(name=name, city=name, country="USA") for name in names
+        )
+
+    def test_writes_are_recorded_in_their_transaction(self):
+        jfk, lax = self.create_airports("JFK", "LAX")
+        jfk.city = "New York"
+        jfk.save()
+        lax.save()
+        Airport.objects.filter(pk=lax.pk).delete()
+
+        changes = Change.objects.order_by("id")
+        self.assertEqual(
+            [(c.model, c.object_id, c.operation) for c in changes],
+            [
+                (Airport, jfk.id, "insert"),
+                (Airport, lax.id, "insert"),
+                (Airport, jfk.id, "update"),
+                (Airport, lax.id, "delete"),
+            ],
+        )
+        update = changes[2]
+        self.assertEqual(
+            (update.data["city"], update.previous["city"]), ("New York", "JFK")
+        )
+
+    def test_rolled_back_writes_leave_nothing(self):
+        with transaction.atomic():
+            self.create_airports("JFK")
+            transaction.set_rollback(True)
+
+        self.assertFalse(Change.objects.exists())
+
+    def test_positions_follow_the_log_and_consumers_resume(self):
+        self.create_airports("JFK", "LAX", "SFO")
+        self.assertEqual(sequence_changes(batch_size=2), 2)
+        self.assertEqual(sequence_changes(batch_size=2), 1)
+        positions = list(
+            Change.objects.order_by("id").values_list("position", flat=True)
+        )
+        self.assertEqual(positions, sorted(positions))
+
+        self.assertEqual(consume("test", batch_size=2), 2)
+        self.assertEqual(consume("test", batch_size=2), 1)
+        self.assertEqual(consume("test", batch_size=2), 0)
+        self.assertEqual([len(batch) for batch in self.batches], [2, 1])
+        self.assertEqual(ChangeConsumer.objects.get().position, positions[-1])
+
+    def test_failed_batches_are_retried(self):
+        self.create_airports("JFK")
+        CONSUMERS["test"] = mock.Mock(side_effect=RuntimeError)
+
+        with self.assertRaises(RuntimeError):
+            process_changes()
+        CONSUMERS["test"] = self.batches.append
+        process_changes()
+
+        self.assertEqual(len(self.batches), 1)
+
+    def test_reason_is_recorded(self):
+        with transaction.atomic(), change_reason("import"):
+            self.create_airports("JFK")
+        self.create_airports("LAX")
+
+        self.assertEqual(
+            list(Change.objects.order_by("id").values_list("reason", flat=True)),
+            ["import", ""],
+        )
+
+    @override_settings(CHANGE_LOG_RETENTION_HOURS=1)
+    def test_prune_keeps_what_a_consumer_still_needs(self):
+        user = get_user_model().objects.create_user(email="test@test.com")
+        Order.objects.create(user=user)
+        last = Order.objects.create(user=user)
+        Change.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        sequence_changes()
+        self.assertEqual(prune_changes(), 0)
+
+        consume("test", batch_size=1)
+        self.assertEqual(prune_changes(), 1)
+        self.assertEqual(Change.objects.get().object_id, last.id)
+
+    def test_command(self):
+        self.create_airports("JFK")
+        out = StringIO()
+
+        call_command("process_changes", stdout=out)
+
+        self.assertIn("Processed 1 for test", out.getvalue())
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from changes.log import process_changes, prune_changes
+from changes.models import Change
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class CatalogSyncTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.lax = Airport.objects.create(name="LAX", city="Los Angeles", country="USA")
+        self.route = Route.objects.create(
+            source=self.jfk, destination=self.lax, distance=3983, flight_number="AA1"
+        )
+        self.airplane_type = AirplaneType.objects.create(name="Boeing")
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737", rows=10, seats_in_row=6, airplane_type=self.airplane_type
+        )
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=6),
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+        process_changes()
+        self.url = reverse("changes:sync")
+
+    def sync(self, since, **params):
+        response = self.client.get(self.url, {"since": since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_first_sync_returns_the_catalog(self):
+        with self.assertNumQueries(6):
+            data = self.sync(0)
+
+        self.assertEqual(
+            [(item["type"], item["id"]) for item in data["changes"]],
+            [
+                ("airport", self.jfk.id),
+                ("airport", self.lax.id),
+                ("route", self.route.id),
+                ("airplane_type", self.airplane_type.id),
+                ("airplane", self.airplane.id),
+                ("flight", self.flight.id),
+            ],
+        )
+        self.assertEqual(data["changes"][2]["data"]["source"], self.jfk.id)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(self.sync(data["cursor"])["changes"], [])
+
+    def test_later_syncs_return_updates_once_and_tombstones(self):
+        cursor = self.sync(0)["cursor"]
+        self.jfk.city = "Queens"
+        self.jfk.save()
+        self.jfk.city = "New York City"
+        self.jfk.save()
+        flight_id = self.flight.id
+        self.flight.delete()
+        process_changes()
+
+        data = self.sync(cursor)
+
+        self.assertEqual(
+            data["changes"],
+            [
+                {
+                    "type": "airport",
+                    "id": self.jfk.id,
+                    "deleted": False,
+                    "data": {**data["changes"][0]["data"], "city": "New York City"},
+                },
+                {"type": "flight", "id": flight_id, "deleted": True},
+            ],
+        )
+
+    def test_pages(self):
+        first = self.sync(0, limit=4)
+        second = self.sync(first["cursor"], limit=4)
+
+        self.assertTrue(first["has_more"])
+        self.assertEqual(len(first["changes"]) + len(second["changes"]), 6)
+        self.assertFalse(second["has_more"])
+
+    def test_changes_are_committed_before_they_are_served(self):
+        cursor = self.sync(0)["cursor"]
+        Airport.objects.create(name="SFO", city="San Francisco", country="USA")
+
+        self.assertEqual(self.sync(cursor)["changes"], [])
+
+    @override_settings(CHANGE_LOG_RETENTION_HOURS=0)
+    def test_pruning_keeps_the_latest_catalog_changes(self):
+        self.jfk.save(update_fields=["name"])
+        self.lax.name = "Los Angeles International"
+        self.lax.save()
+        self.flight.delete()
+        process_changes()
+
+        prune_changes()
+
+        self.assertEqual(
+            sorted(Change.objects.values_list("table", "operation")),
+            [
+                ("airplanes_airplane", "insert"),
+                ("airplanes_airplanetype", "insert"),
+                ("airports_airport", "insert"),
+                ("airports_airport", "update"),
+                ("airports_route", "insert"),
+                ("flights_flight", "delete"),
+            ],
+        )
+        self.assertEqual(len(self.sync(0)["changes"]), 6)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from changes.views import CatalogBundleView, CatalogSyncView
+
+app_name = "changes"
+
+urlpatterns = [
+    path("", CatalogSyncView.as_view(), name="sync"),
+    path("bundle/", CatalogBundleView.as_view(), name="bundle"),
+]
@@ -0,0 +1,73 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from changes.models import CatalogBundle
+from changes.serializers import SyncQuerySerializer
+from changes.sync import catalog_changes
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def bundle_etag(bundle, compressed):
+    # the two encodings are different representations
+    return f'"{bundle.etag}-gzip"' if compressed else f'"{bundle.etag}"'
+
+
+class CatalogSyncView(APIView):
+    """
+    Airports, routes, airplanes, airplane types and flights created, updated
+    or deleted since a cursor, for clients that keep a copy of the catalog.
+    Start with ``since=0`` and pass the returned cursor next time; repeat
+    while ``has_more`` is true.
+    """
+
+    def get(self, request):
+        params = SyncQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(catalog_changes(**params.validated_data))
+
+
+class CatalogBundleView(APIView):
+    """
+    Every airport, route, airplane type and airplane in one JSON document,
+    served precompressed as the catalog-bundle consumer last built it. The
+    catalog is the same for every user, so shared caches may keep it and
+    revalidate it with its ETag.
+    """
+
+    def get(self, request):
+        bundle = CatalogBundle.objects.defer("content").first()
+        if bundle is None:
+            raise NotFound("The catalog bundle has not been built yet.")
+        compressed = bool(
+            ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", ""))
+        )
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        etag = bundle_etag(bundle, compressed)
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            # the content only now; a rebuild may have replaced the bundle
+            bundle = CatalogBundle.objects.first()
+            etag = bundle_etag(bundle, compressed)
+            content = bytes(bundle.content)
+            response = HttpResponse(
+                content if compressed else gzip.decompress(content),
+                content_type="application/json",
+            )
+            if compressed:
+                response.headers["Content-Encoding"] = "gzip"
+        response.headers["ETag"] = etag
+        patch_cache_control(
+            response, public=True, max_age=settings.CATALOG_BUNDLE_MAX_AGE
+        )
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
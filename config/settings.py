@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -49,11 +50,16 @@ INSTALLED_APPS = [
     "debug_toolbar",
     "django_filters",
     # Local apps
+    "base",
     "airplanes",
     "airports",
     "flights",
     "tickets",
     "users",
+    "benchmarks",
+    "monitoring",
+    "analytics",
+    "changes",
 ]
 
 MIDDLEWARE = [
@@ -64,6 +70,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
+    "monitoring.middleware.SlowQueryMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -192,6 +200,27 @@ CACHES = {
     }
 }
 
+# statements slower than this are recorded with their EXPLAIN plan, 0 disables
+SLOW_QUERY_THRESHOLD_MS = env.int("SLOW_QUERY_THRESHOLD_MS", default=500)
+
+# how long held seats stay reserved before they are released to others
+SEAT_HOLD_MINUTES = env.int("SEAT_HOLD_MINUTES", default=10)
+
+# responses to requests with an Idempotency-Key header are replayed this long
+IDEMPOTENCY_KEY_HOURS = env.int("IDEMPOTENCY_KEY_HOURS", default=24)
+
+# paginated lists are counted exactly up to this many rows, and from the
+# planner's estimate above it
+EXACT_COUNT_LIMIT = env.int("EXACT_COUNT_LIMIT", default=10000)
+
+# processed change log entries are kept this long before process_changes
+# prunes them
+CHANGE_LOG_RETENTION_HOURS = env.int("CHANGE_LOG_RETENTION_HOURS", default=24)
+
+# how long clients and shared caches may reuse the catalog bundle before
+# revalidating it with its ETag
+CATALOG_BUNDLE_MAX_AGE = env.int("CATALOG_BUNDLE_MAX_AGE", default=3600)
+
 # settings for django-debug-toolbar
 INTERNAL_IPS = [
     "127.0.0.1",
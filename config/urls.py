@@ -29,6 +29,9 @@ urlpatterns = [
     path("api/airports/", include("airports.urls", namespace="airports")),
     path("api/flights/", include("flights.urls", namespace="flights")),
     path("api/tickets/", include("tickets.urls", namespace="tickets")),
+    path("api/monitoring/", include("monitoring.urls", namespace="monitoring")),
+    path("api/analytics/", include("analytics.urls", namespace="analytics")),
+    path("api/changes/", include("changes.urls", namespace="changes")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -1,12 +1,14 @@
 from django.contrib import admin
 
+from airports.admin import RouteDestinationFilter, RouteSourceFilter
+
 from .models import Crew, Flight
 
 
 @admin.register(Flight)
 class FlightAdmin(admin.ModelAdmin):
     list_display = ("id", "route", "airplane", "departure_time", "arrival_time")
-    list_filter = ("route__source", "route__destination", "departure_time")
+    list_filter = (RouteSourceFilter, RouteDestinationFilter, "departure_time")
     search_fields = (
         "id",
         "route__source__name",
@@ -17,6 +19,15 @@ class FlightAdmin(admin.ModelAdmin):
     filter_horizontal = ("crew",)
     date_hierarchy = "departure_time"
 
+    def get_queryset(self, request):
+        # Flight.__str__ names both airports and the airplane, which the
+        # changelist, the change form and autocomplete results all render
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("route__source", "route__destination", "airplane")
+        )
+
 
 @admin.register(Crew)
 class CrewAdmin(admin.ModelAdmin):
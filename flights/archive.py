@@ -0,0 +1,81 @@
+from django.db import connection, transaction
+
+from analytics.models import BookingBucket
+from changes.log import change_reason
+from flights.models import ArchivedFlight, Flight
+from tickets.models import ArchivedTicket, Ticket
+
+FlightCrew = Flight.crew.through
+ArchivedFlightCrew = ArchivedFlight.crew.through
+# the reason the change log gives for rows deleted from the live tables here
+ARCHIVE_REASON = "archive"
+
+
+def move_rows(source, target, key, columns):
+    """
+    Delete the rows of ``source`` whose ``key`` column is in the ids passed
+    at execution and insert them into ``target``, in a single statement.
+    ``columns`` maps source columns to target columns.
+    """
+    quote = connection.ops.quote_name
+    return (
+        f"WITH moved AS (DELETE FROM {quote(source._meta.db_table)} "
+        f"WHERE {quote(key)} = ANY(%s) "
+        f"RETURNING {', '.join(quote(column) for column in columns)}) "
+        f"INSERT INTO {quote(target._meta.db_table)} "
+        f"({', '.join(quote(column) for column in columns.values())}) "
+        f"SELECT {', '.join(quote(column) for column in columns)} FROM moved"
+    )
+
+
+FLIGHT_COLUMNS = {
+    "id": "id",
+    "route_id": "route_id",
+    "airplane_id": "airplane_id",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+}
+MOVE_FLIGHTS = move_rows(Flight, ArchivedFlight, "id", FLIGHT_COLUMNS)
+MOVE_CREW = move_rows(
+    FlightCrew,
+    ArchivedFlightCrew,
+    "flight_id",
+    {"flight_id": "archivedflight_id", "crew_id": "crew_id"},
+)
+MOVE_TICKETS = move_rows(
+    Ticket,
+    ArchivedTicket,
+    "flight_id",
+    {
+        column: column
+        for column in ["id", "row", "seat", "flight_id", "order_id", "price"]
+    },
+)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Move up to ``batch_size`` flights that arrived before ``cutoff`` to the
+    archive tables, with their crew and tickets, and return how many moved.
+
+    Each batch is its own short transaction; flights locked by a concurrent
+    update are skipped rather than waited for and picked up by a later run.
+    Booking buckets of the moved flights are dropped, their totals stay in
+    the daily route and airplane rollups. The deletes reach the change log
+    marked with ARCHIVE_REASON.
+    """
+    with transaction.atomic():
+        flight_ids = list(
+            Flight.objects.filter(arrival_time__lt=cutoff)
+            .order_by("pk")
+            .select_for_update(skip_locked=True)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not flight_ids:
+            return 0
+        with change_reason(ARCHIVE_REASON), connection.cursor() as cursor:
+            cursor.execute(MOVE_FLIGHTS, [flight_ids])
+            cursor.execute(MOVE_CREW, [flight_ids])
+            cursor.execute(MOVE_TICKETS, [flight_ids])
+        BookingBucket.objects.filter(flight_id__in=flight_ids).delete()
+    return len(flight_ids)
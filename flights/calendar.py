@@ -0,0 +1,85 @@
+from datetime import datetime, time, timedelta
+from time import time_ns
+
+from django.core.cache import cache
+from django.db.models import Count, F, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from flights.models import Flight
+from tickets.queries import booked_seats
+
+CALENDAR_CACHE_KEY = "flight-calendar:{}:{}:{}:{}:{}"
+# the calendars of a route pair are keyed by its current version, so
+# dropping the version key invalidates every window of the pair at once
+CALENDAR_VERSION_KEY = "flight-calendar-version:{}:{}"
+CALENDAR_TTL = 60 * 5
+
+
+def get_calendar_days(source, destination, start, end):
+    """
+    Flight count, earliest departure and fewest remaining seats per day for
+    flights from source to destination, grouped in a single query.
+    """
+    start_time = timezone.make_aware(datetime.combine(start, time.min))
+    end_time = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    rows = (
+        Flight.objects.filter(
+            route__source=source,
+            route__destination=destination,
+            departure_time__gte=start_time,
+            departure_time__lt=end_time,
+        )
+        .annotate(date=TruncDate("departure_time"))
+        .values("date")
+        .annotate(
+            flights=Count("pk"),
+            earliest_departure=Min("departure_time"),
+            min_remaining_seats=Min(
+                F("airplane__rows") * F("airplane__seats_in_row") - booked_seats()
+            ),
+        )
+        .order_by("date")
+    )
+    by_date = {row["date"]: row for row in rows}
+    return [
+        by_date.get(
+            day,
+            {
+                "date": day,
+                "flights": 0,
+                "earliest_departure": None,
+                "min_remaining_seats": None,
+            },
+        )
+        for day in (
+            start + timedelta(days=offset) for offset in range((end - start).days + 1)
+        )
+    ]
+
+
+def flight_calendar(source, destination, start, end):
+    """
+    Cached per route pair and window; bookings and flight changes clear it.
+    """
+    version = cache.get_or_set(
+        CALENDAR_VERSION_KEY.format(source, destination), time_ns, CALENDAR_TTL
+    )
+    key = CALENDAR_CACHE_KEY.format(source, destination, version, start, end)
+    days = cache.get(key)
+    if days is None:
+        days = get_calendar_days(source, destination, start, end)
+        cache.set(key, days, CALENDAR_TTL)
+    return days
+
+
+def invalidate_calendars(route_pairs):
+    """
+    Drop the cached calendars of the given (source, destination) pairs.
+    """
+    cache.delete_many(
+        [
+            CALENDAR_VERSION_KEY.format(source, destination)
+            for source, destination in route_pairs
+        ]
+    )
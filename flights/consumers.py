@@ -0,0 +1,33 @@
+from django.db.models import Q
+
+from airports.models import Route
+from changes.log import consumer
+from flights.calendar import invalidate_calendars
+from flights.models import Flight
+from tickets.fares import invalidate_fare
+from tickets.models import Ticket
+
+
+@consumer("flight-caches")
+def invalidate_flight_caches(changes):
+    """
+    Drop the calendars of the routes and the cached fares of the flights
+    whose schedule or bookings changed.
+    """
+    flight_ids, route_ids = set(), set()
+    for change in changes:
+        if change.model is Flight:
+            flight_ids.add(change.object_id)
+            # the old route too, for a flight moved to another one
+            route_ids.update(row["route_id"] for row in change.rows)
+        elif change.model is Ticket:
+            flight_ids.update(row["flight_id"] for row in change.rows)
+    if flight_ids:
+        invalidate_calendars(
+            Route.objects.filter(
+                Q(pk__in=route_ids)
+                | Q(pk__in=Flight.objects.filter(pk__in=flight_ids).values("route"))
+            ).values_list("source", "destination")
+        )
+    for flight_id in flight_ids:
+        invalidate_fare(flight_id)
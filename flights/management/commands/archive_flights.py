@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from flights.archive import archive_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Move flights that arrived more than --days ago, with their crew and "
+        "tickets, to the archive tables in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between batches, to leave room for traffic.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches (default: until done).",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--days must be positive and --batch-size at least 1.")
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        started = time.perf_counter()
+        batches = archived = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            moved = archive_batch(cutoff, options["batch_size"])
+            if not moved:
+                break
+            batches += 1
+            archived += moved
+            self.stdout.write(f"  batch {batches}: {moved} flights")
+            time.sleep(options["sleep"])
+        self.stdout.write(
+            f"Archived {archived} flights arrived before {cutoff:%Y-%m-%d %H:%M} "
+            f"in {batches} batches, {time.perf_counter() - started:.1f}s."
+        )
@@ -0,0 +1,59 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from flights.models import Flight
+from flights.schedule import airplane_overlaps, crew_overlaps
+
+
+class Command(BaseCommand):
+    help = (
+        "List flights that share an airplane or a crew member with an "
+        "overlapping flight."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=parse_date,
+            help="First day to check (default: today).",
+        )
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="Number of overlaps of each kind to list.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        start = timezone.make_aware(
+            datetime.combine(
+                options["start"] or timezone.localdate(), datetime.min.time()
+            )
+        )
+        flights = Flight.objects.filter(
+            departure_time__lt=start + timedelta(days=options["days"]),
+            arrival_time__gt=start,
+        )
+        # one query per kind, however many flights the window holds
+        airplanes = list(airplane_overlaps(flights))
+        crew = list(crew_overlaps(flights))
+
+        self.stdout.write(
+            f"Checked {flights.count()} flights in "
+            f"{time.perf_counter() - started:.1f}s: {len(airplanes)} airplane and "
+            f"{len(crew)} crew overlaps."
+        )
+        for flight_id, airplane_id, clashes in airplanes[: options["show"]]:
+            self.stdout.write(
+                f"  flight {flight_id}: airplane {airplane_id} also flies {clashes}"
+            )
+        for flight_id, crew_id, clashes in crew[: options["show"]]:
+            self.stdout.write(
+                f"  flight {flight_id}: crew member {crew_id} also flies {clashes}"
+            )
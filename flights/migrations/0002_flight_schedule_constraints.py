@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:48
+
+import base.expressions
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('airports', '0005_airport_coordinates'),
+        ('flights', '0001_initial'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.CheckConstraint(condition=models.Q(('arrival_time__gt', models.F('departure_time'))), name='flight_arrival_after_departure', violation_error_message='Arrival must be after departure.'),
+        ),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[('airplane', '='), (base.expressions.TsTzRange('departure_time', 'arrival_time'), '&&')], name='exclude_overlapping_airplane_flights', violation_error_message='The airplane is already assigned to an overlapping flight.'),
+        ),
+    ]
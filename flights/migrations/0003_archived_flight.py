@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:19
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('airports', '0005_airport_coordinates'),
+        ('flights', '0002_flight_schedule_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedFlight',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('departure_time', models.DateTimeField()),
+                ('arrival_time', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+                ('airplane', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_flights', to='airplanes.airplane')),
+                ('crew', models.ManyToManyField(related_name='archived_flights', to='flights.crew')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_flights', to='airports.route')),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('airports', '0005_airport_coordinates'),
+        ('flights', '0003_archived_flight'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flight',
+            name='airplane',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='airplanes', to='airplanes.airplane'),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='route',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='routes', to='airports.route'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_time'], name='flight_departure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['route', 'departure_time'], name='flight_route_departure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['airplane', 'departure_time'], name='flight_airplane_departure_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airplanes', '0006_airplane_name_trigram_index'),
+        ('airports', '0005_airport_coordinates'),
+        ('flights', '0004_flight_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedflight',
+            index=models.Index(fields=['departure_time'], name='archived_flight_departure_idx'),
+        ),
+    ]
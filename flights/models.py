@@ -1,7 +1,11 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import RangeOperators
 from django.db import models
+from django.db.models.functions import Now
 
 from airplanes.models import Airplane
 from airports.models import Route
+from base.expressions import TsTzRange
 
 
 class Crew(models.Model):
@@ -14,17 +18,89 @@ class Crew(models.Model):
 
 
 class Flight(models.Model):
-    route = models.ForeignKey(to=Route, on_delete=models.CASCADE, related_name="routes")
+    # both are the leading column of a composite index below
+    route = models.ForeignKey(
+        to=Route, on_delete=models.CASCADE, related_name="routes", db_index=False
+    )
     airplane = models.ForeignKey(
-        to=Airplane, on_delete=models.CASCADE, related_name="airplanes"
+        to=Airplane,
+        on_delete=models.CASCADE,
+        related_name="airplanes",
+        db_index=False,
     )
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="flights")
 
+    class Meta:
+        indexes = [
+            # upcoming flights, ORDER BY departure_time LIMIT n
+            models.Index(fields=["departure_time"], name="flight_departure_idx"),
+            # flights of a route or an airplane in a time window, in order
+            models.Index(
+                fields=["route", "departure_time"], name="flight_route_departure_idx"
+            ),
+            models.Index(
+                fields=["airplane", "departure_time"],
+                name="flight_airplane_departure_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(arrival_time__gt=models.F("departure_time")),
+                name="flight_arrival_after_departure",
+                violation_error_message="Arrival must be after departure.",
+            ),
+            # an airplane cannot fly two flights at once; the GiST index behind
+            # it also serves the overlap lookups in flights/schedule.py
+            ExclusionConstraint(
+                name="exclude_overlapping_airplane_flights",
+                expressions=[
+                    ("airplane", RangeOperators.EQUAL),
+                    (
+                        TsTzRange("departure_time", "arrival_time"),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                violation_error_message=(
+                    "The airplane is already assigned to an overlapping flight."
+                ),
+            ),
+        ]
+
     def __str__(self):
         return (
             f"Flight from {self.route.source} "
             f"to {self.route.destination} "
             f"by airplane {self.airplane.name}"
         )
+
+
+class ArchivedFlight(models.Model):
+    """
+    Departed flight moved out of Flight by the archive_flights command. It
+    keeps its id, so tickets and links to it stay valid.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    route = models.ForeignKey(
+        to=Route, on_delete=models.CASCADE, related_name="archived_flights"
+    )
+    airplane = models.ForeignKey(
+        to=Airplane, on_delete=models.CASCADE, related_name="archived_flights"
+    )
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    crew = models.ManyToManyField(Crew, related_name="archived_flights")
+    archived_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            # the analytics rollups re-aggregate archived days by date
+            models.Index(
+                fields=["departure_time"], name="archived_flight_departure_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Archived flight {self.id} departed {self.departure_time}"
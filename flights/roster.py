@@ -0,0 +1,101 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import F, Window
+from django.db.models.functions import Lag
+from django.utils import timezone
+
+from flights.schedule import FlightCrew
+
+HOUR = timedelta(hours=1)
+
+
+def hours(delta):
+    return round(delta / HOUR, 2)
+
+
+def get_roster(start, end, crew=None):
+    """
+    Flights of each crew member departing between the ``start`` and ``end``
+    dates, with the duty hours of every flight and the rest since the
+    member's previous flight in the window.
+
+    A single query over the crew/flight table sorted by crew member and
+    departure; LAG over the member's partition gives the previous arrival,
+    and one pass over the sorted rows groups them and sums the hours.
+    """
+    start_time = timezone.make_aware(datetime.combine(start, time.min))
+    end_time = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    assignments = FlightCrew.objects.filter(
+        flight__departure_time__gte=start_time,
+        flight__departure_time__lt=end_time,
+    )
+    if crew is not None:
+        assignments = assignments.filter(crew=crew)
+    rows = (
+        assignments.annotate(
+            previous_arrival=Window(
+                Lag("flight__arrival_time"),
+                partition_by=F("crew_id"),
+                order_by=F("flight__departure_time").asc(),
+            )
+        )
+        .order_by("crew_id", "flight__departure_time")
+        .values_list(
+            "crew_id",
+            "crew__first_name",
+            "crew__last_name",
+            "crew__rang",
+            "flight_id",
+            "flight__route__flight_number",
+            "flight__departure_time",
+            "flight__arrival_time",
+            "previous_arrival",
+        )
+    )
+
+    roster = []
+    for (
+        crew_id,
+        first_name,
+        last_name,
+        rang,
+        flight_id,
+        flight_number,
+        departure_time,
+        arrival_time,
+        previous_arrival,
+    ) in rows:
+        if not roster or roster[-1]["id"] != crew_id:
+            roster.append(
+                {
+                    "id": crew_id,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "rang": rang,
+                    "duty_hours": 0,
+                    "min_rest_hours": None,
+                    "flights": [],
+                }
+            )
+        member = roster[-1]
+        duty_hours = hours(arrival_time - departure_time)
+        rest_hours = None
+        if previous_arrival is not None:
+            rest_hours = hours(departure_time - previous_arrival)
+            if (
+                member["min_rest_hours"] is None
+                or rest_hours < member["min_rest_hours"]
+            ):
+                member["min_rest_hours"] = rest_hours
+        member["duty_hours"] = round(member["duty_hours"] + duty_hours, 2)
+        member["flights"].append(
+            {
+                "id": flight_id,
+                "flight_number": flight_number,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "duty_hours": duty_hours,
+                "rest_hours": rest_hours,
+            }
+        )
+    return roster
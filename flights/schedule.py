@@ -0,0 +1,147 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import IntegrityError
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Exists, OuterRef
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from base.expressions import TsTzRange
+from flights.models import Flight
+
+FlightCrew = Flight.crew.through
+
+
+class ScheduleConflictError(APIException):
+    """
+    409 with the ids of the flights that already use the airplane, and of
+    those each crew member is already on, during the requested interval.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The flight overlaps other flights of its airplane or crew."
+    default_code = "schedule_conflict"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.detail = {"detail": self.default_detail, **conflicts}
+
+
+def period(prefix=""):
+    return TsTzRange(f"{prefix}departure_time", f"{prefix}arrival_time")
+
+
+def airplane_conflicts(airplane, departure_time, arrival_time, exclude=None):
+    """
+    Ids of the airplane's flights overlapping the interval, found through the
+    GiST index of the exclusion constraint.
+    """
+    flights = Flight.objects.alias(period=period()).filter(
+        airplane=airplane,
+        period__overlap=DateTimeTZRange(departure_time, arrival_time),
+    )
+    if exclude is not None:
+        flights = flights.exclude(pk=exclude)
+    return list(flights.order_by("pk").values_list("pk", flat=True))
+
+
+def crew_conflicts(crew, departure_time, arrival_time, exclude=None):
+    """
+    {crew_id: [flight ids]} of the crew members' flights overlapping the
+    interval, walking the crew member index of the M2M table.
+    """
+    assignments = FlightCrew.objects.alias(period=period("flight__")).filter(
+        crew__in=crew,
+        period__overlap=DateTimeTZRange(departure_time, arrival_time),
+    )
+    if exclude is not None:
+        assignments = assignments.exclude(flight_id=exclude)
+    conflicts = defaultdict(list)
+    for crew_id, flight_id in assignments.order_by("flight_id").values_list(
+        "crew_id", "flight_id"
+    ):
+        conflicts[crew_id].append(flight_id)
+    return conflicts
+
+
+def schedule_conflicts(airplane, crew, departure_time, arrival_time, exclude=None):
+    """
+    Conflicts of a flight scheduled with ``airplane`` and ``crew`` over the
+    interval, as ScheduleConflictError expects them, or None.
+    """
+    flights = airplane_conflicts(airplane, departure_time, arrival_time, exclude)
+    crew_flights = crew_conflicts(crew, departure_time, arrival_time, exclude)
+    if not flights and not crew_flights:
+        return None
+    return {
+        "airplane": flights,
+        "crew": [
+            {"crew": crew_id, "flights": flight_ids}
+            for crew_id, flight_ids in sorted(crew_flights.items())
+        ],
+    }
+
+
+@contextmanager
+def detect_schedule_conflicts(airplane, crew, departure_time, arrival_time, exclude):
+    """
+    Report the clashing flights when the exclusion constraint rejects a save
+    that raced another one. Must wrap the transaction, like the seat
+    conflict check in tickets.conflicts.
+    """
+    try:
+        yield
+    except IntegrityError:
+        conflicts = schedule_conflicts(
+            airplane, crew, departure_time, arrival_time, exclude
+        )
+        if conflicts is None:
+            raise
+        raise ScheduleConflictError(conflicts) from None
+
+
+def airplane_overlaps(flights):
+    """
+    (flight id, airplane id, [clashing flight ids]) for each of ``flights``
+    that overlaps another flight of its airplane, in a single query.
+    """
+    clashes = (
+        Flight.objects.alias(period=period())
+        .filter(airplane=OuterRef("airplane"), period__overlap=OuterRef("period"))
+        .exclude(pk=OuterRef("pk"))
+        .order_by("pk")
+        .values("pk")
+    )
+    return (
+        flights.alias(period=period())
+        .filter(Exists(clashes))
+        .annotate(clashes=ArraySubquery(clashes))
+        .order_by("pk")
+        .values_list("pk", "airplane_id", "clashes")
+    )
+
+
+def crew_overlaps(flights):
+    """
+    (flight id, crew id, [clashing flight ids]) for each crew assignment on
+    ``flights`` that overlaps another flight of the same crew member, in a
+    single query. Filtering with EXISTS lets PostgreSQL semi-join the crew
+    table once instead of probing every assignment's flights separately.
+    """
+    clashes = (
+        Flight.objects.alias(period=period())
+        .filter(crew=OuterRef("crew"), period__overlap=OuterRef("period"))
+        .exclude(pk=OuterRef("flight"))
+        .order_by("pk")
+        .values("pk")
+    )
+    return (
+        FlightCrew.objects.filter(flight__in=flights)
+        .alias(period=period("flight__"))
+        .filter(Exists(clashes))
+        .annotate(clashes=ArraySubquery(clashes))
+        .order_by("flight_id", "crew_id")
+        .values_list("flight_id", "crew_id", "clashes")
+    )
@@ -0,0 +1,46 @@
+from django.contrib.postgres.search import TrigramWordDistance
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.utils import timezone
+
+from airports.models import Airport
+from flights.models import Flight
+
+
+def search_airports(query, limit):
+    """
+    Airports whose name and city words resemble the query, nearest first.
+    Filter and ordering are both served by the airport_search_trgm index.
+    """
+    return (
+        Airport.objects.annotate(
+            distance=TrigramWordDistance(query, "search_document"),
+            rank=1 - F("distance"),
+        )
+        .filter(search_document__trigram_word_similar=query)
+        .order_by("distance")[:limit]
+    )
+
+
+def search_flights(query, airport_ids, limit):
+    """
+    Upcoming flights matching the flight number or departing from or arriving
+    at one of the given airports, flight number matches first.
+    """
+    return (
+        Flight.objects.filter(departure_time__gte=timezone.now())
+        .filter(
+            Q(route__flight_number__icontains=query)
+            | Q(route__source__in=airport_ids)
+            | Q(route__destination__in=airport_ids)
+        )
+        .select_related("route__source", "route__destination")
+        .annotate(
+            rank=Case(
+                When(route__flight_number__iexact=query, then=Value(1.0)),
+                When(route__flight_number__icontains=query, then=Value(0.5)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-rank", "departure_time")[:limit]
+    )
@@ -1,6 +1,8 @@
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
 
+from airplanes.models import Airplane
 from airplanes.serializers import AirplaneSerializer, AirplaneDetailSerializer
 from airports.models import Route
 from airports.serializers import (
@@ -9,6 +11,12 @@ from airports.serializers import (
     RouteSerializer,
 )
 from flights.models import Crew, Flight
+from flights.schedule import (
+    ScheduleConflictError,
+    detect_schedule_conflicts,
+    schedule_conflicts,
+)
+from tickets.holds import held_seats
 from tickets.models import Ticket
 
 
@@ -38,13 +46,70 @@ class FlightListSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
+class FlightFareListSerializer(FlightListSerializer):
+    fare = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta(FlightListSerializer.Meta):
+        fields = FlightListSerializer.Meta.fields + ["fare"]
+
+
 class FlightDetailSerializer(FlightSerializer):
     route = RouteSerializer(many=False, read_only=True)
     airplane = AirplaneDetailSerializer(many=False, read_only=True)
     crew = CrewSerializer(many=True, read_only=True)
 
 
-class FlightCreateSerializer(serializers.ModelSerializer):
+class FlightScheduleMixin:
+    """
+    Keeps airplanes and crew members on one flight at a time. The airplane
+    and crew rows are locked while the overlap check and the save run, and
+    the exclusion constraint on Flight backs the airplane check up.
+    """
+
+    def validate(self, data):
+        data = super().validate(data)
+        if self.instance is None and "departure_time" not in data:
+            data["departure_time"] = timezone.now()
+        departure_time = self.scheduled(data, "departure_time")
+        arrival_time = self.scheduled(data, "arrival_time")
+        if arrival_time <= departure_time:
+            raise serializers.ValidationError(
+                {"arrival_time": "Arrival must be after departure."}
+            )
+        return data
+
+    def scheduled(self, data, field):
+        if field in data:
+            return data[field]
+        return getattr(self.instance, field)
+
+    def save_scheduled(self, validated_data, save):
+        airplane = self.scheduled(validated_data, "airplane")
+        if "crew" in validated_data:
+            crew = [member.pk for member in validated_data["crew"]]
+        elif self.instance is not None:
+            crew = list(self.instance.crew.values_list("pk", flat=True))
+        else:
+            crew = []
+        interval = (
+            self.scheduled(validated_data, "departure_time"),
+            self.scheduled(validated_data, "arrival_time"),
+        )
+        exclude = self.instance.pk if self.instance is not None else None
+
+        with (
+            detect_schedule_conflicts(airplane, crew, *interval, exclude),
+            transaction.atomic(),
+        ):
+            list(Airplane.objects.select_for_update().filter(pk=airplane.pk))
+            list(Crew.objects.select_for_update().filter(pk__in=crew))
+            conflicts = schedule_conflicts(airplane, crew, *interval, exclude)
+            if conflicts is not None:
+                raise ScheduleConflictError(conflicts)
+            return save()
+
+
+class FlightCreateSerializer(FlightScheduleMixin, serializers.ModelSerializer):
     route = RouteCreateSerializer(many=False)
     crew = serializers.PrimaryKeyRelatedField(
         many=True, queryset=Crew.objects.all(), required=False
@@ -60,15 +125,15 @@ class FlightCreateSerializer(serializers.ModelSerializer):
         fields = ["id", "route", "airplane", "crew", "departure_time", "arrival_time"]
 
     def create(self, validated_data):
-        route_data = validated_data.pop("route")
-        route = Route.objects.create(**route_data)
-        validated_data["route"] = route
-        if "departure_time" not in validated_data:
-            validated_data["departure_time"] = timezone.now()
-        return super().create(validated_data)
+        def save():
+            route_data = validated_data.pop("route")
+            validated_data["route"] = Route.objects.create(**route_data)
+            return super(FlightCreateSerializer, self).create(validated_data)
+
+        return self.save_scheduled(validated_data, save)
 
 
-class FlightUpdateSerializer(serializers.ModelSerializer):
+class FlightUpdateSerializer(FlightScheduleMixin, serializers.ModelSerializer):
     crew = serializers.PrimaryKeyRelatedField(
         many=True, queryset=Crew.objects.all(), required=False
     )
@@ -81,6 +146,12 @@ class FlightUpdateSerializer(serializers.ModelSerializer):
         model = Flight
         fields = ["id", "airplane", "crew", "route", "departure_time", "arrival_time"]
 
+    def update(self, instance, validated_data):
+        def save():
+            return super(FlightUpdateSerializer, self).update(instance, validated_data)
+
+        return self.save_scheduled(validated_data, save)
+
 
 class FlightWithSeatsSerializer(serializers.ModelSerializer):
     """
@@ -119,20 +190,33 @@ class FlightWithSeatsSerializer(serializers.ModelSerializer):
             "available_rows",
         ]
 
+    def get_unavailable_seats(self, obj):
+        """
+        Booked seats plus seats held by other users, computed once per flight.
+        """
+        cached = getattr(self, "_unavailable_seats", None)
+        if cached is not None and cached[0] == obj.pk:
+            return cached[1]
+        request = self.context.get("request")
+        user = request.user if request is not None else None
+        unavailable = set(
+            Ticket.objects.filter(flight=obj).values_list("row", "seat")
+        ) | held_seats(obj, user)
+        self._unavailable_seats = (obj.pk, unavailable)
+        return unavailable
+
     def get_available_seats(self, obj):
-        total_seats = obj.airplane.total_seats
-        booked_seats = Ticket.objects.filter(flight=obj).count()
-        return total_seats - booked_seats
+        return obj.airplane.total_seats - len(self.get_unavailable_seats(obj))
 
     def get_available_rows(self, obj):
-        booked_seats = set(Ticket.objects.filter(flight=obj).values_list("row", "seat"))
+        unavailable = self.get_unavailable_seats(obj)
 
         rows_with_seats = {}
 
         for row in range(1, obj.airplane.rows + 1):
             available_seats = []
             for seat in range(1, obj.airplane.seats_in_row + 1):
-                if (row, seat) not in booked_seats:
+                if (row, seat) not in unavailable:
                     available_seats.append(seat)
 
             if available_seats:
@@ -144,6 +228,50 @@ class FlightWithSeatsSerializer(serializers.ModelSerializer):
         return result
 
 
+class FlightSearchSerializer(serializers.ModelSerializer):
+    flight_number = serializers.CharField(source="route.flight_number", read_only=True)
+    source = serializers.CharField(source="route.source.name", read_only=True)
+    source_city = serializers.CharField(source="route.source.city", read_only=True)
+    destination = serializers.CharField(source="route.destination.name", read_only=True)
+    destination_city = serializers.CharField(
+        source="route.destination.city", read_only=True
+    )
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = [
+            "id",
+            "flight_number",
+            "source",
+            "source_city",
+            "destination",
+            "destination_city",
+            "departure_time",
+            "arrival_time",
+            "rank",
+        ]
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class FlightCalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    flights = serializers.IntegerField()
+    earliest_departure = serializers.DateTimeField(allow_null=True)
+    min_remaining_seats = serializers.IntegerField(allow_null=True)
+
+
+class FlightCalendarQuerySerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    date = serializers.DateField(default=timezone.localdate)
+    days = serializers.IntegerField(min_value=0, max_value=7, default=3)
+
+
 class CrewListSerializer(serializers.ModelSerializer):
     flights = FlightSerializer(many=True, read_only=True)
 
@@ -151,3 +279,28 @@ class CrewListSerializer(serializers.ModelSerializer):
         model = Crew
         fields = ["id", "first_name", "last_name", "rang", "flights"]
         read_only_fields = ["id"]
+
+
+class CrewRosterQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(default=timezone.localdate)
+    days = serializers.IntegerField(min_value=1, max_value=31, default=7)
+    crew = serializers.IntegerField(required=False)
+
+
+class CrewRosterFlightSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    flight_number = serializers.CharField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    duty_hours = serializers.FloatField()
+    rest_hours = serializers.FloatField(allow_null=True)
+
+
+class CrewRosterSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    rang = serializers.CharField(allow_null=True)
+    duty_hours = serializers.FloatField()
+    min_rest_hours = serializers.FloatField(allow_null=True)
+    flights = CrewRosterFlightSerializer(many=True)
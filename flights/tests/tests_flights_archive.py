@@ -0,0 +1,129 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from analytics.models import BookingBucket
+from flights.models import ArchivedFlight, Crew, Flight
+from tickets.models import ArchivedTicket, Order, Ticket
+
+User = get_user_model()
+
+
+class FlightArchiveTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=3983,
+            flight_number="AA1",
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.captain = Crew.objects.create(first_name="John", last_name="Doe")
+        self.order = Order.objects.create(user=self.user)
+        self.old = [self.create_flight(days=-800 + i) for i in range(3)]
+        self.upcoming = self.create_flight(days=5)
+        self.tickets = [
+            Ticket.objects.create(flight=flight, order=self.order, row=1, seat=1)
+            for flight in [*self.old, self.upcoming]
+        ]
+        BookingBucket.objects.create(
+            flight=self.old[0], granularity="day", start=self.old[0].departure_time
+        )
+
+    def create_flight(self, days):
+        departure = timezone.now() + timedelta(days=days)
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=6),
+        )
+        flight.crew.set([self.captain])
+        return flight
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command("archive_flights", sleep=0, stdout=out, **options)
+        return out.getvalue()
+
+    def test_departed_flights_move_in_batches(self):
+        output = self.archive(batch_size=2)
+
+        self.assertIn("Archived 3 flights", output)
+        self.assertIn("in 2 batches", output)
+        self.assertEqual(list(Flight.objects.all()), [self.upcoming])
+        self.assertEqual(list(Ticket.objects.all()), [self.tickets[-1]])
+        archived = ArchivedFlight.objects.get(pk=self.old[0].pk)
+        self.assertEqual(archived.departure_time, self.old[0].departure_time)
+        self.assertEqual(list(archived.crew.all()), [self.captain])
+        self.assertIsNotNone(archived.archived_at)
+        self.assertEqual(
+            sorted(ArchivedTicket.objects.values_list("id", flat=True)),
+            [ticket.id for ticket in self.tickets[:-1]],
+        )
+        self.assertFalse(BookingBucket.objects.exists())
+
+    def test_max_batches(self):
+        self.archive(batch_size=1, max_batches=2)
+
+        self.assertEqual(ArchivedFlight.objects.count(), 2)
+
+    def test_ticket_list_includes_archive_only_when_asked(self):
+        self.archive()
+        url = reverse("tickets:ticket-list")
+
+        live = self.client.get(url)
+        everything = self.client.get(url, {"include_archived": "true", "page_size": 3})
+
+        self.assertEqual(
+            [ticket["id"] for ticket in live.data["results"]], [self.tickets[-1].id]
+        )
+        self.assertEqual(everything.data["count"], 4)
+        self.assertEqual(
+            [ticket["id"] for ticket in everything.data["results"]],
+            [ticket.id for ticket in self.tickets[:3]],
+        )
+        self.assertEqual(
+            everything.data["results"][0]["flight"]["crew"][0]["id"], self.captain.id
+        )
+
+    def test_archived_tickets_of_other_users_stay_hidden(self):
+        self.archive()
+        other = User.objects.create_user(email="other@test.com", password="password")
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(
+            reverse("tickets:ticket-list"), {"include_archived": "true"}
+        )
+
+        self.assertEqual(response.data["count"], 0)
+
+    def test_retrieve_archived_flight(self):
+        self.archive()
+        url = reverse("flights:flights-detail", args=[self.old[0].id])
+
+        missing = self.client.get(url)
+        found = self.client.get(url, {"include_archived": "true"})
+
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(found.status_code, status.HTTP_200_OK)
+        self.assertEqual(found.data["route"]["id"], self.route.id)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from changes.log import process_changes
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class FlightCalendarTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.lax = Airport.objects.create(name="LAX", city="Los Angeles", country="USA")
+        route = Route.objects.create(
+            source=self.jfk, destination=self.lax, distance=3983, flight_number="AA1"
+        )
+        back = Route.objects.create(
+            source=self.lax, destination=self.jfk, distance=3983, flight_number="AA2"
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.date = timezone.localdate() + timedelta(days=10)
+        self.morning = self.create_flight(route, hour=8)
+        self.evening = self.create_flight(route, hour=20)
+        self.create_flight(route, hour=9, days=2)
+        self.back = self.create_flight(back, hour=14)
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.evening, order=self.order, row=1, seat=1)
+        Ticket.objects.create(flight=self.evening, order=self.order, row=1, seat=2)
+        self.url = reverse("flights:flights-calendar")
+        self.params = {
+            "source": self.jfk.id,
+            "destination": self.lax.id,
+            "date": self.date.isoformat(),
+            "days": 3,
+        }
+
+    def create_flight(self, route, hour, days=0):
+        departure = timezone.make_aware(
+            datetime.combine(self.date + timedelta(days=days), datetime.min.time())
+        ) + timedelta(hours=hour)
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=6),
+        )
+
+    def get_days(self):
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {day["date"]: day for day in response.data["days"]}
+
+    def test_calendar_covers_window(self):
+        days = self.get_days()
+        self.assertEqual(len(days), 7)
+        empty = days[(self.date - timedelta(days=3)).isoformat()]
+        self.assertEqual(empty["flights"], 0)
+        self.assertIsNone(empty["min_remaining_seats"])
+
+    def test_calendar_aggregates_per_day(self):
+        days = self.get_days()
+        day = days[self.date.isoformat()]
+        self.assertEqual(day["flights"], 2)
+        self.assertEqual(
+            day["earliest_departure"],
+            self.morning.departure_time.isoformat().replace("+00:00", "Z"),
+        )
+        self.assertEqual(day["min_remaining_seats"], 58)
+        self.assertEqual(
+            days[(self.date + timedelta(days=2)).isoformat()]["flights"], 1
+        )
+
+    def test_calendar_is_one_query_and_cached(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url, self.params)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, self.params)
+
+    def test_booking_invalidates_calendar(self):
+        self.get_days()
+        Ticket.objects.create(flight=self.morning, order=self.order, row=2, seat=1)
+        Ticket.objects.create(flight=self.morning, order=self.order, row=2, seat=2)
+        Ticket.objects.create(flight=self.morning, order=self.order, row=2, seat=3)
+        process_changes()
+        self.assertEqual(
+            self.get_days()[self.date.isoformat()]["min_remaining_seats"], 57
+        )
+
+    def test_changes_on_other_routes_keep_calendar_cached(self):
+        process_changes()
+        self.get_days()
+        Ticket.objects.create(flight=self.back, order=self.order, row=1, seat=1)
+        self.back.departure_time += timedelta(hours=1)
+        self.back.save()
+        process_changes()
+
+        with self.assertNumQueries(0):
+            self.get_days()
+
+    def test_moving_a_flight_to_another_route_invalidates_both(self):
+        back_params = {**self.params, "source": self.lax.id, "destination": self.jfk.id}
+        self.get_days()
+        self.client.get(self.url, back_params)
+        self.back.route = self.morning.route
+        self.back.save()
+        process_changes()
+
+        self.assertEqual(self.get_days()[self.date.isoformat()]["flights"], 3)
+        response = self.client.get(self.url, back_params)
+        self.assertEqual(response.data["days"][3]["flights"], 0)
+
+    def test_window_is_limited(self):
+        response = self.client.get(self.url, {**self.params, "days": 30})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
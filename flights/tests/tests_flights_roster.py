@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Crew, Flight
+from flights.roster import get_roster
+
+User = get_user_model()
+
+
+class CrewRosterTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=3983,
+            flight_number="AA1",
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.captain = Crew.objects.create(
+            first_name="John", last_name="Doe", rang="Captain"
+        )
+        self.purser = Crew.objects.create(first_name="Jane", last_name="Smith")
+        self.date = timezone.localdate() + timedelta(days=10)
+        self.first = self.create_flight(hours=(8, 14), crew=[self.captain])
+        self.second = self.create_flight(
+            hours=(24, 29.5), crew=[self.captain, self.purser]
+        )
+        # outside of a two day window
+        self.create_flight(hours=(60, 64), crew=[self.captain])
+
+    def create_flight(self, hours, crew):
+        midnight = timezone.make_aware(datetime.combine(self.date, datetime.min.time()))
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=midnight + timedelta(hours=hours[0]),
+            arrival_time=midnight + timedelta(hours=hours[1]),
+        )
+        flight.crew.set(crew)
+        return flight
+
+    def test_roster_takes_one_query(self):
+        with self.assertNumQueries(1):
+            roster = get_roster(self.date, self.date + timedelta(days=1))
+
+        self.assertEqual(
+            [member["id"] for member in roster], [self.captain.id, self.purser.id]
+        )
+
+    def test_duty_hours_and_rest_gaps(self):
+        response = self.client.get(
+            reverse("flights:crew-roster"),
+            {"start": self.date.isoformat(), "days": 2},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["end"], (self.date + timedelta(days=1)).isoformat()
+        )
+        captain, purser = response.data["crew"]
+        self.assertEqual(captain["rang"], "Captain")
+        self.assertEqual(captain["duty_hours"], 11.5)
+        self.assertEqual(captain["min_rest_hours"], 10)
+        self.assertEqual(
+            [
+                (flight["id"], flight["duty_hours"], flight["rest_hours"])
+                for flight in captain["flights"]
+            ],
+            [(self.first.id, 6, None), (self.second.id, 5.5, 10)],
+        )
+        self.assertEqual(purser["duty_hours"], 5.5)
+        self.assertIsNone(purser["min_rest_hours"])
+
+    def test_filter_by_crew_member(self):
+        response = self.client.get(
+            reverse("flights:crew-roster"),
+            {"start": self.date.isoformat(), "days": 7, "crew": self.purser.id},
+        )
+
+        self.assertEqual(
+            [member["id"] for member in response.data["crew"]], [self.purser.id]
+        )
+
+    def test_window_is_bounded(self):
+        response = self.client.get(reverse("flights:crew-roster"), {"days": 60})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
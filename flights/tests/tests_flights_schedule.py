@@ -0,0 +1,179 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Crew, Flight
+from flights.schedule import airplane_overlaps, crew_overlaps
+
+User = get_user_model()
+
+
+class FlightScheduleTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.lax = Airport.objects.create(name="LAX", city="Los Angeles", country="USA")
+        self.route = Route.objects.create(
+            source=self.jfk, destination=self.lax, distance=3983, flight_number="AA1"
+        )
+        airplane_type = AirplaneType.objects.create(name="Boeing")
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.other_airplane = Airplane.objects.create(
+            name="Boeing 777", rows=10, seats_in_row=6, airplane_type=airplane_type
+        )
+        self.captain = Crew.objects.create(first_name="John", last_name="Doe")
+        self.purser = Crew.objects.create(first_name="Jane", last_name="Smith")
+        self.start = timezone.now() + timedelta(days=1)
+        self.flight = self.create_flight(self.airplane, hours=(0, 6))
+        self.flight.crew.set([self.captain])
+
+    def create_flight(self, airplane, hours):
+        return Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=self.start + timedelta(hours=hours[0]),
+            arrival_time=self.start + timedelta(hours=hours[1]),
+        )
+
+    def payload(self, airplane, hours, crew=()):
+        return {
+            "route": {
+                "source": self.jfk.id,
+                "destination": self.lax.id,
+                "distance": 3983,
+                "flight_number": "AA9",
+            },
+            "airplane": airplane.id,
+            "crew": [member.id for member in crew],
+            "departure_time": self.start + timedelta(hours=hours[0]),
+            "arrival_time": self.start + timedelta(hours=hours[1]),
+        }
+
+    def test_database_rejects_overlapping_airplane_flights(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.create_flight(self.airplane, hours=(5, 9))
+        # back to back is fine, ranges are half-open
+        self.create_flight(self.airplane, hours=(6, 9))
+
+    def test_database_rejects_arrival_before_departure(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.create_flight(self.other_airplane, hours=(5, 4))
+
+    def test_create_reports_airplane_conflict(self):
+        response = self.client.post(
+            reverse("flights:flights-list"),
+            self.payload(self.airplane, hours=(3, 8)),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["airplane"], [self.flight.id])
+        self.assertEqual(response.data["crew"], [])
+        self.assertEqual(Flight.objects.count(), 1)
+        self.assertEqual(Route.objects.count(), 1)
+
+    def test_create_reports_crew_conflict(self):
+        response = self.client.post(
+            reverse("flights:flights-list"),
+            self.payload(
+                self.other_airplane, hours=(3, 8), crew=[self.captain, self.purser]
+            ),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["airplane"], [])
+        self.assertEqual(
+            response.data["crew"],
+            [{"crew": self.captain.id, "flights": [self.flight.id]}],
+        )
+
+    def test_create_without_conflicts(self):
+        response = self.client.post(
+            reverse("flights:flights-list"),
+            self.payload(self.airplane, hours=(6, 9), crew=[self.captain]),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_checks_new_interval_against_other_flights(self):
+        later = self.create_flight(self.other_airplane, hours=(10, 14))
+        later.crew.set([self.purser])
+        url = reverse("flights:flights-detail", args=[self.flight.id])
+
+        moved = self.client.patch(
+            url,
+            {"arrival_time": (self.start + timedelta(hours=7)).isoformat()},
+        )
+        clash = self.client.patch(
+            url,
+            {
+                "crew": [self.captain.id, self.purser.id],
+                "arrival_time": (self.start + timedelta(hours=11)).isoformat(),
+            },
+        )
+
+        self.assertEqual(moved.status_code, status.HTTP_200_OK)
+        self.assertEqual(clash.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            clash.data["crew"], [{"crew": self.purser.id, "flights": [later.id]}]
+        )
+
+    def test_arrival_must_follow_departure(self):
+        response = self.client.post(
+            reverse("flights:flights-list"),
+            self.payload(self.other_airplane, hours=(5, 4)),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", response.data)
+
+    def test_overlaps_of_a_schedule_take_one_query(self):
+        second = self.create_flight(self.other_airplane, hours=(2, 7))
+        third = self.create_flight(self.airplane, hours=(20, 24))
+        second.crew.set([self.captain])
+        third.crew.set([self.captain])
+
+        with self.assertNumQueries(1):
+            crew = list(crew_overlaps(Flight.objects.all()))
+        with self.assertNumQueries(1):
+            airplanes = list(airplane_overlaps(Flight.objects.all()))
+
+        self.assertEqual(
+            crew,
+            [
+                (self.flight.id, self.captain.id, [second.id]),
+                (second.id, self.captain.id, [self.flight.id]),
+            ],
+        )
+        self.assertEqual(airplanes, [])
+
+    def test_check_flight_overlaps_command(self):
+        second = self.create_flight(self.other_airplane, hours=(2, 7))
+        second.crew.set([self.captain])
+        out = StringIO()
+
+        call_command(
+            "check_flight_overlaps", start=timezone.localdate(self.start), stdout=out
+        )
+
+        self.assertIn("0 airplane and 2 crew overlaps", out.getvalue())
+        self.assertIn(
+            f"flight {second.id}: crew member {self.captain.id}", out.getvalue()
+        )
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from flights.search import search_airports
+
+User = get_user_model()
+
+
+class SearchViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        self.jfk = Airport.objects.create(
+            name="John F. Kennedy International", city="New York", country="USA"
+        )
+        self.lga = Airport.objects.create(
+            name="LaGuardia", city="New York", country="USA"
+        )
+        self.lax = Airport.objects.create(
+            name="Los Angeles International", city="Los Angeles", country="USA"
+        )
+        self.route = Route.objects.create(
+            source=self.jfk, destination=self.lax, distance=4000, flight_number="AA100"
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 747",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=6),
+        )
+        self.url = reverse("flights:search")
+
+    def test_search_airports_by_city(self):
+        response = self.client.get(self.url, {"q": "new york"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = {airport["name"] for airport in response.data["airports"]}
+        self.assertEqual(names, {self.jfk.name, self.lga.name})
+        self.assertEqual(response.data["flights"][0]["id"], self.flight.id)
+
+    def test_search_tolerates_typos(self):
+        response = self.client.get(self.url, {"q": "Laguardai"})
+        self.assertEqual(response.data["airports"][0]["name"], "LaGuardia")
+
+    def test_search_flights_by_flight_number(self):
+        response = self.client.get(self.url, {"q": "aa100"})
+        self.assertEqual(response.data["airports"], [])
+        flight = response.data["flights"][0]
+        self.assertEqual(flight["flight_number"], "AA100")
+        self.assertEqual(flight["rank"], 1.0)
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url, {"q": "a"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_icontains_lookups_use_trigram_indexes(self):
+        cases = [
+            (Airport.objects.filter(name__icontains="york"), "airport_name_trgm"),
+            (Airport.objects.filter(city__icontains="york"), "airport_city_trgm"),
+            (
+                Route.objects.filter(flight_number__icontains="A10"),
+                "route_flight_number_trgm",
+            ),
+            (
+                Airplane.objects.filter(name__icontains="boeing"),
+                "airplane_name_trgm",
+            ),
+        ]
+        with transaction.atomic(), connection.cursor() as cursor:
+            # the tables are tiny, make the planner show the index is usable
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            for queryset, index in cases:
+                with self.subTest(index=index):
+                    self.assertIn(index, queryset.order_by().explain())
+
+    def test_airport_ranking_uses_trigram_knn_index(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = search_airports("new york", 5).explain()
+        self.assertIn("airport_search_trgm", plan)
@@ -70,7 +70,8 @@ class FlightSerializersTest(TestCase):
             "route": route_data,
             "airplane": airplane2.id,
             "crew": [member.id for member in crew_qs],
-            "arrival_time": timezone.now() + timedelta(hours=6),
+            "departure_time": timezone.now() + timedelta(hours=7),
+            "arrival_time": timezone.now() + timedelta(hours=13),
         }
         serializer = FlightCreateSerializer(data=data)
         self.assertTrue(serializer.is_valid(), serializer.errors)
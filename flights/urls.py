@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from flights.views import CrewViewSet, FlightViewSet
+from flights.views import CrewViewSet, FlightViewSet, SearchView
 
 app_name = "flights"
 
@@ -10,5 +10,6 @@ router.register("flights", FlightViewSet, basename="flights")
 router.register("crew", CrewViewSet, basename="crew")
 
 urlpatterns = [
+    path("search/", SearchView.as_view(), name="search"),
     path("", include(router.urls)),
 ]
@@ -1,23 +1,38 @@
+from datetime import timedelta
+
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from base.mixins import BaseViewSetMixin
+from airports.serializers import AirportSearchSerializer
+from base.mixins import ArchiveViewSetMixin, BaseViewSetMixin
 from base.pagination import DefaultPagination
-from flights.models import Crew, Flight
+from flights.calendar import flight_calendar
+from flights.models import ArchivedFlight, Crew, Flight
+from flights.roster import get_roster
+from flights.search import search_airports, search_flights
 from flights.serializers import (
     CrewListSerializer,
+    CrewRosterQuerySerializer,
+    CrewRosterSerializer,
     CrewSerializer,
+    FlightCalendarDaySerializer,
+    FlightCalendarQuerySerializer,
     FlightCreateSerializer,
     FlightDetailSerializer,
-    FlightListSerializer,
+    FlightFareListSerializer,
+    FlightSearchSerializer,
     FlightSerializer,
     FlightUpdateSerializer,
     FlightWithSeatsSerializer,
+    SearchQuerySerializer,
 )
+from tickets.fares import get_fares
+from tickets.queries import booked_seats
 
 
 class CrewViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
@@ -26,10 +41,36 @@ class CrewViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
 
     action_serializers = {
         "list": CrewListSerializer,
+        "roster": CrewRosterSerializer,
     }
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = queryset.prefetch_related("flights__crew")
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def roster(self, request):
+        """
+        Flights of each crew member departing within ``days`` from ``start``,
+        with duty hours and the rest gaps between consecutive flights.
+        """
+        params = CrewRosterQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        end = data["start"] + timedelta(days=data["days"] - 1)
+        roster = get_roster(data["start"], end, crew=data.get("crew"))
+        return Response(
+            {
+                "start": data["start"],
+                "end": end,
+                "crew": self.get_serializer(roster, many=True).data,
+            }
+        )
+
 
-class FlightViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
+class FlightViewSet(ArchiveViewSetMixin, BaseViewSetMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.select_related(
         "route",
         "route__source",
@@ -50,19 +91,93 @@ class FlightViewSet(BaseViewSetMixin, viewsets.ModelViewSet):
     pagination_class = DefaultPagination
 
     action_serializers = {
-        "list": FlightListSerializer,
+        "list": FlightFareListSerializer,
         "create": FlightCreateSerializer,
         "retrieve": FlightDetailSerializer,
         "update": FlightUpdateSerializer,
         "partial_update": FlightUpdateSerializer,
         "flight_seats": FlightWithSeatsSerializer,
+        "calendar": FlightCalendarDaySerializer,
     }
 
+    # departed flights are listed by their tickets, only looked up by id here
+    archived_actions = ("retrieve",)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = queryset.annotate(booked_seats=booked_seats())
+        return queryset
+
+    def get_archived_queryset(self):
+        return ArchivedFlight.objects.select_related(
+            "route__source",
+            "route__destination",
+            "airplane__airplane_type",
+        ).prefetch_related("crew")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if self.action == "list" and page is not None:
+            # the whole page is priced in one pass
+            fares = get_fares(flights=page)
+            for flight in page:
+                flight.fare = fares[flight.id]
+        return page
+
     @action(detail=True, methods=["get"])
     def flight_seats(self, request, pk=None):
         """
         Retrieve available rows and seats for a flight.
         """
         flight = self.get_object()
-        serializer = FlightWithSeatsSerializer(flight)
+        serializer = self.get_serializer(flight)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        Availability from source to destination for each day within ``days``
+        of ``date``: flight count, earliest departure and fewest seats left.
+        """
+        params = FlightCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        window = timedelta(days=data["days"])
+        days = flight_calendar(
+            data["source"],
+            data["destination"],
+            data["date"] - window,
+            data["date"] + window,
+        )
+        return Response(
+            {
+                "source": data["source"],
+                "destination": data["destination"],
+                "days": self.get_serializer(days, many=True).data,
+            }
+        )
+
+
+class SearchView(APIView):
+    """
+    Ranked search over airports (by name or city) and upcoming flights
+    (by flight number or airport).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data["q"]
+        limit = params.validated_data["limit"]
+
+        airports = list(search_airports(query, limit))
+        flights = search_flights(query, [airport.id for airport in airports], limit)
+        return Response(
+            {
+                "airports": AirportSearchSerializer(airports, many=True).data,
+                "flights": FlightSearchSerializer(flights, many=True).data,
+            }
+        )
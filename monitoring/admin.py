@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from monitoring.models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("id", "origin", "calls", "total_ms", "max_ms", "last_seen")
+    list_filter = ("origin",)
+    search_fields = ("normalized_sql", "origin")
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+    ordering = ("-total_ms",)
@@ -0,0 +1,74 @@
+from contextlib import ExitStack
+
+from django.db import connections
+from django.urls import reverse
+
+from monitoring.profiling import (
+    PROFILE_SKIPPED_HEADER,
+    RequestProfiler,
+    is_profiling_requested,
+    is_staff_request,
+    profiler_lock,
+)
+from monitoring.slow_queries import SlowQueryRecorder, describe_view, get_threshold_ms
+
+
+class ProfilingMiddleware:
+    """
+    Profile a request when a staff user sends the X-Profile header or the
+    _profile query parameter. Other requests pass straight through, and so
+    does one sent while another request of the process is being profiled.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_profiling_requested(request) or not is_staff_request(request):
+            return self.get_response(request)
+
+        # a request arriving while another is profiled runs unprofiled
+        if not profiler_lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response[PROFILE_SKIPPED_HEADER] = "another request is being profiled"
+            return response
+        try:
+            with RequestProfiler() as profiler:
+                response = self.get_response(request)
+        finally:
+            profiler_lock.release()
+
+        profile_id = profiler.save(request, response)
+        response["X-Profile-Id"] = profile_id
+        response["X-Profile-Url"] = reverse(
+            "monitoring:profile-detail", args=[profile_id]
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Record statements slower than SLOW_QUERY_THRESHOLD_MS together with the
+    view action that ran them. A threshold of 0 disables recording.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold_ms = get_threshold_ms()
+        if not threshold_ms:
+            return self.get_response(request)
+
+        request.slow_query_recorder = SlowQueryRecorder(threshold_ms, request.path)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(request.slow_query_recorder)
+                )
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = getattr(request, "slow_query_recorder", None)
+        if recorder is not None:
+            recorder.origin = describe_view(view_func, request)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('sample_sql', models.TextField()),
+                ('sample_params', models.TextField(blank=True)),
+                ('origin', models.CharField(blank=True, max_length=255)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('plan', models.TextField(blank=True)),
+                ('plan_captured_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Slow query',
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """
+    SQL statement that exceeded SLOW_QUERY_THRESHOLD_MS, deduplicated by the
+    fingerprint of its normalized text.
+    """
+
+    fingerprint = models.CharField(max_length=32, unique=True)
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField()
+    sample_params = models.TextField(blank=True)
+    origin = models.CharField(max_length=255, blank=True)
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    plan = models.TextField(blank=True)
+    plan_captured_at = models.DateTimeField(null=True, blank=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-total_ms"]
+        verbose_name = "Slow query"
+        verbose_name_plural = "Slow queries"
+
+    def __str__(self):
+        return f"{self.origin or 'unknown'}: {self.normalized_sql[:80]}"
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
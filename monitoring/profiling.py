@@ -0,0 +1,141 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_CACHE_KEY = "profile:{}"
+PROFILE_TTL = 60 * 60 * 24
+PROFILE_STATS_LIMIT = 60
+PROFILE_SKIPPED_HEADER = "X-Profile-Skipped"
+
+# only one profiler can be enabled at a time per process, Python 3.12+
+# raises ValueError for a second one
+profiler_lock = threading.Lock()
+
+# (file suffix, function name) of the calls reported as request phases
+PROFILE_PHASES = {
+    "serialization_ms": ("rest_framework/serializers.py", "data"),
+    "render_ms": ("rest_framework/renderers.py", "render"),
+}
+
+
+def is_profiling_requested(request):
+    return PROFILE_HEADER in request.META or PROFILE_QUERY_PARAM in request.GET
+
+
+def is_staff_request(request):
+    """
+    Check staff status before the view runs, JWT users are only known to DRF.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_staff:
+        return True
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        return bool(drf_request.user and drf_request.user.is_staff)
+    except APIException:
+        return False
+
+
+def get_profile(profile_id):
+    return cache.get(PROFILE_CACHE_KEY.format(profile_id))
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records every statement with its duration.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "alias": context["connection"].alias,
+                    "sql": sql,
+                    "params": None if many else str(params),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
+
+
+class RequestProfiler:
+    """
+    Deterministic profile of one request plus the SQL it executed.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.recorder = QueryRecorder()
+        self.stack = ExitStack()
+        self.started = 0.0
+        self.total_ms = 0.0
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self.recorder))
+        self.started = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        self.stack.close()
+
+    def get_phases(self, stats):
+        phases = dict.fromkeys(PROFILE_PHASES, 0.0)
+        for (filename, _, function), entry in stats.stats.items():
+            for phase, (suffix, name) in PROFILE_PHASES.items():
+                if function == name and filename.endswith(suffix):
+                    # nested serializers are counted by their outermost call
+                    phases[phase] = max(phases[phase], entry[3] * 1000)
+        return {phase: round(value, 3) for phase, value in phases.items()}
+
+    def as_dict(self, request, response):
+        output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_LIMIT)
+        queries = self.recorder.queries
+        user = getattr(request, "user", None)
+
+        return {
+            "created_at": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "query_string": request.META.get("QUERY_STRING", ""),
+            "status_code": response.status_code,
+            "user": getattr(user, "email", None),
+            "total_ms": round(self.total_ms, 3),
+            "sql_ms": round(sum(query["duration_ms"] for query in queries), 3),
+            "sql_count": len(queries),
+            **self.get_phases(stats),
+            "queries": queries,
+            "profile": output.getvalue(),
+        }
+
+    def save(self, request, response):
+        profile_id = uuid.uuid4().hex
+        data = {"id": profile_id, **self.as_dict(request, response)}
+        cache.set(PROFILE_CACHE_KEY.format(profile_id), data, PROFILE_TTL)
+        return profile_id
@@ -0,0 +1,39 @@
+from rest_framework import serializers
+
+from monitoring.models import SlowQuery
+
+
+class SlowQueryListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SlowQuery
+        fields = [
+            "id",
+            "origin",
+            "normalized_sql",
+            "calls",
+            "total_ms",
+            "mean_ms",
+            "max_ms",
+            "last_seen",
+        ]
+
+
+class SlowQueryDetailSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SlowQuery
+        fields = [
+            "id",
+            "fingerprint",
+            "origin",
+            "normalized_sql",
+            "sample_sql",
+            "sample_params",
+            "calls",
+            "total_ms",
+            "mean_ms",
+            "max_ms",
+            "plan",
+            "plan_captured_at",
+            "first_seen",
+            "last_seen",
+        ]
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import re
+import reprlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from monitoring.models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_TIMEOUT_MS = 30000
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+# ANALYZE would take the row locks of these a second time
+LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+
+# the stored sample parameters are cut to this many, each to this length
+params_repr = reprlib.Repr()
+params_repr.maxlist = 20
+params_repr.maxstring = params_repr.maxother = 60
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-queries")
+
+NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_sql(sql):
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize_sql(sql).encode(), usedforsecurity=False).hexdigest()
+
+
+def get_threshold_ms():
+    return getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+
+def describe_view(view_func, request):
+    """
+    Name the view action, e.g. "FlightViewSet.list", for a resolved view.
+    """
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f"{view_class.__name__}.{action}"
+
+
+class SlowQueryRecorder:
+    """
+    Execute wrapper that hands statements slower than the threshold to the
+    background executor.
+    """
+
+    def __init__(self, threshold_ms, origin=""):
+        self.threshold_ms = threshold_ms
+        self.origin = origin
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms and not many:
+                executor.submit(
+                    record_slow_query,
+                    sql,
+                    list(params) if params is not None else None,
+                    duration_ms,
+                    self.origin,
+                )
+
+
+def explain(sql, params):
+    if connection.vendor != "postgresql" or not sql.lstrip().upper().startswith(
+        "SELECT"
+    ):
+        return ""
+    prefix = "EXPLAIN " if LOCKING_CLAUSE.search(sql) else EXPLAIN_PREFIX
+    # ANALYZE runs the statement, keep it bounded and never commit it.
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+        cursor.execute(prefix + sql, params)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        transaction.set_rollback(True)
+    return plan
+
+
+def store_slow_query(key, sql, params, duration_ms, origin):
+    slow_query, created = SlowQuery.objects.get_or_create(
+        fingerprint=key,
+        defaults={
+            "normalized_sql": normalize_sql(sql),
+            "sample_sql": sql,
+            "sample_params": params_repr.repr(params),
+            "origin": origin,
+            "calls": 1,
+            "total_ms": duration_ms,
+            "max_ms": duration_ms,
+        },
+    )
+    if not created:
+        SlowQuery.objects.filter(pk=slow_query.pk).update(
+            calls=F("calls") + 1,
+            total_ms=F("total_ms") + duration_ms,
+            max_ms=Greatest("max_ms", duration_ms),
+            origin=origin,
+            last_seen=timezone.now(),
+        )
+    return slow_query
+
+
+def record_slow_query(sql, params, duration_ms, origin):
+    """
+    Upsert the statement by fingerprint and capture its plan the first time.
+    Runs on the background executor with its own database connection.
+    """
+    key = fingerprint(sql)
+    try:
+        slow_query = store_slow_query(key, sql, params, duration_ms, origin)
+        plan = "" if slow_query.plan else explain(sql, params)
+        if plan:
+            SlowQuery.objects.filter(pk=slow_query.pk).update(
+                plan=plan, plan_captured_at=timezone.now()
+            )
+    except Exception:
+        logger.exception("Could not record slow query %s", key)
+    finally:
+        if not connection.in_atomic_block:
+            connection.close()
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airports.models import Airport
+from monitoring.profiling import profiler_lock
+
+User = get_user_model()
+
+
+class ProfilingMiddlewareTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@test.com", password="password")
+        self.staff_user = User.objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        Airport.objects.create(name="JFK", city="New York", country="USA")
+        self.url = reverse("flights:flights-list")
+
+    def test_staff_request_with_header_is_profiled(self):
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response["X-Profile-Id"]
+
+        response = self.client.get(response["X-Profile-Url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], profile_id)
+        self.assertEqual(response.data["path"], self.url)
+        self.assertGreater(response.data["sql_count"], 0)
+        self.assertEqual(len(response.data["queries"]), response.data["sql_count"])
+        self.assertIn("render_ms", response.data)
+        self.assertIn("cumulative", response.data["profile"])
+
+    def test_request_is_not_profiled_while_another_one_is(self):
+        self.client.force_authenticate(user=self.staff_user)
+
+        with profiler_lock:
+            response = self.client.get(self.url, HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertIn("X-Profile-Skipped", response)
+        self.assertIn("X-Profile-Id", self.client.get(self.url, HTTP_X_PROFILE="1"))
+
+    def test_staff_jwt_request_with_query_param_is_profiled(self):
+        token = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": "admin@test.com", "password": "password"},
+        ).data["access"]
+        response = self.client.get(
+            self.url, {"_profile": "1"}, HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        self.assertIn("X-Profile-Id", response)
+
+    def test_regular_user_is_not_profiled(self):
+        self.client.force_authenticate(user=self.user)
+        with mock.patch("monitoring.middleware.RequestProfiler") as profiler:
+            response = self.client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+        profiler.assert_not_called()
+
+    def test_request_without_flag_is_not_profiled(self):
+        self.client.force_authenticate(user=self.staff_user)
+        with mock.patch("monitoring.middleware.RequestProfiler") as profiler:
+            response = self.client.get(self.url)
+        self.assertNotIn("X-Profile-Id", response)
+        profiler.assert_not_called()
+
+    def test_profile_detail_is_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse("monitoring:profile-detail", args=["missing"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from monitoring.models import SlowQuery
+from monitoring.slow_queries import fingerprint, normalize_sql, record_slow_query
+
+User = get_user_model()
+
+FLIGHTS_SQL = (
+    'SELECT "flights_flight"."id" FROM "flights_flight" '
+    'WHERE "flights_flight"."airplane_id" IN (%s, %s, %s) LIMIT 5'
+)
+
+
+class NormalizeSqlTest(TestCase):
+    def test_literals_and_in_lists_are_collapsed(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b IN (1, 2,  3)"),
+            "SELECT * FROM t WHERE a = ? AND b IN (?)",
+        )
+
+    def test_fingerprint_ignores_parameter_count(self):
+        other = FLIGHTS_SQL.replace("(%s, %s, %s)", "(%s)")
+        self.assertEqual(fingerprint(FLIGHTS_SQL), fingerprint(other))
+
+
+class RecordSlowQueryTest(TestCase):
+    def test_queries_are_deduplicated_by_fingerprint(self):
+        record_slow_query(FLIGHTS_SQL, [1, 2, 3], 120.0, "FlightViewSet.list")
+        record_slow_query(
+            FLIGHTS_SQL.replace("(%s, %s, %s)", "(%s)"),
+            [1],
+            300.0,
+            "FlightViewSet.list",
+        )
+
+        slow_query = SlowQuery.objects.get()
+        self.assertEqual(slow_query.calls, 2)
+        self.assertEqual(slow_query.total_ms, 420.0)
+        self.assertEqual(slow_query.max_ms, 300.0)
+        self.assertIn("Execution Time", slow_query.plan)
+
+    def test_plan_is_not_captured_for_writes(self):
+        record_slow_query(
+            'UPDATE "flights_crew" SET "rang" = %s', ["Pilot"], 900.0, "CrewViewSet"
+        )
+        self.assertEqual(SlowQuery.objects.get().plan, "")
+
+    def test_locking_statements_are_explained_without_running_them(self):
+        record_slow_query(FLIGHTS_SQL + " FOR UPDATE", [1, 2, 3], 120.0, "allocate")
+
+        plan = SlowQuery.objects.get().plan
+        self.assertIn("LockRows", plan)
+        self.assertNotIn("Execution Time", plan)
+
+    def test_sample_params_are_truncated(self):
+        params = ["x" * 1000, list(range(100))]
+        record_slow_query("SELECT %s::text, %s::int[]", params, 120.0, "report")
+
+        sample = SlowQuery.objects.get().sample_params
+        self.assertLess(len(sample), 200)
+        self.assertTrue(sample.startswith("['xxx"))
+        self.assertTrue(sample.endswith("...]]"))
+
+
+class SlowQueryMiddlewareTest(APITestCase):
+    def setUp(self):
+        self.staff_user = User.objects.create_user(
+            email="admin@test.com", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=self.staff_user)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.000001)
+    def test_slow_queries_are_submitted_with_view_action(self):
+        with mock.patch("monitoring.slow_queries.executor") as executor:
+            self.client.get(reverse("flights:flights-list"))
+        origins = {call.args[4] for call in executor.submit.call_args_list}
+        self.assertEqual(origins, {"FlightViewSet.list"})
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_zero_threshold_disables_recording(self):
+        with mock.patch("monitoring.slow_queries.executor") as executor:
+            self.client.get(reverse("flights:flights-list"))
+        executor.submit.assert_not_called()
+
+    def test_report_lists_worst_offenders_first(self):
+        record_slow_query(FLIGHTS_SQL, [1, 2, 3], 50.0, "FlightViewSet.list")
+        record_slow_query(
+            'SELECT "airports_airport"."id" FROM "airports_airport"',
+            [],
+            500.0,
+            "AirportViewSet.list",
+        )
+        response = self.client.get(reverse("monitoring:slow-query-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        origins = [row["origin"] for row in response.data["results"]]
+        self.assertEqual(origins, ["AirportViewSet.list", "FlightViewSet.list"])
+
+    def test_report_is_staff_only(self):
+        user = User.objects.create_user(email="user@test.com", password="password")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("monitoring:slow-query-list"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
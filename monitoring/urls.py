@@ -0,0 +1,18 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from monitoring.views import ProfileDetailView, SlowQueryViewSet
+
+router = DefaultRouter()
+router.register("slow-queries", SlowQueryViewSet, basename="slow-query")
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("", include(router.urls)),
+    path(
+        "profiles/<str:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
+    ),
+]
@@ -0,0 +1,46 @@
+from django.http import Http404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from base.mixins import BaseViewSetMixin
+from base.pagination import DefaultPagination
+from monitoring.models import SlowQuery
+from monitoring.profiling import get_profile
+from monitoring.serializers import SlowQueryDetailSerializer, SlowQueryListSerializer
+
+
+class ProfileDetailView(APIView):
+    """
+    Retrieve a stored request profile by the id from the X-Profile-Id header.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        profile = get_profile(profile_id)
+        if profile is None:
+            raise Http404
+        return Response(profile)
+
+
+class SlowQueryViewSet(BaseViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Report of recorded slow queries, worst total time first.
+    """
+
+    queryset = SlowQuery.objects.all()
+    serializer_class = SlowQueryListSerializer
+    pagination_class = DefaultPagination
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ["origin"]
+    ordering_fields = ["total_ms", "max_ms", "calls", "last_seen"]
+    ordering = ["-total_ms"]
+
+    action_serializers = {
+        "retrieve": SlowQueryDetailSerializer,
+    }
@@ -2,7 +2,30 @@
 
 from django.contrib import admin
 
+from airports.admin import RouteDestinationFilter, RouteSourceFilter
+from base.pagination import EstimatedCountPaginator
 from tickets.models import Order, Ticket
+from tickets.queries import ordered_tickets
+from users.admin import UserEmailFilter
+
+# everything Ticket.__str__ and the flight column read, through Flight.__str__
+TICKET_RELATED = (
+    "flight__route__source",
+    "flight__route__destination",
+    "flight__airplane",
+)
+
+
+class OrderUserEmailFilter(UserEmailFilter):
+    user_field = "order__user"
+
+
+class FlightSourceFilter(RouteSourceFilter):
+    route_field = "flight__route"
+
+
+class FlightDestinationFilter(RouteDestinationFilter):
+    route_field = "flight__route"
 
 
 class TicketInline(admin.TabularInline):
@@ -11,6 +34,9 @@ class TicketInline(admin.TabularInline):
     autocomplete_fields = ["flight"]
     readonly_fields = ["created_at"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(*TICKET_RELATED, "order")
+
     def created_at(self, obj):
         return obj.order.created_at
 
@@ -20,30 +46,44 @@ class TicketInline(admin.TabularInline):
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "created_at", "get_ticket_count")
-    list_filter = ("created_at", "user")
-    search_fields = ("user__username", "user__email")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_filter = ("created_at", UserEmailFilter)
+    search_fields = ("user__email",)
     date_hierarchy = "created_at"
     readonly_fields = ("created_at",)
     inlines = [TicketInline]
 
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("user")
+            .annotate(ticket_count=ordered_tickets())
+        )
+
     def get_ticket_count(self, obj):
-        return obj.tickets.count()
+        return obj.ticket_count
 
     get_ticket_count.short_description = "Tickets"
+    get_ticket_count.admin_order_field = "ticket_count"
 
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("id", "flight", "row", "seat", "get_user", "get_created_at")
+    list_select_related = (*TICKET_RELATED, "order__user")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = (
-        "flight__route__source",
-        "flight__route__destination",
+        FlightSourceFilter,
+        FlightDestinationFilter,
         "order__created_at",
+        OrderUserEmailFilter,
     )
     search_fields = (
         "flight__route__source__name",
         "flight__route__destination__name",
-        "order__user__username",
         "order__user__email",
     )
     autocomplete_fields = ["flight", "order"]
@@ -0,0 +1,82 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from tickets.models import Ticket
+
+MAX_PARTY_SIZE = 9
+
+
+def occupancy(flight):
+    """
+    Boolean rows x seats_in_row bitmap of the flight's booked seats.
+    """
+    airplane = flight.airplane
+    occupied = np.zeros((airplane.rows, airplane.seats_in_row), dtype=bool)
+    seats = np.array(
+        Ticket.objects.filter(
+            flight=flight, row__lte=airplane.rows, seat__lte=airplane.seats_in_row
+        ).values_list("row", "seat"),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    occupied[seats[:, 0] - 1, seats[:, 1] - 1] = True
+    return occupied
+
+
+def find_row_run(free, party_size):
+    """
+    Frontmost run of ``party_size`` adjacent free seats in a single row.
+    """
+    if party_size > free.shape[1]:
+        return None
+    runs = sliding_window_view(free, party_size, axis=1).all(axis=2)
+    hits = np.argwhere(runs)
+    if not len(hits):
+        return None
+    row, seat = hits[0]
+    return [(row + 1, seat + offset + 1) for offset in range(party_size)]
+
+
+def find_cluster(free, party_size):
+    """
+    Smallest block of neighbouring rows and seats holding ``party_size`` free
+    seats, found with a summed-area table over the bitmap.
+    """
+    rows, width = free.shape
+    table = np.zeros((rows + 1, width + 1), dtype=np.int64)
+    table[1:, 1:] = free.cumsum(axis=0).cumsum(axis=1)
+    shapes = sorted(
+        (
+            (height, span)
+            for height in range(1, rows + 1)
+            for span in range(1, width + 1)
+            if height * span >= party_size
+        ),
+        key=lambda shape: (shape[0] * shape[1], shape[0]),
+    )
+    for height, span in shapes:
+        counts = (
+            table[height:, span:]
+            - table[:-height, span:]
+            - table[height:, :-span]
+            + table[:-height, :-span]
+        )
+        hits = np.argwhere(counts >= party_size)
+        if len(hits):
+            row, seat = hits[0]
+            block = free[row : row + height, seat : seat + span]
+            return [
+                (row + r + 1, seat + s + 1) for r, s in np.argwhere(block)[:party_size]
+            ]
+    return None
+
+
+def find_seats(occupied, party_size):
+    """
+    (row, seat) pairs seating the party together, or None if the flight does
+    not have enough free seats.
+    """
+    free = ~occupied
+    if party_size > free.sum():
+        return None
+    seats = find_row_run(free, party_size) or find_cluster(free, party_size)
+    return [(int(row), int(seat)) for row, seat in seats]
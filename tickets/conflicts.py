@@ -0,0 +1,130 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from flights.models import Flight
+from tickets.allocation import find_seats, occupancy
+from tickets.holds import held_seats
+from tickets.queries import taken_seats
+
+MAX_RESEAT_ATTEMPTS = 3
+
+
+def seats_by_flight(tickets):
+    seats = defaultdict(list)
+    for ticket in tickets:
+        seats[ticket["flight"].id].append((ticket["row"], ticket["seat"]))
+    return seats
+
+
+class SeatConflictError(APIException):
+    """
+    409 listing, per flight, the seats somebody else got first together with
+    as many free seats the client could take instead.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the seats are already taken."
+    default_code = "seat_conflict"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.conflicts = conflicts
+        self.detail = {
+            "detail": self.default_detail,
+            "conflicts": [
+                {
+                    "flight": conflict["flight"],
+                    "seats": [
+                        {"row": row, "seat": seat} for row, seat in conflict["seats"]
+                    ],
+                    "alternatives": [
+                        {"row": row, "seat": seat}
+                        for row, seat in conflict["alternatives"]
+                    ],
+                }
+                for conflict in conflicts
+            ],
+        }
+
+    def reseat(self, tickets):
+        """
+        The tickets with every taken seat swapped for its alternative, or None
+        when a flight has not got enough free seats left.
+        """
+        replacements = {}
+        for conflict in self.conflicts:
+            if len(conflict["alternatives"]) < len(conflict["seats"]):
+                return None
+            for seat, alternative in zip(
+                conflict["seats"], conflict["alternatives"], strict=False
+            ):
+                replacements[conflict["flight"], seat] = alternative
+        reseated = []
+        for ticket in tickets:
+            key = (ticket["flight"].id, (ticket["row"], ticket["seat"]))
+            row, seat = replacements.get(key, key[1])
+            reseated.append({**ticket, "row": row, "seat": seat})
+        return reseated
+
+
+def seat_conflict(taken, requested, user):
+    """
+    Build the SeatConflictError for the ``taken`` seats of a request for the
+    ``requested`` ones, both as {flight_id: [(row, seat), ...]}. Alternatives
+    avoid booked seats, seats held by others and the rest of the request.
+    """
+    flights = Flight.objects.select_related("airplane").in_bulk(list(taken))
+    conflicts = []
+    for flight_id, seats in sorted(taken.items()):
+        flight = flights[flight_id]
+        occupied = occupancy(flight)
+        for row, seat in held_seats(flight, user).union(requested[flight_id]):
+            occupied[row - 1, seat - 1] = True
+        conflicts.append(
+            {
+                "flight": flight_id,
+                "seats": sorted(seats),
+                "alternatives": find_seats(occupied, len(seats)) or [],
+            }
+        )
+    return SeatConflictError(conflicts)
+
+
+@contextmanager
+def detect_seat_conflicts(tickets, user):
+    """
+    Turn the IntegrityError of a ticket insert that lost a race for a seat
+    into a SeatConflictError. Must wrap the transaction, so that the lookup
+    of the taken seats runs after the rollback.
+    """
+    try:
+        yield
+    except IntegrityError:
+        requested = seats_by_flight(tickets)
+        taken = taken_seats(requested)
+        if not taken:
+            raise
+        raise seat_conflict(taken, requested, user) from None
+
+
+def book_with_retries(book, tickets, user, reseat=False):
+    """
+    Call ``book(tickets)``, which inserts the tickets in one transaction. On a
+    seat conflict either give up with a 409 or, when ``reseat`` is set, try
+    again on the suggested alternatives.
+    """
+    for attempt in range(1, MAX_RESEAT_ATTEMPTS + 1):
+        try:
+            with detect_seat_conflicts(tickets, user):
+                return book(tickets)
+        except SeatConflictError as conflict:
+            if not reseat or attempt == MAX_RESEAT_ATTEMPTS:
+                raise
+            tickets = conflict.reseat(tickets)
+            if tickets is None:
+                raise
+    return None
@@ -0,0 +1,13 @@
+from django.core.cache import cache
+
+from changes.log import consumer
+from tickets.models import Order, Ticket
+
+
+@consumer("booking-caches")
+def invalidate_booking_caches(changes):
+    models = {change.model for change in changes}
+    if models & {Order, Ticket}:
+        cache.delete_pattern("*order-list*")
+    if Ticket in models:
+        cache.delete_pattern("*ticket-list*")
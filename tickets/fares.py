@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from airplanes.models import AirplaneType
+from flights.models import Flight
+from tickets.queries import booked_seats
+
+FARE_CACHE_KEY = "fare:{}"
+FARE_TTL = 60 * 15
+
+BASE_FARE = 30.0
+FARE_PER_KM = 0.08
+CATEGORY_MULTIPLIERS = {
+    AirplaneType.AirplaneCategory.PASSENGER: 1.0,
+    AirplaneType.AirplaneCategory.CARGO: 0.8,
+    AirplaneType.AirplaneCategory.PRIVATE: 2.5,
+}
+# a full flight costs (1 + LOAD_SURCHARGE) times an empty one
+LOAD_SURCHARGE = 1.0
+# departing today costs (1 + LAST_MINUTE_SURCHARGE) times, decaying over days
+LAST_MINUTE_SURCHARGE = 0.5
+LAST_MINUTE_DAYS = 7.0
+
+
+def compute_fares(distance, category_multiplier, booked, capacity, days):
+    """
+    Fares for arrays of flights, rounded to cents.
+    """
+    distance = np.asarray(distance, dtype=float)
+    load_factor = np.clip(
+        np.asarray(booked, dtype=float) / np.maximum(capacity, 1), 0, 1
+    )
+    days = np.maximum(np.asarray(days, dtype=float), 0)
+    fares = (
+        (BASE_FARE + distance * FARE_PER_KM)
+        * np.asarray(category_multiplier, dtype=float)
+        * (1 + LOAD_SURCHARGE * load_factor**2)
+        * (1 + LAST_MINUTE_SURCHARGE * np.exp(-days / LAST_MINUTE_DAYS))
+    )
+    return np.round(fares, 2)
+
+
+def price_flights(flights):
+    """
+    Price flights loaded with route, airplane type and a ``booked_seats``
+    annotation in one vectorized pass.
+    """
+    if not flights:
+        return {}
+    now = timezone.now()
+    fares = compute_fares(
+        [flight.route.distance for flight in flights],
+        [
+            CATEGORY_MULTIPLIERS.get(flight.airplane.airplane_type.category, 1.0)
+            for flight in flights
+        ],
+        [flight.booked_seats for flight in flights],
+        [flight.airplane.total_seats for flight in flights],
+        [(flight.departure_time - now).total_seconds() / 86400 for flight in flights],
+    )
+    return {
+        flight.id: Decimal(f"{fare:.2f}")
+        for flight, fare in zip(flights, fares, strict=True)
+    }
+
+
+def priced_flights():
+    return Flight.objects.select_related("route", "airplane__airplane_type").annotate(
+        booked_seats=booked_seats()
+    )
+
+
+def get_fares(flights=(), flight_ids=()):
+    """
+    Current fares by flight id. Cached fares are reused so that a booking is
+    charged what the search page showed; the rest are priced from the given
+    flights or, for bare ids, loaded with one query.
+    """
+    flights = {flight.id: flight for flight in flights}
+    ids = set(flights) | set(flight_ids)
+    cached = cache.get_many([FARE_CACHE_KEY.format(pk) for pk in ids])
+    fares = {
+        pk: cached[FARE_CACHE_KEY.format(pk)]
+        for pk in ids
+        if FARE_CACHE_KEY.format(pk) in cached
+    }
+    missing = ids - fares.keys()
+    if missing - flights.keys():
+        flights.update(
+            (flight.id, flight)
+            for flight in priced_flights().filter(pk__in=missing - flights.keys())
+        )
+    computed = price_flights([flights[pk] for pk in missing if pk in flights])
+    cache.set_many(
+        {FARE_CACHE_KEY.format(pk): fare for pk, fare in computed.items()}, FARE_TTL
+    )
+    return {**fares, **computed}
+
+
+def invalidate_fare(flight_id):
+    cache.delete(FARE_CACHE_KEY.format(flight_id))
@@ -0,0 +1,142 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from tickets.fares import get_fares
+from tickets.models import Order, Ticket
+from tickets.queries import taken_seats
+
+HOLD_CACHE_KEY = "seat-hold:{}"
+SEAT_CACHE_KEY = "seat-hold:{}:{}:{}"
+
+
+class SeatsUnavailableError(Exception):
+    def __init__(self, seats):
+        super().__init__(f"Seats are not available: {seats}")
+        self.seats = seats
+
+
+def get_hold_ttl():
+    return settings.SEAT_HOLD_MINUTES * 60
+
+
+def seat_key(flight_id, row, seat):
+    return SEAT_CACHE_KEY.format(flight_id, row, seat)
+
+
+def owner_token(user_id, hold_id):
+    return f"{user_id}:{hold_id}"
+
+
+def held_among(keys, user):
+    """
+    Seats of ``keys`` (seat key -> (row, seat)) held by anyone but ``user``,
+    read with one multi-get. Expired holds simply are not there any more.
+    """
+    own_prefix = f"{user.id}:" if user is not None else None
+    return {
+        keys[key]
+        for key, token in cache.get_many(keys).items()
+        if own_prefix is None or not token.startswith(own_prefix)
+    }
+
+
+def held_seats(flight, user=None):
+    airplane = flight.airplane
+    return held_among(
+        {
+            seat_key(flight.id, row, seat): (row, seat)
+            for row in range(1, airplane.rows + 1)
+            for seat in range(1, airplane.seats_in_row + 1)
+        },
+        user,
+    )
+
+
+def held_by_others(flight_id, seats, user):
+    return held_among(
+        {seat_key(flight_id, row, seat): (row, seat) for row, seat in seats}, user
+    )
+
+
+def release_seats(flight_id, seats, token):
+    keys = [seat_key(flight_id, row, seat) for row, seat in seats]
+    owned = [key for key, value in cache.get_many(keys).items() if value == token]
+    cache.delete_many(owned)
+
+
+def create_hold(user, flight, seats):
+    """
+    Reserve the seats for SEAT_HOLD_MINUTES. Each seat key is claimed with an
+    atomic add, so two users can never hold the same seat.
+    """
+    taken = taken_seats({flight.id: seats})[flight.id]
+    if taken:
+        raise SeatsUnavailableError(sorted(taken))
+
+    hold_id = uuid.uuid4().hex
+    token = owner_token(user.id, hold_id)
+    ttl = get_hold_ttl()
+    claimed = []
+    for row, seat in seats:
+        if not cache.add(seat_key(flight.id, row, seat), token, ttl):
+            release_seats(flight.id, claimed, token)
+            raise SeatsUnavailableError([(row, seat)])
+        claimed.append((row, seat))
+
+    hold = {
+        "id": hold_id,
+        "user": user.id,
+        "flight": flight.id,
+        "seats": claimed,
+        "expires_at": timezone.now() + timedelta(seconds=ttl),
+    }
+    cache.set(HOLD_CACHE_KEY.format(hold_id), hold, ttl)
+    return hold
+
+
+def get_hold(hold_id, user):
+    hold = cache.get(HOLD_CACHE_KEY.format(hold_id))
+    if hold is None or hold["user"] != user.id:
+        return None
+    return hold
+
+
+def release_hold(hold):
+    release_seats(hold["flight"], hold["seats"], owner_token(hold["user"], hold["id"]))
+    cache.delete(HOLD_CACHE_KEY.format(hold["id"]))
+
+
+def check_hold(hold):
+    """
+    Raise SeatsUnavailableError for seats whose claim expired and was taken over.
+    """
+    token = owner_token(hold["user"], hold["id"])
+    keys = {
+        seat_key(hold["flight"], row, seat): (row, seat) for row, seat in hold["seats"]
+    }
+    values = cache.get_many(keys)
+    lost = [seat for key, seat in keys.items() if values.get(key) != token]
+    if lost:
+        raise SeatsUnavailableError(lost)
+
+
+def confirm_hold(hold, user):
+    """
+    Turn a hold into an order with a single bulk insert of its tickets.
+    """
+    check_hold(hold)
+    flight_id = hold["flight"]
+    price = get_fares(flight_ids=[flight_id])[flight_id]
+    with transaction.atomic():
+        order = Order.objects.create(user=user, total_price=price * len(hold["seats"]))
+        Ticket.objects.bulk_create(
+            Ticket(order=order, flight_id=flight_id, row=row, seat=seat, price=price)
+            for row, seat in hold["seats"]
+        )
+        transaction.on_commit(lambda: release_hold(hold))
+    return order
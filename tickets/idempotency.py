@@ -0,0 +1,162 @@
+import hashlib
+import json
+from contextlib import suppress
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from redis.exceptions import LockNotOwnedError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from tickets.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+RESPONSE_CACHE_KEY = "idempotency:{}"
+LOCK_CACHE_KEY = "idempotency-lock:{}"
+MAX_KEY_LENGTH = 255
+# a lock outliving a crashed worker expires after LOCK_TIMEOUT seconds
+LOCK_TIMEOUT = 60
+WAIT_TIMEOUT = 30
+
+
+class IdempotencyKeyInUseError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyReusedError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for another request."
+    default_code = "idempotency_key_reused"
+
+
+def get_ttl():
+    return timedelta(hours=settings.IDEMPOTENCY_KEY_HOURS)
+
+
+def cache_ttl():
+    return int(get_ttl().total_seconds())
+
+
+def digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def fingerprint(data):
+    return digest(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder))
+
+
+def load_response(user, endpoint, key, scope):
+    """
+    The stored response from the cache, falling back to the database (and
+    warming the cache again) when the cached copy is gone.
+    """
+    stored = cache.get(RESPONSE_CACHE_KEY.format(scope))
+    if stored is not None:
+        return stored
+    stored = (
+        IdempotencyKey.objects.filter(
+            user=user,
+            endpoint=endpoint,
+            key=key,
+            created_at__gte=timezone.now() - get_ttl(),
+        )
+        .values("fingerprint", "status_code", "response")
+        .first()
+    )
+    if stored is not None:
+        cache.set(RESPONSE_CACHE_KEY.format(scope), stored, timeout=cache_ttl())
+    return stored
+
+
+def prune_expired_keys(batch_size):
+    """
+    Delete up to ``batch_size`` of the stored responses older than
+    IDEMPOTENCY_KEY_HOURS, which are never replayed again.
+    """
+    expired = IdempotencyKey.objects.filter(
+        created_at__lt=timezone.now() - get_ttl()
+    ).values("pk")[:batch_size]
+    return IdempotencyKey.objects.filter(pk__in=expired).delete()[0]
+
+
+def replay(stored, request_fingerprint):
+    if stored["fingerprint"] != request_fingerprint:
+        raise IdempotencyKeyReusedError()
+    response = Response(stored["response"], status=stored["status_code"])
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(view):
+    """
+    Let clients retry a create safely by sending an Idempotency-Key header.
+
+    The first successful response is stored for IDEMPOTENCY_KEY_HOURS and
+    replayed to retries with the same key and body. A retry that arrives
+    while the first request is still running waits for it on a cache lock
+    instead of racing it into the database. Errors are not stored, so the
+    request can be retried after fixing it.
+    """
+
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters."
+            )
+
+        user, endpoint = request.user, request.path
+        scope = digest(f"{user.pk}:{endpoint}:{key}")
+        request_fingerprint = fingerprint(request.data)
+        stored = load_response(user, endpoint, key, scope)
+        if stored is not None:
+            return replay(stored, request_fingerprint)
+
+        lock = cache.lock(LOCK_CACHE_KEY.format(scope), timeout=LOCK_TIMEOUT)
+        if not lock.acquire(blocking_timeout=WAIT_TIMEOUT):
+            raise IdempotencyKeyInUseError()
+        try:
+            # the request we waited for has stored its response by now
+            stored = load_response(user, endpoint, key, scope)
+            if stored is not None:
+                return replay(stored, request_fingerprint)
+
+            with transaction.atomic():
+                response = view(self, request, *args, **kwargs)
+                if not status.is_success(response.status_code):
+                    return response
+                # the key is committed together with what the request created
+                stored = {
+                    "fingerprint": request_fingerprint,
+                    "status_code": response.status_code,
+                    "response": json.loads(
+                        json.dumps(response.data, cls=DjangoJSONEncoder)
+                    ),
+                }
+                IdempotencyKey.objects.update_or_create(
+                    user=user,
+                    endpoint=endpoint,
+                    key=key,
+                    defaults={**stored, "created_at": timezone.now()},
+                )
+            cache.set(RESPONSE_CACHE_KEY.format(scope), stored, timeout=cache_ttl())
+            return response
+        finally:
+            # the lock has expired when the view outlived LOCK_TIMEOUT; what it
+            # created is committed all the same
+            with suppress(LockNotOwnedError):
+                lock.release()
+
+    return wrapper
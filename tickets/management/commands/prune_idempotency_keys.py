@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.idempotency import prune_expired_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the stored idempotent responses older than "
+        "IDEMPOTENCY_KEY_HOURS in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between batches, to leave room for traffic.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        started = time.perf_counter()
+        batches = pruned = 0
+        while True:
+            deleted = prune_expired_keys(options["batch_size"])
+            if deleted:
+                batches += 1
+                pruned += deleted
+            # a short batch was the last of them
+            if deleted < options["batch_size"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(
+            f"Pruned {pruned} expired idempotency keys in {batches} batches, "
+            f"{time.perf_counter() - started:.1f}s."
+        )
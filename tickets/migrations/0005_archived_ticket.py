@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0003_archived_flight'),
+        ('tickets', '0004_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('row', models.PositiveIntegerField()),
+                ('seat', models.PositiveIntegerField()),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tickets', to='flights.archivedflight')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='tickets.order')),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0004_flight_indexes'),
+        ('tickets', '0005_archived_ticket'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='flight',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tickets', to='flights.flight'),
+        ),
+    ]
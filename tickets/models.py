@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
-from flights.models import Flight
+from flights.models import ArchivedFlight, Flight
 
 User = get_user_model()
 
@@ -9,6 +10,7 @@ User = get_user_model()
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
     def __str__(self):
         return f"Order {self.id} by {self.user.email}"
@@ -17,8 +19,13 @@ class Order(models.Model):
 class Ticket(models.Model):
     row = models.PositiveIntegerField()
     seat = models.PositiveIntegerField()
-    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="tickets")
+    # looked up through the unique (flight, row, seat) index, which also
+    # answers seat counts and seat maps of a flight with index-only scans
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="tickets", db_index=False
+    )
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
     class Meta:
         constraints = [
@@ -32,3 +39,52 @@ class Ticket(models.Model):
             f"Ticket {self.id} for Flight {self.flight}"
             f" (Row: {self.row}, Seat: {self.seat})"
         )
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response stored for an Idempotency-Key header, replayed to retries of the
+    same request. Kept next to the cached copy so a flushed cache does not
+    turn a retry into a second order.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    endpoint = models.CharField(max_length=255)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "endpoint", "key"], name="unique_idempotency_key"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotency_key_created_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.key} for {self.endpoint}"
+
+
+class ArchivedTicket(models.Model):
+    """
+    Ticket of an archived flight, moved together with it.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    row = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+    flight = models.ForeignKey(
+        ArchivedFlight, on_delete=models.CASCADE, related_name="tickets"
+    )
+    order = models.ForeignKey(
+        Order, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    def __str__(self):
+        return f"Archived ticket {self.id} (Row: {self.row}, Seat: {self.seat})"
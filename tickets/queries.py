@@ -0,0 +1,60 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from tickets.models import Ticket
+
+
+def booked_seats(model=Ticket):
+    """
+    Correlated count of the tickets sold on the outer query's flight; pass
+    ArchivedTicket for an outer query over archived flights.
+    """
+    tickets = (
+        model.objects.filter(flight=OuterRef("pk"))
+        .order_by()
+        .values("flight")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(tickets, output_field=IntegerField()), 0)
+
+
+def ordered_tickets():
+    """
+    Correlated count of the tickets of the outer query's order, evaluated
+    only for the rows the outer query returns.
+    """
+    tickets = (
+        Ticket.objects.filter(order=OuterRef("pk"))
+        .order_by()
+        .values("order")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(tickets, output_field=IntegerField()), 0)
+
+
+def taken_seats(seats_by_flight):
+    """
+    Which of the requested (row, seat) pairs already have a ticket, as
+    {flight_id: {(row, seat), ...}} read in a single query.
+    """
+    condition = reduce(
+        or_,
+        (
+            Q(flight_id=flight_id, row=row, seat=seat)
+            for flight_id, seats in seats_by_flight.items()
+            for row, seat in seats
+        ),
+        Q(pk__in=[]),
+    )
+    taken = defaultdict(set)
+    for flight_id, row, seat in Ticket.objects.filter(condition).values_list(
+        "flight_id", "row", "seat"
+    ):
+        taken[flight_id].add((row, seat))
+    return taken
@@ -8,17 +8,34 @@ from flights.serializers import (
     FlightSerializer,
     FlightDetailSerializer
 )
+from flights.models import Flight
+from tickets.allocation import MAX_PARTY_SIZE, find_seats, occupancy
+from tickets.conflicts import (
+    MAX_RESEAT_ATTEMPTS,
+    SeatConflictError,
+    book_with_retries,
+    detect_seat_conflicts,
+)
+from tickets.fares import get_fares
+from tickets.holds import held_by_others, held_seats
 from tickets.models import Order, Ticket
 from users.serializers import UserSerializer
 
 
+def validate_not_held(flight, row, seat, context):
+    request = context.get("request")
+    user = request.user if request is not None else None
+    if held_by_others(flight.id, [(row, seat)], user):
+        raise ValidationError("This seat is held by another customer")
+
+
 class OrderSerializer(serializers.ModelSerializer):
     user = UserSerializer(many=False, read_only=True)
 
     class Meta:
         model = Order
-        fields = ["id", "created_at", "user"]
-        read_only_fields = ["id", "created_at"]
+        fields = ["id", "created_at", "user", "total_price"]
+        read_only_fields = ["id", "created_at", "total_price"]
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -26,7 +43,7 @@ class TicketSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight", "order"]
+        fields = ["id", "row", "seat", "price", "flight", "order"]
 
 
 class TicketToOrderSerializer(serializers.ModelSerializer):
@@ -35,7 +52,7 @@ class TicketToOrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight", "route"]
+        fields = ["id", "row", "seat", "price", "flight", "route"]
 
 
 class OrderListSerializer(serializers.ModelSerializer):
@@ -45,8 +62,8 @@ class OrderListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ["id", "created_at", "user", "tickets", "flight"]
-        read_only_fields = ["id", "created_at", "user"]
+        fields = ["id", "created_at", "user", "total_price", "tickets", "flight"]
+        read_only_fields = ["id", "created_at", "user", "total_price"]
 
 
 class OrderDetailSerializer(serializers.ModelSerializer):
@@ -56,8 +73,8 @@ class OrderDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ["id", "created_at", "user", "tickets", "flight"]
-        read_only_fields = ["id", "created_at", "user"]
+        fields = ["id", "created_at", "user", "total_price", "tickets", "flight"]
+        read_only_fields = ["id", "created_at", "user", "total_price"]
 
 
 class TicketListSerializer(serializers.ModelSerializer):
@@ -66,8 +83,8 @@ class TicketListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight", "order"]
-        read_only_fields = ["id", "order"]
+        fields = ["id", "row", "seat", "price", "flight", "order"]
+        read_only_fields = ["id", "price", "order"]
 
 
 class TicketDetailSerializer(serializers.ModelSerializer):
@@ -77,14 +94,16 @@ class TicketDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight", "order", "airstrip"]
-        read_only_fields = ["id", "order"]
+        fields = ["id", "row", "seat", "price", "flight", "order", "airstrip"]
+        read_only_fields = ["id", "price", "order"]
 
 
 class TicketCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ["id", "row", "seat", "flight"]
+        # taken seats are caught by the constraint on insert, see conflicts.py
+        validators = []
 
     def validate(self, data):
         flight = data.get("flight")
@@ -94,13 +113,22 @@ class TicketCreateSerializer(serializers.ModelSerializer):
             raise ValidationError("Invalid seat number")
         if flight.airplane.rows < row:
             raise ValidationError("Invalid row number")
+        validate_not_held(flight, row, seat, self.context)
         return data
 
 
 class TicketByRouteSerializer(serializers.ModelSerializer):
+    reseat = serializers.BooleanField(
+        default=False,
+        write_only=True,
+        help_text="Take the nearest free seat instead if this one is gone",
+    )
+
     class Meta:
         model = Ticket
-        fields = ["id", "row", "seat", "flight"]
+        fields = ["id", "row", "seat", "price", "flight", "reseat"]
+        read_only_fields = ["id", "price"]
+        validators = []
 
     def validate(self, data):
         flight = data.get("flight")
@@ -110,32 +138,168 @@ class TicketByRouteSerializer(serializers.ModelSerializer):
             raise ValidationError("Invalid seat number")
         if flight.airplane.rows < row:
             raise ValidationError("Invalid row number")
+        validate_not_held(flight, row, seat, self.context)
         return data
 
     def create(self, validated_data):
-        with transaction.atomic():
-            request = self.context.get("request")
-            user = request.user
-            order = Order.objects.create(user=user)
-            validated_data["order"] = order
-            return super().create(validated_data)
+        user = self.context.get("request").user
+        reseat = validated_data.pop("reseat")
+
+        def book(tickets):
+            (ticket_data,) = tickets
+            with transaction.atomic():
+                flight = ticket_data["flight"]
+                price = get_fares(flight_ids=[flight.id])[flight.id]
+                order = Order.objects.create(user=user, total_price=price)
+                return super(TicketByRouteSerializer, self).create(
+                    {**ticket_data, "order": order, "price": price}
+                )
+
+        return book_with_retries(book, [validated_data], user, reseat=reseat)
 
 
 class OrderCreateSerializer(serializers.ModelSerializer):
     tickets = TicketCreateSerializer(many=True, allow_empty=False)
+    reseat = serializers.BooleanField(
+        default=False,
+        write_only=True,
+        help_text="Take the nearest free seats instead of any that are gone",
+    )
+
+    class Meta:
+        model = Order
+        fields = ["id", "user", "total_price", "tickets", "reseat"]
+        read_only_fields = ["id", "user", "total_price", "tickets"]
+
+    def validate_tickets(self, tickets):
+        seats = [
+            (ticket["flight"].id, ticket["row"], ticket["seat"]) for ticket in tickets
+        ]
+        if len(set(seats)) != len(seats):
+            raise ValidationError("The same seat is booked twice")
+        return tickets
+
+    def create(self, validated_data):
+        request = self.context.get("request")
+        if request and hasattr(request, "user"):
+            validated_data["user"] = request.user
+        reseat = validated_data.pop("reseat")
+        tickets_data = validated_data.pop("tickets")
+
+        def book(tickets):
+            with transaction.atomic():
+                # priced once per order, at the fares the customer was shown
+                flight_ids = {ticket["flight"].id for ticket in tickets}
+                fares = get_fares(flight_ids=flight_ids)
+                order = Order.objects.create(
+                    **validated_data,
+                    total_price=sum(fares[ticket["flight"].id] for ticket in tickets),
+                )
+                for ticket in tickets:
+                    Ticket.objects.create(
+                        order=order, price=fares[ticket["flight"].id], **ticket
+                    )
+                return order
+
+        return book_with_retries(
+            book, tickets_data, validated_data.get("user"), reseat=reseat
+        )
+
+
+class AllocatedTicketSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Ticket
+        fields = ["id", "row", "seat", "price", "flight"]
+
+
+class OrderAllocateSerializer(serializers.ModelSerializer):
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.all(), write_only=True
+    )
+    party_size = serializers.IntegerField(
+        min_value=1, max_value=MAX_PARTY_SIZE, write_only=True
+    )
+    tickets = AllocatedTicketSerializer(many=True, read_only=True)
 
     class Meta:
         model = Order
-        fields = ["id", "user", "tickets"]
-        read_only_fields = ["id", "user", "tickets"]
+        fields = ["id", "created_at", "total_price", "flight", "party_size", "tickets"]
+        read_only_fields = ["id", "created_at", "total_price"]
 
     def create(self, validated_data):
+        request = self.context.get("request")
+        party_size = validated_data["party_size"]
         with transaction.atomic():
-            request = self.context.get("request")
-            if request and hasattr(request, "user"):
-                validated_data["user"] = request.user
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+            # allocations for the same flight queue up behind this lock
+            flight = (
+                Flight.objects.select_for_update(of=("self",))
+                .select_related("airplane")
+                .get(pk=validated_data["flight"].pk)
+            )
+            price = get_fares(flight_ids=[flight.id])[flight.id]
+            # other booking paths do not take the lock, so a seat may go
+            # between the occupancy read and the insert; look again then
+            for attempt in range(1, MAX_RESEAT_ATTEMPTS + 1):
+                occupied = occupancy(flight)
+                for row, seat in held_seats(flight, request.user):
+                    occupied[row - 1, seat - 1] = True
+                seats = find_seats(occupied, party_size)
+                if seats is None:
+                    raise ValidationError("Not enough free seats on this flight")
+                tickets = [
+                    {"flight": flight, "row": row, "seat": seat} for row, seat in seats
+                ]
+                try:
+                    with (
+                        detect_seat_conflicts(tickets, request.user),
+                        transaction.atomic(),
+                    ):
+                        order = Order.objects.create(
+                            user=request.user, total_price=price * party_size
+                        )
+                        Ticket.objects.bulk_create(
+                            Ticket(order=order, price=price, **ticket)
+                            for ticket in tickets
+                        )
+                        return order
+                except SeatConflictError:
+                    if attempt == MAX_RESEAT_ATTEMPTS:
+                        raise
+        return None
+
+
+class HeldSeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    id = serializers.CharField(read_only=True)
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    seats = HeldSeatSerializer(many=True, allow_empty=False, max_length=MAX_PARTY_SIZE)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate(self, data):
+        airplane = data["flight"].airplane
+        seats = [(seat["row"], seat["seat"]) for seat in data["seats"]]
+        if len(set(seats)) != len(seats):
+            raise ValidationError("Seats must not repeat")
+        for row, seat in seats:
+            if airplane.seats_in_row < seat:
+                raise ValidationError("Invalid seat number")
+            if airplane.rows < row:
+                raise ValidationError("Invalid row number")
+        data["seats"] = seats
+        return data
+
+    def to_representation(self, hold):
+        return {
+            "id": hold["id"],
+            "flight": hold["flight"],
+            "seats": [{"row": row, "seat": seat} for row, seat in hold["seats"]],
+            "expires_at": serializers.DateTimeField().to_representation(
+                hold["expires_at"]
+            ),
+        }
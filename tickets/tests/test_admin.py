@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email="admin@test.com", password="password"
+        )
+        self.client.force_login(self.admin)
+        self.airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.airports = [
+            Airport.objects.create(name=f"Airport {i}", city="City", country="USA")
+            for i in range(2)
+        ]
+        self.count = 0
+
+    def add_bookings(self, count):
+        """
+        Each booking gets its own user, order, route and flight, so that
+        every changelist row points at different related objects.
+        """
+        for _ in range(count):
+            self.count += 1
+            route = Route.objects.create(
+                source=self.airports[0],
+                destination=self.airports[1],
+                distance=100,
+                flight_number=f"PL{self.count}",
+            )
+            departure = timezone.now() + timedelta(days=self.count)
+            flight = Flight.objects.create(
+                route=route,
+                airplane=self.airplane,
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+            )
+            user = User.objects.create_user(
+                email=f"user{self.count}@test.com", password="password"
+            )
+            order = Order.objects.create(user=user)
+            Ticket.objects.create(flight=flight, order=order, row=1, seat=1)
+            Ticket.objects.create(flight=flight, order=order, row=1, seat=2)
+
+    def queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_changelists_cost_the_same_for_any_number_of_rows(self):
+        for name in ["order", "ticket"]:
+            url = reverse(f"admin:tickets_{name}_changelist")
+            self.add_bookings(2)
+            few, _ = self.queries(url)
+            self.add_bookings(8)
+            many, _ = self.queries(url)
+            with self.subTest(name=name):
+                self.assertEqual(few, many)
+
+        url = reverse("admin:flights_flight_changelist")
+        few, _ = self.queries(url)
+        self.add_bookings(5)
+        many, _ = self.queries(url)
+        self.assertEqual(few, many)
+
+    def test_airport_filters_do_not_load_airports(self):
+        self.add_bookings(2)
+        for name in ["tickets_ticket", "flights_flight"]:
+            url = reverse(f"admin:{name}_changelist")
+            few, _ = self.queries(url)
+            Airport.objects.bulk_create(
+                Airport(name=f"{name} {i}", city="City", country="USA")
+                for i in range(5)
+            )
+            many, response = self.queries(url)
+            with self.subTest(name=name):
+                self.assertEqual(few, many)
+                self.assertNotContains(response, f"{name} 0")
+
+    def test_airport_filters_search_by_name(self):
+        self.add_bookings(2)
+        other = Airport.objects.create(name="Other", city="City", country="USA")
+        route = Route.objects.create(
+            source=other,
+            destination=self.airports[1],
+            distance=100,
+            flight_number="OT1",
+        )
+        Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + timedelta(hours=2),
+        )
+
+        _, response = self.queries(
+            reverse("admin:flights_flight_changelist"), {"source_name": "oth"}
+        )
+        self.assertEqual(
+            [flight.route for flight in response.context["cl"].result_list], [route]
+        )
+        _, response = self.queries(
+            reverse("admin:tickets_ticket_changelist"),
+            {"source_name": "airport 0", "destination_name": "Airport 1"},
+        )
+        self.assertEqual(len(response.context["cl"].result_list), 4)
+        self.assertContains(response, 'name="source_name" value="airport 0"')
+
+    def test_order_ticket_counts(self):
+        self.add_bookings(1)
+
+        _, response = self.queries(reverse("admin:tickets_order_changelist"))
+
+        (order,) = response.context["cl"].result_list
+        self.assertEqual(order.ticket_count, 2)
+
+    def test_user_filter_searches_by_email(self):
+        self.add_bookings(3)
+
+        for name, params in [
+            ("order", {"user_email": "USER2@"}),
+            ("ticket", {"user_email": "user2@"}),
+        ]:
+            with self.subTest(name=name):
+                _, response = self.queries(
+                    reverse(f"admin:tickets_{name}_changelist"), params
+                )
+                users = {
+                    getattr(obj, "user", None) or obj.order.user
+                    for obj in response.context["cl"].result_list
+                }
+                self.assertEqual({user.email for user in users}, {"user2@test.com"})
+                self.assertContains(
+                    response, f'name="user_email" value="{params["user_email"]}"'
+                )
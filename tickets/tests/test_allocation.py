@@ -0,0 +1,137 @@
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.allocation import find_seats, occupancy
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+def bitmap(*rows):
+    return np.array([[seat == "x" for seat in row] for row in rows])
+
+
+class FindSeatsTest(TestCase):
+    def test_prefers_adjacent_seats_in_one_row(self):
+        occupied = bitmap("x..x", "....")
+        self.assertEqual(find_seats(occupied, 2), [(1, 2), (1, 3)])
+        self.assertEqual(find_seats(occupied, 3), [(2, 1), (2, 2), (2, 3)])
+
+    def test_falls_back_to_tightest_cluster(self):
+        occupied = bitmap("x.x.", ".x.x", "xxxx")
+        self.assertEqual(find_seats(occupied, 2), [(1, 2), (1, 4)])
+        self.assertEqual(find_seats(occupied, 4), [(1, 2), (1, 4), (2, 1), (2, 3)])
+
+    def test_returns_none_when_flight_is_too_full(self):
+        self.assertIsNone(find_seats(bitmap("x.", "x."), 3))
+
+
+class AllocateOrderTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=4000,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=3,
+            seats_in_row=4,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=3),
+            arrival_time=timezone.now() + timedelta(days=3, hours=6),
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        self.url = reverse("tickets:order-allocate")
+
+    def allocate(self, party_size):
+        return self.client.post(
+            self.url, {"flight": self.flight.id, "party_size": party_size}
+        )
+
+    def test_occupancy_bitmap(self):
+        occupied = occupancy(Flight.objects.get(pk=self.flight.pk))
+        self.assertEqual(occupied.shape, (3, 4))
+        self.assertEqual(np.argwhere(occupied).tolist(), [[0, 1]])
+
+    def test_party_is_seated_together(self):
+        response = self.allocate(3)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        seats = [(ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]]
+        self.assertEqual(seats, [(2, 1), (2, 2), (2, 3)])
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.tickets.count(), 3)
+        self.assertEqual(order.total_price, order.tickets.first().price * 3)
+
+    def test_rejects_party_larger_than_free_seats(self):
+        self.allocate(9)
+        response = self.allocate(3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.filter(flight=self.flight).count(), 10)
+
+    def lose_seats_after_reads(self, reads):
+        """
+        Patch the occupancy read of the allocation so that, after each of the
+        first ``reads`` reads, another customer books the seats it will pick.
+        """
+        other = Order.objects.create(
+            user=User.objects.create_user(email="other@test.com")
+        )
+
+        def read_then_lose_seats(flight):
+            occupied = occupancy(flight)
+            if read.call_count <= reads:
+                for row, seat in find_seats(occupied.copy(), 3):
+                    Ticket.objects.create(
+                        flight=flight, order=other, row=row, seat=seat
+                    )
+            return occupied
+
+        read = mock.patch(
+            "tickets.serializers.occupancy", side_effect=read_then_lose_seats
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        return read
+
+    def test_seats_taken_after_the_read_are_allocated_again(self):
+        read = self.lose_seats_after_reads(1)
+
+        response = self.allocate(3)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(read.call_count, 2)
+        seats = [(ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]]
+        self.assertEqual(seats, [(3, 1), (3, 2), (3, 3)])
+
+    def test_seats_taken_on_every_attempt_conflict(self):
+        read = self.lose_seats_after_reads(3)
+
+        response = self.allocate(3)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(read.call_count, 3)
+        self.assertEqual(response.data["conflicts"][0]["flight"], self.flight.id)
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 1)
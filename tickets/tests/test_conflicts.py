@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class SeatConflictTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=4000,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=2,
+            seats_in_row=3,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=3),
+            arrival_time=timezone.now() + timedelta(days=3, hours=6),
+        )
+        self.other_order = Order.objects.create(
+            user=User.objects.create_user(email="other@test.com", password="password")
+        )
+        self.book(1, 1)
+
+    def book(self, row, seat):
+        Ticket.objects.create(
+            flight=self.flight, order=self.other_order, row=row, seat=seat
+        )
+
+    def order(self, *seats, **extra):
+        return self.client.post(
+            reverse("tickets:order-list"),
+            {
+                "tickets": [
+                    {"flight": self.flight.id, "row": row, "seat": seat}
+                    for row, seat in seats
+                ],
+                **extra,
+            },
+            format="json",
+        )
+
+    def test_taken_seat_returns_conflict_with_alternatives(self):
+        response = self.order((1, 1), (1, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["conflicts"],
+            [
+                {
+                    "flight": self.flight.id,
+                    "seats": [{"row": 1, "seat": 1}],
+                    "alternatives": [{"row": 1, "seat": 3}],
+                }
+            ],
+        )
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 0)
+
+    def test_reseat_books_alternatives(self):
+        response = self.order((1, 1), (1, 2), reseat=True)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(
+            sorted(order.tickets.values_list("row", "seat")), [(1, 2), (1, 3)]
+        )
+
+    def test_reseat_gives_up_when_flight_is_full(self):
+        for row, seat in [(1, 2), (1, 3), (2, 1), (2, 2), (2, 3)]:
+            self.book(row, seat)
+
+        response = self.order((1, 1), reseat=True)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["conflicts"][0]["alternatives"], [])
+
+    def test_same_seat_twice_is_rejected(self):
+        response = self.order((2, 1), (2, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_book_by_route_conflict(self):
+        url = reverse("tickets:ticket-book-by-route")
+        data = {"flight": self.flight.id, "row": 1, "seat": 1}
+
+        conflict = self.client.post(url, data)
+        reseated = self.client.post(url, {**data, "reseat": True})
+
+        self.assertEqual(conflict.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            conflict.data["conflicts"][0]["alternatives"], [{"row": 1, "seat": 2}]
+        )
+        self.assertEqual(reseated.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            (reseated.data["tickets"][0]["row"], reseated.data["tickets"][0]["seat"]),
+            (1, 2),
+        )
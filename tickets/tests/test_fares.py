@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from changes.log import process_changes
+from flights.models import Flight
+from tickets.fares import compute_fares, get_fares
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class ComputeFaresTest(TestCase):
+    def test_fares_grow_with_each_factor(self):
+        base, longer, private, fuller, sooner = compute_fares(
+            distance=[1000, 2000, 1000, 1000, 1000],
+            category_multiplier=[1.0, 1.0, 2.5, 1.0, 1.0],
+            booked=[0, 0, 0, 50, 0],
+            capacity=[100, 100, 100, 100, 100],
+            days=[60, 60, 60, 60, 1],
+        )
+        self.assertGreater(longer, base)
+        self.assertGreater(private, base)
+        self.assertGreater(fuller, base)
+        self.assertGreater(sooner, base)
+
+    def test_past_departures_and_overbooking_are_clamped(self):
+        fares = compute_fares([1000, 1000], [1.0, 1.0], [200, 100], [100, 100], [-3, 0])
+        self.assertEqual(fares[0], fares[1])
+
+
+class FareBookingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=4000,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=2,
+            seats_in_row=2,
+            airplane_type=AirplaneType.objects.create(
+                name="Boeing", category=AirplaneType.AirplaneCategory.PASSENGER
+            ),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=30),
+            arrival_time=timezone.now() + timedelta(days=30, hours=6),
+        )
+
+    def test_flight_list_shows_cached_fare(self):
+        response = self.client.get(reverse("flights:flights-list"))
+        fare = Decimal(response.data["results"][0]["fare"])
+        self.assertGreater(fare, Decimal("0"))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_fares(flight_ids=[self.flight.id]), {self.flight.id: fare})
+
+    def test_order_stores_ticket_prices_and_total(self):
+        fare = get_fares(flight_ids=[self.flight.id])[self.flight.id]
+        response = self.client.post(
+            reverse("tickets:order-list"),
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "flight": self.flight.id},
+                    {"row": 1, "seat": 2, "flight": self.flight.id},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get()
+        self.assertEqual(order.total_price, fare * 2)
+        self.assertEqual(
+            set(Ticket.objects.values_list("price", flat=True)), {fare}
+        )
+
+    def test_booking_reprices_flight(self):
+        fare = get_fares(flight_ids=[self.flight.id])[self.flight.id]
+        response = self.client.post(
+            reverse("tickets:ticket-book-by-route"),
+            {"row": 2, "seat": 2, "flight": self.flight.id},
+        )
+        self.assertEqual(Decimal(response.data["tickets"][0]["price"]), fare)
+        process_changes()
+        self.assertGreater(get_fares(flight_ids=[self.flight.id])[self.flight.id], fare)
@@ -0,0 +1,210 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.holds import seat_key
+from tickets.models import Order, Ticket
+
+User = get_user_model()
+
+
+class SeatHoldTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.other = User.objects.create_user(
+            email="other@test.com", password="password"
+        )
+        self.client.force_authenticate(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=4000,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=2,
+            seats_in_row=2,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=3),
+            arrival_time=timezone.now() + timedelta(days=3, hours=6),
+        )
+        self.url = reverse("tickets:seat-hold-list")
+
+    def hold(self, *seats):
+        return self.client.post(
+            self.url,
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            format="json",
+        )
+
+    def confirm(self, hold_id):
+        return self.client.post(reverse("tickets:seat-hold-confirm", args=[hold_id]))
+
+    def test_hold_reserves_seats(self):
+        response = self.hold((1, 1), (1, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["seats"], [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]
+        )
+        self.assertIn("expires_at", response.data)
+
+    def test_seat_held_by_another_user_conflicts(self):
+        self.hold((1, 1))
+        self.client.force_authenticate(user=self.other)
+
+        response = self.hold((1, 2), (1, 1))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        (conflict,) = response.data["conflicts"]
+        self.assertEqual(conflict["seats"], [{"row": 1, "seat": 1}])
+        self.assertEqual(conflict["alternatives"], [{"row": 2, "seat": 1}])
+        # the seat claimed before the conflict is given back
+        self.assertEqual(self.hold((1, 2)).status_code, status.HTTP_201_CREATED)
+
+    def test_booked_seat_conflicts(self):
+        order = Order.objects.create(user=self.other)
+        Ticket.objects.create(flight=self.flight, order=order, row=2, seat=2)
+
+        response = self.hold((2, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["conflicts"][0]["seats"], [{"row": 2, "seat": 2}]
+        )
+
+    def test_invalid_seats_are_rejected(self):
+        self.assertEqual(self.hold((3, 1)).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.hold((1, 1), (1, 1)).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_seat_map_hides_seats_held_by_others(self):
+        self.hold((1, 1))
+        seats_url = reverse("flights:flights-flight-seats", args=[self.flight.id])
+
+        own = self.client.get(seats_url)
+        self.client.force_authenticate(user=self.other)
+        other = self.client.get(seats_url)
+
+        self.assertEqual(own.data["available_seats"], 4)
+        self.assertEqual(other.data["available_seats"], 3)
+        self.assertEqual(
+            other.data["available_rows"],
+            [{"row": 1, "available_seats": [2]}, {"row": 2, "available_seats": [1, 2]}],
+        )
+
+    def test_confirm_books_held_seats(self):
+        hold_id = self.hold((2, 1), (2, 2)).data["id"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.confirm(hold_id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(
+            sorted(order.tickets.values_list("row", "seat")), [(2, 1), (2, 2)]
+        )
+        self.assertEqual(
+            order.total_price, sum(order.tickets.values_list("price", flat=True))
+        )
+        self.assertIsNone(cache.get(seat_key(self.flight.id, 2, 1)))
+        self.assertEqual(self.confirm(hold_id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_confirm_fails_when_claim_was_lost(self):
+        hold_id = self.hold((1, 1)).data["id"]
+        cache.set(seat_key(self.flight.id, 1, 1), f"{self.other.id}:other")
+
+        response = self.confirm(hold_id)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_confirm_conflicts_with_seat_booked_during_the_hold(self):
+        hold_id = self.hold((1, 1), (1, 2)).data["id"]
+        order = Order.objects.create(user=self.other)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+
+        response = self.confirm(hold_id)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["conflicts"][0]["seats"], [{"row": 1, "seat": 2}]
+        )
+        self.assertFalse(Order.objects.filter(user=self.user).exists())
+
+    def test_release_frees_seats(self):
+        hold_id = self.hold((1, 1)).data["id"]
+
+        response = self.client.delete(
+            reverse("tickets:seat-hold-detail", args=[hold_id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.hold((1, 1)).status_code, status.HTTP_201_CREATED)
+
+    def test_other_users_cannot_confirm_hold(self):
+        hold_id = self.hold((1, 1)).data["id"]
+        self.client.force_authenticate(user=self.other)
+
+        self.assertEqual(self.confirm(hold_id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_hold_is_reclaimed(self):
+        hold_id = self.hold((1, 1)).data["id"]
+        # what the cache does on its own once the TTL runs out
+        cache.delete_many([seat_key(self.flight.id, 1, 1), f"seat-hold:{hold_id}"])
+        self.client.force_authenticate(user=self.other)
+
+        self.assertEqual(self.hold((1, 1)).status_code, status.HTTP_201_CREATED)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.confirm(hold_id).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_direct_booking_respects_holds(self):
+        self.hold((1, 1))
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.post(
+            reverse("tickets:order-list"),
+            {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_allocation_skips_held_seats(self):
+        self.hold((1, 1), (1, 2))
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.post(
+            reverse("tickets:order-allocate"),
+            {"flight": self.flight.id, "party_size": 2},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]],
+            [(2, 1), (2, 2)],
+        )
@@ -0,0 +1,151 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from airplanes.models import Airplane, AirplaneType
+from airports.models import Airport, Route
+from flights.models import Flight
+from tickets.idempotency import LOCK_CACHE_KEY, digest
+from tickets.models import IdempotencyKey, Order
+
+User = get_user_model()
+
+
+class IdempotencyKeyTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="test@test.com", password="password")
+        self.client.force_authenticate(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="JFK", city="New York", country="USA"),
+            destination=Airport.objects.create(
+                name="LAX", city="Los Angeles", country="USA"
+            ),
+            distance=4000,
+            flight_number="AA1",
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing 737",
+            rows=3,
+            seats_in_row=4,
+            airplane_type=AirplaneType.objects.create(name="Boeing"),
+        )
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() + timedelta(days=3),
+            arrival_time=timezone.now() + timedelta(days=3, hours=6),
+        )
+        self.url = reverse("tickets:order-list")
+
+    def create_order(self, key, seat=1):
+        return self.client.post(
+            self.url,
+            {"tickets": [{"flight": self.flight.id, "row": 1, "seat": seat}]},
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.create_order("key-1")
+        retry = self.create_order("key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_replays_from_database_when_cache_is_gone(self):
+        first = self.create_order("key-1")
+        cache.clear()
+
+        retry = self.create_order("key-1")
+
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_different_keys_create_separate_orders(self):
+        self.create_order("key-1", seat=1)
+        self.create_order("key-2", seat=2)
+
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_with_different_body_is_rejected(self):
+        self.create_order("key-1", seat=1)
+
+        response = self.create_order("key-1", seat=2)
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_errors_are_not_stored(self):
+        invalid = self.create_order("key-1", seat=9)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_expired_key_runs_again(self):
+        self.create_order("key-1", seat=1)
+        cache.clear()
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        Order.objects.all().delete()
+
+        response = self.create_order("key-1", seat=1)
+
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_prune_command_deletes_expired_keys_in_batches(self):
+        for seat in [1, 2, 3]:
+            self.create_order(f"key-{seat}", seat=seat)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.create_order("key-4", seat=4)
+        out = StringIO()
+
+        call_command("prune_idempotency_keys", batch_size=2, sleep=0, stdout=out)
+
+        self.assertIn("Pruned 3 expired idempotency keys in 2 batches", out.getvalue())
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["key-4"]
+        )
+
+    @mock.patch("tickets.idempotency.LOCK_TIMEOUT", 0.001)
+    def test_request_outliving_its_lock_still_succeeds(self):
+        response = self.create_order("key-1")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    @mock.patch("tickets.idempotency.WAIT_TIMEOUT", 0.1)
+    def test_concurrent_duplicate_waits_for_first_request(self):
+        scope = digest(f"{self.user.pk}:{self.url}:key-1")
+        lock = cache.lock(LOCK_CACHE_KEY.format(scope), timeout=5)
+        lock.acquire()
+        try:
+            response = self.create_order("key-1")
+        finally:
+            lock.release()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_book_by_route_is_idempotent(self):
+        url = reverse("tickets:ticket-book-by-route")
+        data = {"flight": self.flight.id, "row": 2, "seat": 2}
+
+        first = self.client.post(url, data, headers={"Idempotency-Key": "key-1"})
+        retry = self.client.post(url, data, headers={"Idempotency-Key": "key-1"})
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
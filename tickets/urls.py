@@ -1,13 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from tickets.views import OrderViewSet, TicketViewSet
+from tickets.views import OrderViewSet, SeatHoldViewSet, TicketViewSet
 
 app_name = "tickets"
 
 router = DefaultRouter()
 router.register("tickets", TicketViewSet, basename="ticket")
 router.register("orders", OrderViewSet, basename="order")
+router.register("holds", SeatHoldViewSet, basename="seat-hold")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,23 +1,37 @@
+from django.db.models import Exists, OuterRef, Prefetch
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page, never_cache
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from airports.models import Airport
-from base.mixins import BaseViewSetMixin
+from airports.models import Airport, Route
+from base.mixins import ArchiveViewSetMixin, BaseViewSetMixin
 from base.pagination import DefaultPagination
 from flights.models import Flight
-from tickets.models import Order, Ticket
+from tickets.conflicts import detect_seat_conflicts, seat_conflict
+from tickets.holds import (
+    SeatsUnavailableError,
+    confirm_hold,
+    create_hold,
+    get_hold,
+    release_hold,
+)
+from tickets.idempotency import idempotent
+from tickets.models import ArchivedTicket, Order, Ticket
+from tickets.queries import booked_seats
 from tickets.serializers import (
+    OrderAllocateSerializer,
     OrderCreateSerializer,
     OrderDetailSerializer,
     OrderListSerializer,
     OrderSerializer,
+    SeatHoldSerializer,
     TicketByRouteSerializer,
     TicketDetailSerializer,
     TicketListSerializer,
@@ -45,17 +59,46 @@ class OrderViewSet(
         "list": OrderListSerializer,
         "create": OrderCreateSerializer,
         "retrieve": OrderDetailSerializer,
+        "allocate": OrderAllocateSerializer,
     }
 
     def get_queryset(self):
+        queryset = Order.objects.select_related("user").prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "flight__airplane",
+                    "flight__route__source",
+                    "flight__route__destination",
+                ),
+            )
+        )
         # Only show current user's orders
         user = self.request.user
         if user.is_staff:
-            return Order.objects.all()
-        return Order.objects.filter(user=user)
+            return queryset
+        return queryset.filter(user=user)
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @action(detail=False, methods=["post"])
+    @idempotent
+    def allocate(self, request):
+        """
+        Book ``party_size`` seats on a flight, side by side in one row when
+        possible, otherwise in the tightest block of neighbouring rows.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 @method_decorator(cache_page(60 * 60, key_prefix="ticket-list"), name="list")
 class TicketViewSet(
+    ArchiveViewSetMixin,
     BaseViewSetMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -73,7 +116,18 @@ class TicketViewSet(
     }
 
     def get_queryset(self):
-        queryset = Ticket.objects.select_related("flight", "order")
+        return self.for_user(Ticket.objects.all())
+
+    def get_archived_queryset(self):
+        return self.for_user(ArchivedTicket.objects.all())
+
+    def for_user(self, queryset):
+        queryset = queryset.select_related(
+            "order__user",
+            "flight__route__source",
+            "flight__route__destination",
+            "flight__airplane__airplane_type",
+        ).prefetch_related("flight__crew")
         user = self.request.user
         if not user.is_staff:
             queryset = queryset.filter(order__user=user)
@@ -91,32 +145,42 @@ class TicketViewSet(
         airports = Airport.objects.all()
         airport_data = [{"id": a.id, "name": str(a)} for a in airports]
 
-        # Get a list of available routes
+        # Get a list of available routes, probing the (route, departure_time)
+        # index once per route instead of reading every flight
         routes_data = []
-        for route in Flight.objects.values(
-            "route__source",
-            "route__destination",
-            "route__source__name",
-            "route__destination__name",
-        ).distinct():
+        for route in (
+            Route.objects.filter(Exists(Flight.objects.filter(route=OuterRef("pk"))))
+            .values(
+                "source",
+                "destination",
+                "source__name",
+                "destination__name",
+            )
+            .order_by()
+            .distinct()
+        ):
             routes_data.append(
                 {
-                    "source_id": route["route__source"],
-                    "destination_id": route["route__destination"],
-                    "source_name": route["route__source__name"],
-                    "destination_name": route["route__destination__name"],
+                    "source_id": route["source"],
+                    "destination_id": route["destination"],
+                    "source_name": route["source__name"],
+                    "destination_name": route["destination__name"],
                 }
             )
 
-        upcoming_flights = Flight.objects.filter(
-            departure_time__gte=timezone.now()
-        ).order_by("departure_time")[:10]
+        # walks the departure_time index and stops after ten flights, a join
+        # with COUNT would group the tickets of every upcoming flight first
+        upcoming_flights = (
+            Flight.objects.filter(departure_time__gte=timezone.now())
+            .select_related("route__source", "route__destination", "airplane")
+            .annotate(booked_seats_count=booked_seats())
+            .order_by("departure_time")[:10]
+        )
 
         upcoming_flights_data = []
         for flight in upcoming_flights:
             total_seats = flight.airplane.total_seats
-            booked_seats_count = Ticket.objects.filter(flight=flight).count()
-            available_seats_count = total_seats - booked_seats_count
+            available_seats_count = total_seats - flight.booked_seats_count
 
             upcoming_flights_data.append(
                 {
@@ -138,6 +202,7 @@ class TicketViewSet(
         )
 
     @action(detail=False, methods=["post"])
+    @idempotent
     def book_by_route(self, request):
         """
         Book tickets by specifying a route (source/destination)
@@ -157,3 +222,62 @@ class TicketViewSet(
             {"tickets": TicketListSerializer(tickets, many=True).data},
             status=status.HTTP_201_CREATED,
         )
+
+
+class SeatHoldViewSet(BaseViewSetMixin, viewsets.GenericViewSet):
+    """
+    Seats reserved for a few minutes while the customer checks out. Holds
+    live in the cache only and lapse on their own when not confirmed.
+    """
+
+    serializer_class = SeatHoldSerializer
+    permission_classes = [IsAuthenticated]
+
+    action_serializers = {
+        "confirm": OrderSerializer,
+    }
+
+    def get_hold(self, pk):
+        hold = get_hold(pk, self.request.user)
+        if hold is None:
+            raise NotFound("Hold not found or expired.")
+        return hold
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        flight = serializer.validated_data["flight"]
+        seats = serializer.validated_data["seats"]
+        try:
+            hold = create_hold(request.user, flight, seats)
+        except SeatsUnavailableError as error:
+            raise seat_conflict(
+                {flight.id: error.seats}, {flight.id: seats}, request.user
+            ) from None
+        return Response(self.get_serializer(hold).data, status=status.HTTP_201_CREATED)
+
+    def destroy(self, request, pk=None):
+        release_hold(self.get_hold(pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        """
+        Book the held seats as one order.
+        """
+        hold = self.get_hold(pk)
+        flight = Flight(pk=hold["flight"])
+        tickets = [
+            {"flight": flight, "row": row, "seat": seat} for row, seat in hold["seats"]
+        ]
+        try:
+            # a direct booking may have taken a seat despite the hold
+            with detect_seat_conflicts(tickets, request.user):
+                order = confirm_hold(hold, request.user)
+        except SeatsUnavailableError as error:
+            raise seat_conflict(
+                {hold["flight"]: error.seats},
+                {hold["flight"]: hold["seats"]},
+                request.user,
+            ) from None
+        return Response(self.get_serializer(order).data, status=status.HTTP_201_CREATED)
@@ -3,9 +3,27 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from base.admin import SearchListFilter
+
 User = get_user_model()
 
 
+class UserEmailFilter(SearchListFilter):
+    """
+    Filter by the start of the user's email. Set ``user_field`` to the path
+    of the user relation on the filtered model.
+    """
+
+    title = _("user")
+    parameter_name = "user_email"
+    placeholder = _("Email starts with")
+    user_field = "user"
+
+    @property
+    def lookup(self):
+        return f"{self.user_field}__email__istartswith"
+
+
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
     """Define admin model for custom User model with no email field."""